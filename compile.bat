@@ -17,7 +17,17 @@ pyinstaller ^
     --icon "src/assets/logo.ico" ^
     --add-data "src/assets;assets" ^
     --add-data "src/updater.py;." ^
+    --add-data "src/overlay_modules;overlay_modules" ^
     --hidden-import keyboard ^
-    src/viola_launcher.py
+    src/bootstrap.py
+
+REM --- Build headless CLI (console, no Qt) ---
+pyinstaller ^
+    --console ^
+    --onefile ^
+    --name "ViolaCLI" ^
+    --icon "src/assets/logo.ico" ^
+    --exclude-module PyQt6 ^
+    src/viola_cli.py
 
 pause
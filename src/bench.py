@@ -0,0 +1,1435 @@
+"""
+Viola Launcher - Benchmarks
+Runs headless on the offscreen Qt platform:
+
+    python src/bench.py <name> [options]
+    python src/bench.py --list
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+import subprocess
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+BENCHMARKS = {}
+
+
+def benchmark(name, help_text="", options=()):
+    """
+    Register a benchmark function taking (args) under name.
+    options is a sequence of (flags, argparse kwargs) for its own arguments.
+    """
+    def decorator(func):
+        BENCHMARKS[name] = (func, help_text, options)
+        return func
+    return decorator
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(label, samples_ms):
+    """Print a latency distribution line for samples given in milliseconds."""
+    s = sorted(samples_ms)
+    if not s:
+        print(f"{label:<32} no samples")
+        return
+    print(
+        f"{label:<32} n={len(s):<6} p50={percentile(s, 50):8.3f}ms p95={percentile(s, 95):8.3f}ms "
+        f"p99={percentile(s, 99):8.3f}ms max={s[-1]:8.3f}ms"
+    )
+
+
+def qt_app():
+    """Return the running QApplication, creating one if needed."""
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([sys.argv[0]])
+
+
+def run_until(app, done, poll_ms=5):
+    """Spin the Qt event loop until done() returns True."""
+    from PyQt6.QtCore import QTimer
+    timer = QTimer()
+    timer.timeout.connect(lambda: done() and app.quit())
+    timer.start(poll_ms)
+    app.exec()
+    timer.stop()
+
+
+# ---------------------- Theme ----------------------
+def _inline_styles(root):
+    """Give every themed widget its own stylesheet, the way widgets were styled before theme.py."""
+    import re
+    import theme
+    from PyQt6.QtWidgets import QWidget
+
+    values = dict(theme.PALETTES["dark"], **theme.HUD)
+    for w in [root] + root.findChildren(QWidget):
+        rules = []
+        for selector, decl in theme.RULES:
+            m = re.match(r'(\w+)(?:#(\w+))?(?:\[role="(\w+)"\])?((?:::?\w+)*)$', selector)
+            cls, name, role, pseudo = m.groups()
+            if not w.inherits(cls) or (name and w.objectName() != name) or (role and w.property("role") != role):
+                continue
+            rules.append(f"{cls}{pseudo or ''} {{ {decl.format(**values)} }}")
+        if rules:
+            w.setStyleSheet("\n".join(rules))
+
+
+@benchmark("theme", "one application stylesheet vs per-widget sheets: startup, re-theme, page switch")
+def bench_theme(args):
+    from PyQt6.QtCore import QEvent
+    from PyQt6.QtWidgets import QApplication, QWidget
+    import theme
+    from viola_launcher import OverlayWindow, SettingsPage
+
+    app = qt_app()
+    t0 = time.perf_counter()
+    for name in theme.theme_names():
+        theme.build_stylesheet(name)
+    print(f"compiled {len(theme.theme_names())} themes in {(time.perf_counter() - t0) * 1000:.2f} ms")
+
+    def build(inline):
+        host = QWidget()
+        host.resize(900, 600)
+        page = SettingsPage(host)
+        overlay = OverlayWindow(paint_stats=False)
+        if inline:
+            _inline_styles(host)
+            _inline_styles(overlay)
+        host.show()
+        overlay.show()
+        app.processEvents()
+        return host, page, overlay
+
+    results = {}
+    for inline in (True, False):
+        samples = []
+        for _ in range(min(args.iterations, 30)):
+            app.setStyleSheet("")
+            t0 = time.perf_counter()
+            if not inline:
+                theme.apply_theme(app, "dark")
+            host, page, overlay = build(inline)
+            samples.append((time.perf_counter() - t0) * 1000)
+            overlay.close()
+            host.close()
+            host.deleteLater()
+            overlay.deleteLater()
+            # processEvents() outside a running loop never delivers deferred deletes; without
+            # this every later apply_theme() re-polishes all the windows built so far
+            QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+        label = "startup, per-widget sheets" if inline else "startup, one app sheet"
+        summarize(label, samples)
+        results[inline] = sorted(samples)
+    print(f"startup speedup p50: {percentile(results[True], 50) / percentile(results[False], 50):.2f}x")
+
+    host, page, overlay = build(False)
+    switches = []
+    names = theme.theme_names()
+    for i in range(min(args.iterations, 60)):
+        t0 = time.perf_counter()
+        theme.apply_theme(app, names[(i + 1) % len(names)])
+        app.processEvents()
+        switches.append((time.perf_counter() - t0) * 1000)
+    summarize("re-theme (apply + repaint)", switches)
+
+    flips = []
+    for _ in range(min(args.iterations, 200)):
+        t0 = time.perf_counter()
+        page.setVisible(not page.isVisible())
+        app.processEvents()
+        flips.append((time.perf_counter() - t0) * 1000)
+    summarize("page switch", flips)
+    overlay.close()
+    host.close()
+    return 0
+
+
+# ---------------------- Overlay Modules ----------------------
+@benchmark("overlay-modules", "module discovery, and load cost of enabled vs disabled modules", options=[
+    (("--modules",), {"type": int, "default": 20, "help": "number of synthetic modules"}),
+])
+def bench_overlay_modules(args):
+    import tempfile
+    from overlay_plugins import ModuleRegistry, PACKAGE
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.modules):
+            with open(os.path.join(tmp, f"mod{i:03d}.py"), "w") as f:
+                f.write(f'MODULE = {{"id": "mod{i:03d}", "name": "Module {i}", "order": {i}, "enabled": {i % 2 == 0}}}\n\n'
+                        "import json, decimal, fractions\n"
+                        "TABLE = [str(n) * 4 for n in range(100000)]\n\n"
+                        "def create(parent):\n"
+                        "    return {'parent': parent, 'rows': len(TABLE)}\n")
+
+        samples = []
+        for _ in range(min(args.iterations, 50)):
+            registry = ModuleRegistry([tmp])
+            t0 = time.perf_counter()
+            registry.discover()
+            samples.append((time.perf_counter() - t0) * 1000)
+        summarize(f"discover {args.modules} modules", samples)
+        loaded = [name for name in sys.modules if name.startswith(PACKAGE)]
+        print(f"modules imported by discovery: {len(loaded)}")
+
+        t0 = time.perf_counter()
+        for info in registry.enabled():
+            registry.build(info, None)
+        print(f"first show: built {len(registry.enabled())} enabled modules in {(time.perf_counter() - t0) * 1000:.1f} ms")
+        registry.report()
+        disabled = [m.id for m in registry.modules.values() if not m.enabled]
+        leaked = [d for d in disabled if f"{PACKAGE}.{d}" in sys.modules]
+        print(f"disabled modules imported: {len(leaked)} of {len(disabled)}")
+        return 1 if loaded or leaked else 0
+
+
+# ---------------------- Single Instance ----------------------
+@benchmark("handoff", "argv handoff round-trip to a running instance", options=[
+    (("--process",), {"type": int, "default": 0, "help": "also time N full second-invocation processes"}),
+])
+def bench_handoff(args):
+    from single_instance import InstanceServer, forward_to_running, server_name
+
+    app = qt_app()
+    name = f"{server_name()}-bench-{os.getpid()}"
+    server = InstanceServer(name)
+    if not server.listen():
+        print("Could not listen on", name)
+        return 1
+    received = []
+    server.message_received.connect(received.append)
+
+    samples = []
+    failures = []
+    # Paths with spaces, quotes, non-ASCII and a newline must arrive byte for byte
+    sent = [["--skip-update", f"--open=pack{i}.mcpack", 'C:\\Worlds\\My "Best" Wörld', "two\nlines"]
+            for i in range(args.iterations)]
+
+    def client():
+        for argv in sent:
+            t0 = time.perf_counter()
+            ok = forward_to_running(argv, name=name)
+            samples.append((time.perf_counter() - t0) * 1000)
+            if not ok:
+                failures.append(1)
+
+    t = threading.Thread(target=client, daemon=True)
+    t.start()
+    run_until(app, lambda: not t.is_alive())
+    app.processEvents()
+    summarize("handoff round-trip", samples)
+    intact = received == sent
+    print(f"delivered={len(received)} failed={len(failures)} payloads intact={intact}")
+    if not intact:
+        server.close()
+        return 1
+
+    if args.process:
+        # Full second invocation: interpreter start, imports, forward, exit
+        src_dir = os.path.dirname(os.path.abspath(__file__))
+        proc_samples = []
+        code = (
+            "import sys; sys.path.insert(0, sys.argv[1]);"
+            "from single_instance import forward_to_running;"
+            "sys.exit(0 if forward_to_running(['--skip-update'], name=sys.argv[2]) else 1)"
+        )
+        for _ in range(args.process):
+            done = []
+
+            def spawn():
+                t0 = time.perf_counter()
+                subprocess.run([sys.executable, "-c", code, src_dir, name])
+                done.append((time.perf_counter() - t0) * 1000)
+
+            st = threading.Thread(target=spawn, daemon=True)
+            st.start()
+            run_until(app, lambda: not st.is_alive())
+            proc_samples.extend(done)
+        app.processEvents()
+        summarize("second invocation (process)", proc_samples)
+        if received[len(sent):] != [["--skip-update"]] * args.process:
+            print(f"second invocation: forwarded argv NOT delivered intact: {received[len(sent):]}")
+            failures.append(1)
+
+    server.close()
+    return 1 if failures else 0
+
+
+# ---------------------- Overlay Paint ----------------------
+@benchmark("overlay-paint", "OverlayWindow paint cost, cached vs uncached chrome")
+def bench_overlay_paint(args):
+    from viola_launcher import OverlayWindow
+
+    app = qt_app()
+    results = {}
+    for cached in (False, True):
+        window = OverlayWindow(cache_chrome=cached, paint_stats=False)
+        window.show()
+        app.processEvents()
+        window.repaint()  # first paint builds the cached chrome
+        samples = []
+        for _ in range(args.iterations):
+            t0 = time.perf_counter()
+            window.repaint()
+            samples.append((time.perf_counter() - t0) * 1000)
+        label = "cached chrome" if cached else "uncached chrome"
+        summarize(label, samples)
+        results[cached] = sorted(samples)
+        window.close()
+    p50_uncached = percentile(results[False], 50)
+    p50_cached = percentile(results[True], 50)
+    if p50_cached > 0:
+        print(f"speedup p50: {p50_uncached / p50_cached:.2f}x")
+    return 0
+
+
+# ---------------------- Hotkey Latency ----------------------
+@benchmark("hotkey-latency", "key press to painted overlay through a synthetic input backend", options=[
+    (("--toggles",), {"type": int, "default": 2000, "help": "number of overlay toggles"}),
+])
+def bench_hotkey_latency(args):
+    import tracing
+    from keymap import Keymap
+    from input_backend import SyntheticBackend
+    from viola_launcher import OverlayWindow, HotkeyService, HotkeyBridge
+
+    app = qt_app()
+    done = threading.Event()
+
+    class ProbedOverlay(OverlayWindow):
+        def paintEvent(self, event):
+            first = self._first_paint_pending
+            super().paintEvent(event)
+            if first:
+                done.set()
+
+        def hideEvent(self, event):
+            super().hideEvent(event)
+            done.set()
+
+    overlay = ProbedOverlay(paint_stats=False)
+    bridge = HotkeyBridge({"toggle_overlay": overlay.toggle})
+    backend = SyntheticBackend()
+    service = HotkeyService(bridge.post, backend)
+    service.start()
+    service.reload(Keymap({"toggle_overlay": "right shift"}, backend.key_codes))
+
+    timeouts = []
+
+    def hook_thread():
+        for i in range(args.toggles + 2):
+            done.clear()
+            tracing.instant("bench.inject")
+            backend.tap("right shift")
+            if not done.wait(5):
+                timeouts.append(i)
+                return
+
+    tracing.reset()
+    t = threading.Thread(target=hook_thread, name="input-hook", daemon=True)
+    t.start()
+    run_until(app, lambda: not t.is_alive())
+    if timeouts:
+        service.stop()
+        overlay.close()
+        print(f"toggle {timeouts[0]} never reached the screen")
+        return 1
+
+    # A held key auto-repeats "down" events; the overlay must toggle once, not flicker
+    app.processEvents()
+    was_visible = overlay.isVisible()
+    before = sum(e[1] == "hotkey.toggle_overlay" for e in tracing.events())
+    t = threading.Thread(target=lambda: [backend.send("right shift", down) for down in [True] * 10 + [False]],
+                         name="input-hook")
+    t.start()
+    t.join()
+    deadline = time.perf_counter() + 0.2
+    while time.perf_counter() < deadline:
+        app.processEvents()         # any re-fired toggle would arrive here
+    toggles = sum(e[1] == "hotkey.toggle_overlay" for e in tracing.events()) - before
+    flipped = overlay.isVisible() != was_visible
+    service.stop()
+    overlay.close()
+    print(f"held hotkey with 9 auto-repeats: {toggles} toggle(s), overlay {'toggled' if flipped else 'NOT toggled'}")
+    if toggles != 1 or not flipped:
+        return 1
+
+    events = tracing.events()
+    injected = [e[2] for e in events if e[1] == "bench.inject"]
+    hooked = [e[2] for e in events if e[1] == "hotkey.callback"]
+    delivered = [(e[2], e[2] + e[3]) for e in events if e[1] == "hotkey.toggle_overlay"]
+    painted = iter(e[2] for e in events if e[1] == "overlay.first_paint")
+    hops = {"inject -> hook callback": [], "hook -> GUI thread": [], "show()": [],
+            "shown -> first paint": [], "total: key -> painted": [], "total: key -> hidden": []}
+    for i, (t_inject, t_hook, (t_gui, t_shown)) in enumerate(zip(injected, hooked, delivered)):
+        paint = next(painted) if i % 2 == 0 else None
+        if i < 2:
+            continue  # the first show builds the overlay modules
+        hops["inject -> hook callback"].append((t_hook - t_inject) / 1000)
+        hops["hook -> GUI thread"].append((t_gui - t_hook) / 1000)
+        if paint is None:
+            hops["total: key -> hidden"].append((t_shown - t_inject) / 1000)
+            continue
+        hops["show()"].append((t_shown - t_gui) / 1000)
+        hops["shown -> first paint"].append((paint - t_shown) / 1000)
+        hops["total: key -> painted"].append((paint - t_inject) / 1000)
+    for label, samples in hops.items():
+        summarize(label, samples)
+    return 0
+
+
+# ---------------------- Keymap ----------------------
+def _binding_events(text):
+    """The (down, code) events a user produces when pressing binding text once."""
+    from keymap import parse_binding, CTRL, SHIFT, ALT, META
+
+    events = []
+    for mods, key in parse_binding(text):
+        held = [name for name, bit in (("ctrl", CTRL), ("shift", SHIFT), ("alt", ALT), ("windows", META)) if mods & bit]
+        events += [(True, m) for m in held] + [(True, key), (False, key)] + [(False, m) for m in reversed(held)]
+    return events
+
+
+@benchmark("keymap", "compile and dispatch latency with hundreds of bindings", options=[
+    (("--bindings",), {"type": int, "default": 500, "help": "number of bindings to compile"}),
+])
+def bench_keymap(args):
+    import random
+    from keymap import Keymap, KeyMatcher, MODIFIER_KEYS, NAMED_KEYS, format_binding
+
+    keys = sorted(k for k in NAMED_KEYS if k not in MODIFIER_KEYS)
+    names = [format_binding(((0, k),)) for k in keys]
+    mod_sets = ["", "ctrl+", "shift+", "alt+", "ctrl+shift+", "ctrl+alt+", "shift+alt+", "ctrl+shift+alt+"]
+    combos = [m + n for m in mod_sets for n in names]
+    random.seed(1)
+    random.shuffle(combos)
+    bindings = {}
+    for i, combo in enumerate(combos[:args.bindings]):
+        # Every tenth binding is a two-step chord under a dedicated prefix
+        bindings[f"action.{i}"] = f"ctrl+shift+alt+windows+{names[i % len(names)]}, {combo}" if i % 10 == 0 else combo
+
+    t0 = time.perf_counter()
+    km = Keymap(bindings)
+    print(f"compiled {len(km)} bindings in {(time.perf_counter() - t0) * 1000:.2f} ms ({len(km.errors)} rejected)")
+
+    # Pre-build the raw event stream: (down, code) tuples as a backend would deliver them
+    stream = []
+    for _ in range(args.iterations):
+        mods, key = random.choice([("", k) for k in keys] + [("ctrl", k) for k in keys[:20]])
+        if mods:
+            stream.append((True, mods))
+        stream += [(True, key), (False, key)]
+        if mods:
+            stream.append((False, mods))
+
+    matcher = KeyMatcher(km)
+    samples = []
+    hits = 0
+    feed = matcher.feed
+    for down, code in stream:
+        t0 = time.perf_counter_ns()
+        action = feed(down, code)
+        samples.append((time.perf_counter_ns() - t0) / 1e6)
+        hits += action is not None
+    summarize(f"dispatch ({len(km)} bindings)", samples)
+    print(f"events={len(stream)} actions={hits}")
+
+    # Correctness: every compiled binding, chords included, fires exactly its own action
+    wrong = []
+    for action, text in km.bindings.items():
+        matcher = KeyMatcher(km)
+        fired = [a for a in (matcher.feed(down, code) for down, code in _binding_events(text)) if a]
+        if fired != [action]:
+            wrong.append((action, text, fired))
+    chords = sum("," in text for text in km.bindings.values())
+    print(f"dispatch correctness: {len(km) - len(wrong)} of {len(km)} bindings ({chords} chords) fire their action")
+
+    matcher = KeyMatcher(Keymap({"toggle": "f5"}))
+    repeats = [matcher.feed(True, "f5") for _ in range(10)] + [matcher.feed(False, "f5"), matcher.feed(True, "f5")]
+    fired = [a for a in repeats if a]
+    print(f"held key with 9 auto-repeats, then pressed again: fired {len(fired)} times")
+
+    checked = Keymap({"toggle_overlay": "f5", "module:missing": "f6"}, actions={"toggle_overlay"})
+    print(f"binding without a handler: {'rejected' if checked.errors else 'NOT rejected'} {checked.errors}")
+    if wrong or fired != ["toggle", "toggle"] or len(checked) != 1:
+        for action, text, got in wrong[:5]:
+            print(f"  {action} ({text}) fired {got}")
+        return 1
+    return 0
+
+
+# ---------------------- Packs ----------------------
+def make_synthetic_packs(folder, count, files_per_pack=20, file_size=4096, folders_every=5):
+    """Write count synthetic packs (mostly .mcpack archives, some folders) into folder."""
+    import json
+    import uuid
+    import zipfile
+
+    os.makedirs(folder, exist_ok=True)
+    payload = os.urandom(file_size)
+    for i in range(count):
+        manifest = json.dumps({
+            "format_version": 2,
+            "header": {"name": f"Pack {i}", "uuid": str(uuid.uuid4()), "version": [1, 0, i % 10]},
+            "modules": [{"type": "resources", "uuid": str(uuid.uuid4()), "version": [1, 0, 0]}],
+        })
+        if folders_every and i % folders_every == 0:
+            root = os.path.join(folder, f"pack_{i}")
+            os.makedirs(os.path.join(root, "textures"), exist_ok=True)
+            with open(os.path.join(root, "manifest.json"), "w") as f:
+                f.write(manifest)
+            for j in range(files_per_pack):
+                with open(os.path.join(root, "textures", f"t{j}.png"), "wb") as f:
+                    f.write(payload)
+        else:
+            with zipfile.ZipFile(os.path.join(folder, f"pack_{i}.mcpack"), "w", zipfile.ZIP_DEFLATED) as zf:
+                zf.writestr("manifest.json", manifest)
+                for j in range(files_per_pack):
+                    zf.writestr(f"textures/t{j}.png", payload)
+
+
+@benchmark("pack-index", "cold, warm and incremental pack index scans", options=[
+    (("--packs",), {"type": int, "default": 2000, "help": "number of synthetic packs"}),
+])
+def bench_pack_index(args):
+    import tempfile
+    from pack_index import PackIndex
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "resource_packs")
+        make_synthetic_packs(root, args.packs)
+        index_file = os.path.join(tmp, "pack_index.json")
+
+        packs, stats = PackIndex(index_file, [root]).scan()
+        print(f"cold scan:        {len(packs)} packs, {stats['seconds'] * 1000:8.1f} ms")
+        packs, stats = PackIndex(index_file, [root]).scan()
+        print(f"warm scan:        re-read {stats['reread']}, {stats['seconds'] * 1000:8.1f} ms")
+        make_synthetic_packs(os.path.join(tmp, "extra"), 10, folders_every=0)
+        for name in os.listdir(os.path.join(tmp, "extra")):
+            os.replace(os.path.join(tmp, "extra", name), os.path.join(root, "new_" + name))
+        packs, stats = PackIndex(index_file, [root]).scan()
+        print(f"incremental scan: re-read {stats['reread']}, {stats['seconds'] * 1000:8.1f} ms")
+    return 0
+
+
+@benchmark("pack-import", "bulk .mcpack import, serial vs process pool", options=[
+    (("--packs",), {"type": int, "default": 200, "help": "number of synthetic packs"}),
+    (("--files",), {"type": int, "default": 50, "help": "files per pack"}),
+    (("--jobs",), {"type": int, "default": 0, "help": "worker processes for the parallel run"}),
+])
+def bench_pack_import(args):
+    import tempfile
+    from pack_import import default_jobs, import_packs
+
+    # At least two workers, so the process pool path runs even on a 1-CPU host
+    parallel = max(2, args.jobs or default_jobs())
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        make_synthetic_packs(src, args.packs, files_per_pack=args.files, file_size=16384, folders_every=0)
+        for label, jobs in (("serial", 1), ("parallel", parallel)):
+            dest = os.path.join(tmp, label)
+            roots = {"resource": dest, "behavior": dest}
+            report = import_packs([src], roots, jobs=jobs)
+            files = report["files"]
+            print(f"{label:<9} workers={report['workers']:<3} packs={len(report['imported']):<5} "
+                  f"files={report['files']:<7} {report['bytes'] / (1024 * 1024):8.1f} MB "
+                  f"{report['seconds']:7.2f}s {report['files_per_second']:9.0f} files/s")
+        if (os.cpu_count() or 1) < parallel:
+            print(f"note: {os.cpu_count()} CPU(s) for {parallel} workers; the parallel figure is not a speedup")
+
+        # Relative destination roots must extract the same files
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            report = import_packs([src], {"resource": "./relative", "behavior": "./relative"}, jobs=1)
+        finally:
+            os.chdir(cwd)
+        print(f"relative dest: {report['files']} of {files} files extracted")
+        if report["files"] != files:
+            return 1
+
+        # Marketplace-style packs all named "pack.name" in the manifest, resolved through en_US.lang
+        import json
+        import uuid
+        import zipfile
+        same = os.path.join(tmp, "same")
+        os.makedirs(same)
+        for i in range(12):
+            with zipfile.ZipFile(os.path.join(same, f"copy{i}.mcpack"), "w") as zf:
+                zf.writestr("manifest.json", json.dumps({
+                    "format_version": 2,
+                    "header": {"name": "pack.name", "uuid": str(uuid.uuid4()), "version": [1, 0, 0]},
+                    "modules": [{"type": "resources", "uuid": str(uuid.uuid4()), "version": [1, 0, 0]}],
+                }))
+                zf.writestr("texts/en_US.lang", "pack.name=Same Pack\npack.description=Test\n")
+        dest = os.path.join(tmp, "same-dest")
+        report = import_packs([same], {"resource": dest}, jobs=parallel)
+        folders = sorted(os.listdir(dest))
+        print(f"12 packs with one name, {report['workers']} workers: {len(report['imported'])} imported, "
+              f"{len(report['failed'])} failed, folders {folders[0]} .. {folders[-1]}")
+        if len(report["imported"]) != 12 or len(folders) != 12 or any(f.startswith("pack.name") for f in folders):
+            return 1
+    return 0
+
+
+# ---------------------- World Backups ----------------------
+def make_synthetic_worlds(folder, total_mb, worlds=4, file_mb=2):
+    """Write a world tree of roughly total_mb: incompressible LevelDB-like tables plus small files."""
+    per_world = max(1, total_mb // worlds // file_mb)
+    for w in range(worlds):
+        root = os.path.join(folder, f"world{w}")
+        os.makedirs(os.path.join(root, "db"), exist_ok=True)
+        with open(os.path.join(root, "level.dat"), "wb") as f:
+            f.write(os.urandom(2048))
+        with open(os.path.join(root, "levelname.txt"), "w") as f:
+            f.write(f"World {w}")
+        for i in range(per_world):
+            with open(os.path.join(root, "db", f"{i:06d}.ldb"), "wb") as f:
+                f.write(os.urandom(file_mb * 1024 * 1024))
+
+
+@benchmark("world-backup", "incremental deduplicated world backup and restore", options=[
+    (("--mb",), {"type": int, "default": 1024, "help": "synthetic world size in MB"}),
+    (("--change",), {"type": float, "default": 2.0, "help": "percent of files modified between runs"}),
+])
+def bench_world_backup(args):
+    import random
+    import tempfile
+    import world_backup
+
+    with tempfile.TemporaryDirectory() as tmp:
+        worlds = os.path.join(tmp, "minecraftWorlds")
+        repo = os.path.join(tmp, "repo")
+        make_synthetic_worlds(worlds, args.mb)
+
+        def report(label, stats):
+            print(f"{label:<12} {stats['seconds']:7.2f}s  read {stats['read_bytes'] / 2**20:8.1f} MB "
+                  f"({stats['mb_per_second']:6.1f} MB/s)  unchanged {stats['skipped']}/{stats['files']}  "
+                  f"new chunks {stats['new_chunks']} ({stats['stored_bytes'] / 2**20:.1f} MB)")
+
+        report("full", world_backup.backup(worlds, repo))
+        report("unchanged", world_backup.backup(worlds, repo))
+
+        tables = [os.path.join(d, f) for d, _, fs in os.walk(worlds) for f in fs if f.endswith(".ldb")]
+        random.seed(2)
+        for path in random.sample(tables, max(1, int(len(tables) * args.change / 100))):
+            # Insert bytes near the start: content-defined chunking keeps the rest deduplicated
+            with open(path, "rb") as f:
+                data = f.read()
+            with open(path, "wb") as f:
+                f.write(data[:1000] + os.urandom(100) + data[1000:])
+        report(f"{args.change:g}% changed", world_backup.backup(worlds, repo))
+
+        stats = world_backup.restore("latest", os.path.join(tmp, "restored"), repo)
+        print(f"{'restore':<12} {stats['seconds']:7.2f}s  {stats['bytes'] / 2**20:8.1f} MB "
+              f"({stats['bytes'] / 2**20 / stats['seconds']:6.1f} MB/s)")
+
+        # Retention: a backup with keep=1 drops the older snapshots and the chunks only they used
+        stats = world_backup.backup(worlds, repo, keep=1)
+        print(f"{'keep=1':<12} {len(world_backup.BackupRepo(repo).snapshots())} snapshot left, "
+              f"{stats['pruned_chunks']} chunks removed")
+    return 0
+
+
+@benchmark("launch", "staged launch pipeline with a subprocess spawner", options=[
+    (("--pre-ms",), {"type": float, "default": 50.0, "help": "duration of each simulated pre-launch task"}),
+])
+def bench_launch(args):
+    from launch_pipeline import CommandSpawner, build_launch_pipeline
+
+    def pre_task(ctx, cancel):
+        cancel.wait(args.pre_ms / 1000)
+
+    tasks = [("pre_a", pre_task), ("pre_b", pre_task)]
+    child = [sys.executable, "-c", "import time; time.sleep(5)"]
+    runs = min(args.iterations, 20)
+    totals = []
+    stages = {}
+    for _ in range(runs):
+        spawner = CommandSpawner(child)
+        ok, ctx, timings = build_launch_pipeline(spawner, tasks).run()
+        ctx["spawn"]["proc"].kill()
+        assert ok, ctx.get("error")
+        totals.append(timings["total"] * 1000)
+        for name, seconds in timings.items():
+            if name != "total":
+                stages.setdefault(name, []).append(seconds * 1000)
+    summarize("launch total", totals)
+    for name, samples in stages.items():
+        summarize(f"  {name}", samples)
+
+    cancels = []
+    for _ in range(runs):
+        pipeline = build_launch_pipeline(CommandSpawner(child), [("slow", lambda ctx, cancel: cancel.wait(10))])
+        result = {}
+        t = threading.Thread(target=lambda: result.update(zip(("ok", "ctx", "timings"), pipeline.run())))
+        t.start()
+        time.sleep(0.02)
+        t0 = time.perf_counter()
+        pipeline.cancel()
+        t.join()
+        cancels.append((time.perf_counter() - t0) * 1000)
+        assert not result["ok"] and "spawn" not in result["ctx"]
+    summarize("cancel latency", cancels)
+
+    # The launcher runs the pipeline through LaunchThread; stage updates cross to the GUI thread as signals
+    from viola_launcher import LaunchThread
+    app = qt_app()
+    thread_totals = []
+    for _ in range(runs):
+        thread = LaunchThread(build_launch_pipeline(CommandSpawner(child), tasks))
+        states = {}
+        result = {}
+        thread.stage_changed.connect(lambda stage, state, seconds, detail: states.update({(stage, state): detail}))
+        thread.finished.connect(lambda ok, error: result.update(ok=ok, error=error))
+        t0 = time.perf_counter()
+        thread.start()
+        run_until(app, lambda: bool(result))
+        thread_totals.append((time.perf_counter() - t0) * 1000)
+        thread.wait()
+        assert result["ok"], result["error"]
+        states[("spawn", "done")]["proc"].kill()
+        assert ("confirm", "done") in states, list(states)
+    summarize("launch via LaunchThread", thread_totals)
+    return 0
+
+
+class FakeDiscordIpc:
+    """Minimal Discord IPC server on a unix socket: answers the handshake and SET_ACTIVITY."""
+
+    def __init__(self, path, latency=0.0):
+        import socket
+        self.path = path
+        self.latency = latency
+        self.activities = 0
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        self.server.listen(4)
+        self.conns = []
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            self.conns.append(conn)
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        import json
+        import struct
+        try:
+            while True:
+                header = conn.recv(8, 0x100)  # MSG_WAITALL
+                if len(header) < 8:
+                    return
+                op, length = struct.unpack("<II", header)
+                payload = json.loads(conn.recv(length, 0x100))
+                time.sleep(self.latency)
+                if op == 0:
+                    reply = {"cmd": "DISPATCH", "evt": "READY", "data": {}}
+                else:
+                    self.activities += 1
+                    reply = {"cmd": payload["cmd"], "evt": None, "nonce": payload["nonce"], "data": {}}
+                body = json.dumps(reply).encode()
+                conn.sendall(struct.pack("<II", 1, len(body)) + body)
+        except OSError:
+            return
+
+    def drop_connections(self):
+        import socket
+        for conn in self.conns:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self.conns = []
+
+    def close(self):
+        self.server.close()
+        self.drop_connections()
+
+
+@benchmark("presence", "presence publisher against a fake Discord IPC socket", options=[
+    (("--window",), {"type": float, "default": 0.05, "help": "rate window in seconds"}),
+    (("--seconds",), {"type": float, "default": 2.0, "help": "how long to generate state changes"}),
+])
+def bench_presence(args):
+    import tempfile
+    from presence import PresenceService, IpcClient, STATES
+    import presence
+
+    presence.BACKOFF_MIN = 0.05
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "discord-ipc-0")
+        server = FakeDiscordIpc(path, latency=0.002)
+        service = PresenceService("0", lambda: IpcClient("0", [path]), rate_window=args.window)
+        service.start()
+
+        states = list(STATES)
+        calls = []
+        end = time.perf_counter() + args.seconds
+        i = 0
+        dropped_once = False
+        while time.perf_counter() < end:
+            t0 = time.perf_counter()
+            service.set_state(states[i % len(states)], state=str(i // 50))
+            calls.append((time.perf_counter() - t0) * 1000)
+            i += 1
+            if not dropped_once and time.perf_counter() > end - args.seconds / 2:
+                server.drop_connections()   # force a reconnect halfway through
+                dropped_once = True
+            time.sleep(0.0005)
+        time.sleep(args.window * 2 + 0.2)
+        stats = service.stats()
+        service.stop()
+        server.close()
+
+    summarize("set_state", calls)
+    limit = int(args.seconds / args.window) + 2
+    print(f"{i} state changes -> {stats['sent']} published (limit ~{limit}), "
+          f"{stats['coalesced']} coalesced, {stats['dropped']} dropped, "
+          f"{stats['errors']} errors, {stats['connects']} connects, server saw {server.activities}")
+    return 0
+
+
+@benchmark("monitor", "cost of one resource monitor sample")
+def bench_monitor(args):
+    from resource_monitor import ResourceMonitor
+
+    monitor = ResourceMonitor(budgets={})
+    samples = []
+    for _ in range(args.iterations):
+        t0 = time.perf_counter()
+        reading = monitor.sample()
+        samples.append((time.perf_counter() - t0) * 1000)
+    summarize("sample", samples)
+    print(ResourceMonitor.format_line(reading))
+    return 0
+
+
+@benchmark("startup", "time-to-splash and time-to-interactive of the bootstrap entry point")
+def bench_startup(args):
+    import re
+
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bootstrap.py")
+    splash, interactive = [], []
+    for _ in range(min(args.iterations, 10)):
+        out = subprocess.run(
+            [sys.executable, script, "--startup-probe", "--new-instance", "--skip-update"],
+            capture_output=True, text=True, timeout=60,
+        ).stdout
+        m = re.search(r"Splash after (\d+) ms, interactive after (\d+) ms", out)
+        if not m:
+            print(out)
+            return 1
+        splash.append(float(m.group(1)))
+        interactive.append(float(m.group(2)))
+    summarize("time-to-splash", splash)
+    summarize("time-to-interactive", interactive)
+    if "headless" in out:
+        print("headless platform: the splash is not shown, time-to-splash is when it would have been")
+    if sys.platform.startswith("linux"):
+        print("process start time from /proc: 10 ms resolution")
+    return 0
+
+
+@benchmark("update-apply", "verify, stage and swap an update, then restart via the helper", options=[
+    (("--mb",), {"type": int, "default": 40, "help": "size of the fake launcher exe in MB"}),
+])
+def bench_update_apply(args):
+    import shutil
+    import zipfile
+    import hashlib
+    import tempfile
+    import updater
+
+    with tempfile.TemporaryDirectory() as tmp:
+        install = os.path.join(tmp, "install")
+        os.makedirs(os.path.join(install, "assets"))
+        exe = os.path.join(install, "ViolaLauncher.exe")
+        cli = os.path.join(install, updater.CLI_EXE_NAME)
+        marker = os.path.join(tmp, "restarted")
+        with open(exe, "w") as f:
+            f.write("#!/bin/sh\nsleep 30\n")
+        os.chmod(exe, 0o755)
+        with open(cli, "w") as f:
+            f.write("old cli")
+        with open(os.path.join(install, "assets", "logo.png"), "wb") as f:
+            f.write(b"old")
+
+        payload = os.path.join(tmp, "update.zip")
+        with zipfile.ZipFile(payload, "w", zipfile.ZIP_DEFLATED) as zf:
+            # New exe: a script that records it was restarted, padded to the requested size
+            info = zipfile.ZipInfo("ViolaLauncher.exe")
+            info.external_attr = 0o755 << 16
+            zf.writestr(info, f"#!/bin/sh\necho $@ > {marker}\nexit 0\n#".encode()
+                        + os.urandom(args.mb * 1024 * 1024) + b"\n")
+            zf.writestr("assets/logo.png", b"new")
+            zf.writestr(updater.CLI_EXE_NAME, b"new cli")
+        sha = hashlib.sha256(open(payload, "rb").read()).hexdigest()
+
+        for label, bad_sha in (("sha mismatch", "0" * 64),):
+            try:
+                updater.apply_update(payload, install, bad_sha, running_exe=exe)
+                print(f"{label}: NOT rejected")
+                return 1
+            except updater.UpdateError as e:
+                print(f"{label}: rejected ({str(e)[:40]}…)")
+
+        running = subprocess.Popen([exe])
+        times = []
+        for i in range(min(args.iterations, 5)):
+            # The CLI updating while the GUI runs: both exes are in use
+            report = updater.apply_update(payload, install, sha, running_exe=[exe, cli])
+            times.append(report["seconds"] * 1000)
+        print(f"applied {report['files']} files, {report['bytes'] / 2**20:.1f} MB; "
+              f"verify {report['verify_seconds'] * 1000:.0f} ms, stage {report['stage_seconds'] * 1000:.0f} ms, "
+              f"swap {report['swap_seconds'] * 1000:.1f} ms, restart required {report['restart_required']}")
+        summarize("apply", times)
+        assert open(os.path.join(install, "assets", "logo.png"), "rb").read() == b"new"
+        assert os.path.exists(exe + updater.OLD_SUFFIX) and os.path.exists(cli + updater.OLD_SUFFIX)
+        assert len(report["running_replaced"]) == 2 and not os.path.exists(os.path.join(install, updater.BACKUP_DIR))
+
+        t0 = time.perf_counter()
+        updater.spawn_restart_helper(running.pid, exe, report["pending"], args=("--skip-update",))
+        running.kill()
+        running.wait()
+        while not os.path.exists(marker) and time.perf_counter() - t0 < 10:
+            time.sleep(0.01)
+        print(f"restart helper relaunched new exe in {(time.perf_counter() - t0) * 1000:.0f} ms "
+              f"with args: {open(marker).read().strip()}")
+        updater.cleanup_previous_update(install)
+        assert not os.path.exists(exe + updater.OLD_SUFFIX) and not os.path.exists(cli + updater.OLD_SUFFIX)
+        shutil.rmtree(install)
+    return 0
+
+
+@benchmark("peer-cache", "update fan-out to several launcher instances on localhost", options=[
+    (("--instances",), {"type": int, "default": 6, "help": "number of launcher instances"}),
+    (("--mb",), {"type": int, "default": 40, "help": "payload size in MB"}),
+])
+def bench_peer_cache(args):
+    import socket
+    import hashlib
+    import tempfile
+    import http.server
+    import peer_cache
+
+    def free_udp_port():
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            return sock.getsockname()[1]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        payload = os.path.join(tmp, "ViolaLauncher-v9.9.9.zip")
+        with open(payload, "wb") as f:
+            f.write(os.urandom(args.mb * 1024 * 1024))
+        sha = hashlib.sha256(open(payload, "rb").read()).hexdigest()
+
+        origin_bytes = [0]
+
+        class Origin(http.server.SimpleHTTPRequestHandler):
+            def __init__(self, *a, **kw):
+                super().__init__(*a, directory=tmp, **kw)
+
+            def copyfile(self, source, outputfile):
+                origin_bytes[0] += os.fstat(source.fileno()).st_size
+                super().copyfile(source, outputfile)
+
+            def log_message(self, *a):
+                pass
+
+        origin = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Origin)
+        threading.Thread(target=origin.serve_forever, daemon=True).start()
+        origin_url = f"http://127.0.0.1:{origin.server_address[1]}/{os.path.basename(payload)}"
+
+        ports = [free_udp_port() for _ in range(args.instances + 1)]
+        instances = []
+        for i, port in enumerate(ports):
+            others = [f"127.0.0.1:{p}" for p in ports if p != port]
+            instances.append(peer_cache.PeerCache(os.path.join(tmp, f"cache{i}"), port, others, bind="127.0.0.1").start())
+        # The last instance claims to have the payload but serves garbage
+        bad = instances.pop()
+        with open(bad.path_for(sha), "wb") as f:
+            f.write(os.urandom(1024))
+
+        for i, inst in enumerate(instances):
+            dest = os.path.join(tmp, f"download{i}.zip")
+            t0 = time.perf_counter()
+            peer = inst.fetch(sha, dest)
+            if peer is None:
+                peer_cache._download(origin_url, dest, sha, None, 30)
+            inst.add(dest, sha, move=True)
+            source = "origin" if peer is None else f"peer :{peer[1]}"
+            print(f"instance {i}: {source:<12} {(time.perf_counter() - t0) * 1000:7.1f} ms  "
+                  f"bad peers skipped {inst.counters['bad_peers']}")
+
+        total = args.mb * len(instances)
+        print(f"origin served {origin_bytes[0] / 2**20:.0f} MB of {total} MB delivered "
+              f"({len(instances)} instances, 1 corrupt peer)")
+        for inst in instances + [bad]:
+            inst.stop()
+        origin.shutdown()
+    return 0
+
+
+@benchmark("cli-startup", "cold start of the headless CLI (and proof it never loads Qt)")
+def bench_cli_startup(args):
+    here = os.path.dirname(os.path.abspath(__file__))
+    probe = ("import sys; sys.path.insert(0, %r); import viola_cli; code = viola_cli.main(['status', '--json']); "
+             "assert not any(m.startswith('PyQt6') for m in sys.modules), 'PyQt6 imported'" % here)
+    subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True)
+    print("status ran without importing PyQt6")
+
+    samples = []
+    for _ in range(min(args.iterations, 30)):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, os.path.join(here, "viola_cli.py"), "status", "--json"],
+                       check=True, capture_output=True)
+        samples.append((time.perf_counter() - t0) * 1000)
+    summarize("viola_cli status (process)", samples)
+    return 0
+
+
+@benchmark("bundle-apply", "apply an offline bundle from its memory map vs a plain file copy", options=[
+    (("--mb",), {"type": int, "default": 200, "help": "release size in MB"}),
+])
+def bench_bundle_apply(args):
+    import shutil
+    import tempfile
+    import updater
+    import update_bundle
+
+    with tempfile.TemporaryDirectory() as tmp:
+        release = os.path.join(tmp, "release")
+        os.makedirs(os.path.join(release, "assets"))
+        block = os.urandom(1024 * 1024)
+        with open(os.path.join(release, "ViolaLauncher.exe"), "wb") as f:
+            for _ in range(args.mb * 3 // 4):
+                f.write(block)
+        with open(os.path.join(release, "ViolaCLI.exe"), "wb") as f:
+            for _ in range(args.mb // 4):
+                f.write(block)
+        for i in range(50):
+            with open(os.path.join(release, "assets", f"icon{i}.png"), "wb") as f:
+                f.write(os.urandom(4096 + i))
+        bundle = os.path.join(tmp, "release.vbundle")
+        t0 = time.perf_counter()
+        update_bundle.build_bundle(release, bundle, "9.9.9")
+        size = os.path.getsize(bundle)
+        print(f"built {size / 2**20:.0f} MB bundle in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+        install = os.path.join(tmp, "install")
+        os.makedirs(install)
+        copies, applies, cpu = [], [], []
+        for _ in range(min(args.iterations, 5)):
+            t0 = time.perf_counter()
+            shutil.copyfile(bundle, os.path.join(tmp, "copy.bin"))
+            copies.append((time.perf_counter() - t0) * 1000)
+            c0 = time.process_time()
+            t0 = time.perf_counter()
+            report = updater.apply_update(bundle, install)
+            applies.append((time.perf_counter() - t0) * 1000)
+            cpu.append((time.process_time() - c0) * 1000)
+        summarize("plain copy", copies)
+        summarize("bundle apply (wall)", applies)
+        summarize("bundle apply (cpu)", cpu)
+        best = min(applies) / 1000
+        print(f"applied {report['files']} files at {size / 2**20 / best:.0f} MB/s; "
+              f"{best / (min(copies) / 1000):.2f}x the time of a plain copy (copy + sha256 of every byte)")
+        assert updater.file_sha256(os.path.join(install, "ViolaCLI.exe")) == \
+            updater.file_sha256(os.path.join(release, "ViolaCLI.exe"))
+
+        # A flipped byte in a payload must be rejected before anything is swapped
+        with open(bundle, "r+b") as f:
+            f.seek(size - 10)
+            byte = f.read(1)
+            f.seek(size - 10)
+            f.write(bytes([byte[0] ^ 0xFF]))
+        try:
+            updater.apply_update(bundle, install)
+            print("tampered bundle: NOT rejected")
+            return 1
+        except updater.UpdateError as e:
+            print(f"tampered bundle: rejected ({e})")
+    return 0
+
+
+def _range_server(folder, ranges=True):
+    """Serve folder over HTTP on localhost, honouring single byte ranges unless ranges=False."""
+    import re
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = os.path.join(folder, os.path.basename(self.path))
+            if not os.path.isfile(path):
+                self.send_error(404)
+                return
+            size = os.path.getsize(path)
+            start, end = 0, size - 1
+            m = re.match(r"bytes=(\d*)-(\d*)$", self.headers.get("Range", "")) if ranges else None
+            if m:
+                if m.group(1):
+                    start = int(m.group(1))
+                    end = min(int(m.group(2)), size - 1) if m.group(2) else size - 1
+                else:
+                    start = max(0, size - int(m.group(2)))
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", str(end - start + 1))
+            self.end_headers()
+            with open(path, "rb") as f:
+                f.seek(start)
+                left = end - start + 1
+                while left:
+                    chunk = f.read(min(left, 1024 * 1024))
+                    try:
+                        self.wfile.write(chunk)
+                    except (BrokenPipeError, ConnectionResetError):
+                        return  # the client saw a 200 and gave up, as intended
+                    left -= len(chunk)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@benchmark("remote-zip", "partial update: fetch only changed zip members with HTTP range requests", options=[
+    (("--members",), {"type": int, "default": 40, "help": "number of files in the release"}),
+    (("--changed",), {"type": int, "default": 3, "help": "how many of them change"}),
+])
+def bench_remote_zip(args):
+    import shutil
+    import zipfile
+    import hashlib
+    import tempfile
+    import updater
+    from remote_zip import RemoteZip, RangeNotSupported
+
+    with tempfile.TemporaryDirectory() as tmp:
+        install = os.path.join(tmp, "install")
+        os.makedirs(install)
+        contents = {"ViolaLauncher.exe": os.urandom(30 * 1024 * 1024)}
+        for i in range(args.members - 1):
+            contents[f"assets/file{i:03d}.dat"] = os.urandom(16 * 1024) + b"\0" * 200 * 1024
+        for name, data in contents.items():
+            os.makedirs(os.path.dirname(os.path.join(install, name)), exist_ok=True)
+            with open(os.path.join(install, name), "wb") as f:
+                f.write(data)
+        # The new release changes every other asset in a run, so the ranges have small gaps
+        for i in range(args.changed):
+            contents[f"assets/file{10 + 2 * i:03d}.dat"] = os.urandom(16 * 1024)
+        os.makedirs(os.path.join(tmp, "www"))
+        archive = os.path.join(tmp, "www", "release.zip")
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, data in contents.items():
+                zf.writestr(name, data)
+        members = {name: hashlib.sha256(data).hexdigest() for name, data in contents.items()}
+        size = os.path.getsize(archive)
+
+        server = _range_server(os.path.join(tmp, "www"))
+        url = f"http://127.0.0.1:{server.server_address[1]}/release.zip"
+        for gap in (0, 64 * 1024):
+            rz = RemoteZip(url, max_gap=gap)
+            plan = rz.plan(rz.changed_members(install))
+            print(f"max gap {gap // 1024:>3} KB: {len(rz.changed_members(install))} changed members -> "
+                  f"{len(plan)} range requests")
+
+        samples = []
+        for _ in range(min(args.iterations, 5)):
+            shutil.copytree(install, install + ".run")
+            t0 = time.perf_counter()
+            report = updater.apply_remote_update(url, install + ".run", members, running_exe=None)
+            samples.append((time.perf_counter() - t0) * 1000)
+            for name, data in contents.items():
+                with open(os.path.join(install + ".run", name), "rb") as f:
+                    assert f.read() == data, name
+            shutil.rmtree(install + ".run")
+        d = report["download"]
+        summarize("partial update", samples)
+        print(f"fetched {d['changed']} of {d['members']} members: {d['bytes'] / 1024:.0f} KB of "
+              f"{size / 2**20:.1f} MB ({d['bytes'] * 100 / size:.1f}%) in {d['requests']} requests")
+
+        # With a peer cache the first instance downloads the whole archive and the next gets it on the LAN
+        import peer_cache
+        sha = hashlib.sha256(open(archive, "rb").read()).hexdigest()
+        manifest = {"version": "9.9.9", "url": url, "sha256": sha, "members": members}
+        first = peer_cache.PeerCache(os.path.join(tmp, "cache0"), 0, bind="127.0.0.1").start()
+        second = peer_cache.PeerCache(os.path.join(tmp, "cache1"), 0, [f"127.0.0.1:{first.discovery_port}"],
+                                      bind="127.0.0.1")
+        config_path = updater.config_path
+        updater.config_path = lambda: os.path.join(tmp, "config.json")
+        try:
+            for label, cache in (("first instance", first), ("second instance", second)):
+                shutil.copytree(install, install + ".run")
+                report = updater.check_and_update(manifest=manifest, dest=install + ".run", peers=cache)
+                shutil.rmtree(install + ".run")
+                os.remove(updater.config_path())
+                source = "origin" if report["download"]["source"] == url else f"peer {report['download']['source']}"
+                print(f"peer cache, {label}: {source}, {report['download']['bytes'] / 2**20:.1f} MB, "
+                      f"cache seeded {cache.has(sha)}")
+            if source == "origin":
+                print("peer cache: second instance NOT served by the first")
+                return 1
+        finally:
+            updater.config_path = config_path
+            first.stop()
+        server.shutdown()
+
+        server = _range_server(os.path.join(tmp, "www"), ranges=False)
+        try:
+            RemoteZip(f"http://127.0.0.1:{server.server_address[1]}/release.zip")
+            print("server without ranges: NOT detected")
+            return 1
+        except RangeNotSupported as e:
+            print(f"server without ranges: detected ({e}), caller falls back to the full download")
+        finally:
+            server.shutdown()
+    return 0
+
+
+# ---------------------- HTTP Client ----------------------
+def _keepalive_server(delay):
+    """HTTP/1.1 server on localhost answering every GET with a small JSON body after delay seconds."""
+    import json
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+        hits = 0
+
+        def do_GET(self):
+            Handler.hits += 1
+            time.sleep(delay)
+            body = json.dumps({"version": "9.9.9", "path": self.path}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.handler = Handler
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@benchmark("http-client", "pooled HTTP client: connection reuse and in-flight GET coalescing", options=[
+    (("--requests",), {"type": int, "default": 50, "help": "sequential GETs per run"}),
+    (("--callers",), {"type": int, "default": 8, "help": "threads asking for the manifest at once"}),
+    (("--delay",), {"type": float, "default": 50.0, "help": "server think time per request (ms)"}),
+])
+def bench_http_client(args):
+    from concurrent.futures import ThreadPoolExecutor
+    from http_client import HttpClient
+
+    server = _keepalive_server(0)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        # A fresh client per call is what bare requests.get does: new connection every time
+        fresh, pooled = [], []
+        fresh_stats = {"connections": 0, "handshake_ms": 0.0}
+        for i in range(args.requests):
+            c = HttpClient()
+            t0 = time.perf_counter()
+            c.get_json(f"{base}/file{i}")
+            fresh.append((time.perf_counter() - t0) * 1000)
+            st = c.stats()
+            fresh_stats["connections"] += st["connections"]
+            fresh_stats["handshake_ms"] += st["handshake_ms"]
+            c.close()
+        client = HttpClient()
+        for i in range(args.requests):
+            t0 = time.perf_counter()
+            client.get_json(f"{base}/file{i}")
+            pooled.append((time.perf_counter() - t0) * 1000)
+        st = client.stats()
+        summarize("new connection per GET", fresh)
+        print(f"  {fresh_stats['connections']} connections, {fresh_stats['handshake_ms']:.1f} ms connecting")
+        summarize("pooled client", pooled)
+        print(f"  {st['connections']} connections, {st['reused']} reused, {st['handshake_ms']:.1f} ms connecting")
+        client.close()
+    finally:
+        server.shutdown()
+
+    # Concurrent manifest checks while the server is slow to answer
+    server = _keepalive_server(args.delay / 1000)
+    url = f"http://127.0.0.1:{server.server_address[1]}/latest.json"
+    try:
+        client = HttpClient()
+        with ThreadPoolExecutor(args.callers) as pool:
+            results = list(pool.map(lambda _: client.get_json(url), range(args.callers)))
+        st = client.stats()
+        client.close()
+    finally:
+        server.shutdown()
+    ok = all(r == results[0] for r in results)
+    print(f"{args.callers} concurrent manifest checks: {server.handler.hits} request(s) reached the server, "
+          f"{st['coalesced']} callers coalesced, results identical: {ok}")
+    return 0 if ok and server.handler.hits < args.callers else 1
+
+
+# ---------------------- World Index ----------------------
+def make_indexed_worlds(folder, count, icons=False):
+    """Write count world folders with a real level.dat, a few LevelDB-sized files and optionally an icon."""
+    from world_index import (
+        TAG_BYTE, TAG_COMPOUND, TAG_FLOAT, TAG_INT, TAG_LONG, TAG_STRING, level_dat_bytes,
+    )
+    icon = None
+    if icons:
+        from PyQt6.QtCore import QBuffer, QByteArray, QIODevice
+        from PyQt6.QtGui import QColor, QImage
+        image = QImage(800, 450, QImage.Format.Format_RGB32)
+        image.fill(QColor("#3d5afe"))
+        data = QByteArray()
+        buf = QBuffer(data)
+        buf.open(QIODevice.OpenModeFlag.WriteOnly)
+        image.save(buf, "JPEG", 90)
+        icon = bytes(data)
+    now = int(time.time())
+    for w in range(count):
+        root = os.path.join(folder, f"world{w:04d}")
+        os.makedirs(os.path.join(root, "db"), exist_ok=True)
+        fields = [
+            (TAG_STRING, "LevelName", f"World {w}"),
+            (TAG_LONG, "LastPlayed", now - w * 3600),
+            (TAG_INT, "GameType", w % 3),
+            (TAG_BYTE, "IsHardcore", int(w % 17 == 0)),
+            (TAG_LONG, "RandomSeed", w * 7919),
+            (TAG_COMPOUND, "abilities", [(TAG_FLOAT, "walkSpeed", 0.1), (TAG_FLOAT, "flySpeed", 0.05),
+                                         (TAG_BYTE, "mayfly", 0), (TAG_BYTE, "instabuild", 0)]),
+        ]
+        # Real level.dat files carry ~100 game rules and flags the browser never shows
+        fields += [(TAG_BYTE, f"rule{i}", i & 1) for i in range(100)]
+        with open(os.path.join(root, "level.dat"), "wb") as f:
+            f.write(level_dat_bytes(fields))
+        for i in range(8):
+            with open(os.path.join(root, "db", f"{i:06d}.ldb"), "wb") as f:
+                f.write(b"\0" * 4096)
+        with open(os.path.join(root, "db", "000009.log"), "wb") as f:
+            f.write(b"\0" * 1024)
+        if icon:
+            with open(os.path.join(root, "world_icon.jpeg"), "wb") as f:
+                f.write(icon)
+
+
+@benchmark("world-index", "world browser: level.dat index and cached thumbnails", options=[
+    (("--worlds",), {"type": int, "default": 300, "help": "synthetic worlds"}),
+    (("--changed",), {"type": int, "default": 3, "help": "worlds played between scans"}),
+    (("--thumbnails",), {"action": "store_true", "help": "also time thumbnail caching (needs PyQt6)"}),
+])
+def bench_world_index(args):
+    import tempfile
+    from world_index import ICON_NAME, WorldIndex, thumbnail_path
+
+    if args.thumbnails:
+        qt_app()
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "minecraftWorlds")
+        make_indexed_worlds(root, args.worlds, icons=args.thumbnails)
+        index_file = os.path.join(tmp, "world_index.json")
+
+        cold, warm = [], []
+        for _ in range(min(args.iterations, 10)):
+            t0 = time.perf_counter()
+            WorldIndex(index_file, root).scan(rebuild=True)
+            cold.append((time.perf_counter() - t0) * 1000)
+        for _ in range(args.iterations):
+            t0 = time.perf_counter()
+            worlds, stats = WorldIndex(index_file, root).scan()
+            warm.append((time.perf_counter() - t0) * 1000)
+        assert stats["reread"] == 0 and len(worlds) == args.worlds
+        summarize("parse every level.dat", cold)
+        summarize("cached index (load + stat)", warm)
+
+        time.sleep(0.01)
+        for w in range(args.changed):
+            os.utime(os.path.join(root, f"world{w * 10:04d}", "level.dat"))
+        t0 = time.perf_counter()
+        worlds, stats = WorldIndex(index_file, root).scan()
+        print(f"after playing {args.changed} worlds: re-read {stats['reread']} of {stats['worlds']} "
+              f"in {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+        # LevelDB appends to its log without changing the db folder's mtime; the size must follow
+        log = os.path.join(root, "world0001", "db", "000009.log")
+        before = next(w["size"] for w in worlds if w["folder"] == "world0001")
+        time.sleep(0.01)
+        with open(log, "ab") as f:
+            f.write(b"\0" * 65536)
+        worlds, stats = WorldIndex(index_file, root).scan()
+        after = next(w["size"] for w in worlds if w["folder"] == "world0001")
+        print(f"after a LevelDB append: re-read {stats['reread']}, size {before} -> {after} bytes")
+        if after != before + 65536:
+            print("LevelDB append: size NOT refreshed")
+            return 1
+
+        delivered = []
+        t0 = time.perf_counter()
+        WorldIndex(index_file, root).scan(on_world=lambda w: delivered.append(time.perf_counter() - t0))
+        print(f"first world delivered to the page after {delivered[0] * 1000:.2f} ms, "
+              f"last after {delivered[-1] * 1000:.2f} ms")
+
+        if args.thumbnails:
+            from image_cache import write_thumbnail
+            thumbs = os.path.join(tmp, "world_thumbs")
+            for label in ("decode icons to 96x54", "cached thumbnails"):
+                samples = []
+                for world in worlds:
+                    t0 = time.perf_counter()
+                    path = thumbnail_path(world, 96, 54, thumbs)
+                    if not os.path.exists(path):
+                        write_thumbnail(os.path.join(world["path"], ICON_NAME), path, 96, 54)
+                    samples.append((time.perf_counter() - t0) * 1000)
+                summarize(label, samples)
+            print(f"{len(os.listdir(thumbs))} thumbnails, "
+                  f"{sum(os.path.getsize(os.path.join(thumbs, n)) for n in os.listdir(thumbs)) // 1024} KB on disk")
+    return 0
+
+
+# ---------------------- Entry Point ----------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Viola Launcher benchmarks")
+    parser.add_argument("--list", action="store_true", help="list benchmarks")
+    sub = parser.add_subparsers(dest="name")
+    for name, (_, help_text, options) in BENCHMARKS.items():
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("-n", "--iterations", type=int, default=200)
+        for flags, kwargs in options:
+            p.add_argument(*flags, **kwargs)
+    args = parser.parse_args(argv)
+
+    if args.list or not args.name:
+        for name, (_, help_text, _) in sorted(BENCHMARKS.items()):
+            print(f"{name:<20} {help_text}")
+        return 0
+    func = BENCHMARKS[args.name][0]
+    return func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
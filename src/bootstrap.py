@@ -0,0 +1,137 @@
+"""
+Viola Launcher - Bootstrap entry point
+Shows a splash as soon as the interpreter is up, then imports and builds the
+full launcher in stages while reporting progress on the splash. Only the Qt
+widgets needed for the splash are imported before it is on screen.
+
+Time-to-splash and time-to-interactive are measured from the moment the user
+started the app and printed (and traced) once the main window has painted.
+Headless platforms (offscreen, minimal) never expose the splash, and
+QSplashScreen.show() would wait a full second for that, so the splash is
+not shown there and time-to-splash is when it would have been.
+"""
+
+import os
+import sys
+import time
+
+BOOT_WALL = time.time()
+
+if __name__ == "__main__":
+    # Hand off to an already running launcher before importing anything heavy
+    from single_instance import hand_off_or_continue
+    hand_off_or_continue()
+
+from PyQt6.QtWidgets import QApplication, QSplashScreen
+from PyQt6.QtGui import QPixmap, QPainter, QColor, QFont
+from PyQt6.QtCore import Qt, QTimer, QObject, QEvent
+
+from launcher_config import resource_dir
+
+SPLASH_SIZE = (420, 240)
+HEADLESS_PLATFORMS = ("offscreen", "minimal")
+
+
+def splash_pixmap():
+    """Render the splash: logo and title on the launcher's dark background."""
+    from PyQt6.QtGui import QImageReader
+    from PyQt6.QtCore import QSize
+
+    w, h = SPLASH_SIZE
+    pixmap = QPixmap(w, h)
+    pixmap.fill(QColor("#1e1e1e"))
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+    # logo.png is 1024px; decode it straight at 96px
+    reader = QImageReader(os.path.join(resource_dir(), "assets", "logo.png"))
+    reader.setScaledSize(QSize(96, 96))
+    logo = reader.read()
+    if not logo.isNull():
+        painter.drawImage((w - 96) // 2, 40, logo)
+    painter.setPen(QColor("white"))
+    painter.setFont(QFont("Segoe UI", 18, QFont.Weight.Bold))
+    painter.drawText(0, 145, w, 40, Qt.AlignmentFlag.AlignCenter, "Viola Launcher")
+    painter.end()
+    return pixmap
+
+
+class Splash(QSplashScreen):
+    def __init__(self):
+        super().__init__(splash_pixmap(), Qt.WindowType.WindowStaysOnTopHint)
+
+    def progress(self, text):
+        """Show a stage message and let the splash repaint before the next blocking step."""
+        self.showMessage(text, Qt.AlignmentFlag.AlignBottom | Qt.AlignmentFlag.AlignHCenter, QColor("#bbbbbb"))
+        QApplication.processEvents()
+
+
+class FirstPaintWatcher(QObject):
+    """Calls callback once, right after the watched widget finishes its first paint."""
+
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self.callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            obj.removeEventFilter(self)
+            # Runs after this paint event has been fully processed
+            QTimer.singleShot(0, self.callback)
+        return False
+
+
+def report_startup(splash_wall, headless=False):
+    """Print time-to-splash and time-to-interactive relative to the user's launch."""
+    import tracing
+    import metrics
+    from process_stats import launch_start_time
+
+    interactive_wall = time.time()
+    start = launch_start_time() or BOOT_WALL
+    to_splash = splash_wall - start
+    to_interactive = interactive_wall - start
+    tracing.instant("startup.interactive", to_splash_ms=round(to_splash * 1000, 1),
+                    to_interactive_ms=round(to_interactive * 1000, 1))
+    if "--startup-probe" not in sys.argv:
+        metrics.record("startup.splash_ms", to_splash * 1000)
+        metrics.record("startup.interactive_ms", to_interactive * 1000)
+    print(f"[Startup] Splash after {to_splash * 1000:.0f} ms, interactive after {to_interactive * 1000:.0f} ms "
+          f"(interpreter up after {(BOOT_WALL - start) * 1000:.0f} ms{', headless: splash not shown' if headless else ''})")
+
+
+def main():
+    app = QApplication(sys.argv)
+    splash = Splash()
+    headless = app.platformName() in HEADLESS_PLATFORMS
+    if not headless:
+        splash.show()
+    splash.progress("Starting…")
+    splash_wall = time.time()
+
+    splash.progress("Loading modules…")
+    import tracing
+    trace_path = tracing.trace_path_from_argv(sys.argv)
+    with tracing.span("startup.import_launcher"):
+        import viola_launcher
+
+    with tracing.span("startup.build_window"):
+        window = viola_launcher.create_main_window(splash.progress)
+    if window is None:
+        return 0
+    splash.progress("Ready")
+
+    def interactive():
+        splash.close()
+        splash.deleteLater()
+        report_startup(splash_wall, headless)
+        if "--startup-probe" in sys.argv:
+            # Used by the startup bench: measure once, then exit
+            QTimer.singleShot(0, app.quit)
+
+    FirstPaintWatcher(window, interactive)
+    return viola_launcher.run_launcher(app, window, trace_path)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
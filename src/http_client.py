@@ -0,0 +1,215 @@
+"""
+Viola Launcher - Shared HTTP client
+Every download goes through one requests.Session with a keep-alive pool, so
+the manifest check, the archive download and per-file fetches against the
+same host reuse a connection instead of paying a TCP + TLS handshake each.
+Timeouts and retries are set once here: GET/HEAD retry connection errors
+and 429/5xx answers with exponential backoff.
+
+Identical in-flight get()/get_json() calls share one request: a second
+caller asking for the manifest while the first is still waiting gets the
+same response. stream() downloads are never shared.
+
+stats() reports requests, coalesced callers, connections opened and reused,
+and the seconds spent connecting. requests is imported on first use, so
+importing this module costs nothing (the CLI checks versions without it).
+"""
+
+import time
+import threading
+
+import tracing
+
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 30
+RETRIES = 3
+BACKOFF = 0.5                                   # urllib3 2.x sleeps 0 s, 1 s, 2 s before retries 1-3
+RETRY_STATUS = (429, 500, 502, 503, 504)
+POOL_SIZE = 8
+USER_AGENT = "ViolaLauncher"
+
+
+class _Call:
+    """One in-flight GET that later callers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class HttpClient:
+    def __init__(self, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), retries=RETRIES, backoff=BACKOFF,
+                 pool_size=POOL_SIZE):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.pool_size = pool_size
+        self._session = None
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.requests = 0
+        self.coalesced = 0
+        self.sent = 0
+        self.connections = 0
+        self.handshake_seconds = 0.0
+
+    # ---------- Session ----------
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._build_session()
+        return self._session
+
+    def _build_session(self):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        from urllib3.connection import HTTPConnection, HTTPSConnection
+        from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+        client = self
+
+        def timed(base):
+            class Connection(base):
+                def connect(self):
+                    t0 = time.perf_counter()
+                    try:
+                        return super().connect()
+                    finally:
+                        client._connected(self.host, time.perf_counter() - t0)
+
+                def request(self, *args, **kwargs):
+                    client._count("sent")
+                    return super().request(*args, **kwargs)
+            Connection.__name__ = f"Timed{base.__name__}"
+            return Connection
+
+        class HTTPPool(HTTPConnectionPool):
+            ConnectionCls = timed(HTTPConnection)
+
+        class HTTPSPool(HTTPSConnectionPool):
+            ConnectionCls = timed(HTTPSConnection)
+
+        class Adapter(HTTPAdapter):
+            def init_poolmanager(self, *args, **kwargs):
+                super().init_poolmanager(*args, **kwargs)
+                self.poolmanager.pool_classes_by_scheme = {"http": HTTPPool, "https": HTTPSPool}
+
+        retry = Retry(total=self.retries, backoff_factor=self.backoff, status_forcelist=RETRY_STATUS,
+                      allowed_methods=frozenset({"GET", "HEAD"}), raise_on_status=False)
+        adapter = Adapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=retry)
+        session = requests.Session()
+        session.headers["User-Agent"] = USER_AGENT
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _connected(self, host, seconds):
+        with self._lock:
+            self.connections += 1
+            self.handshake_seconds += seconds
+        tracing.instant("http.connect", host=host, ms=round(seconds * 1000, 2))
+
+    def _count(self, name, n=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    # ---------- Requests ----------
+    def get(self, url, timeout=None, headers=None):
+        """
+        GET with the body read. Concurrent calls for the same url (without
+        extra headers) share one request and receive the same response.
+        """
+        self._count("requests")
+        if headers:
+            return self._get(url, timeout, headers)
+        with self._lock:
+            call = self._inflight.get(url)
+            leader = call is None
+            if leader:
+                call = self._inflight[url] = _Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            with tracing.span("http.wait", url=url):
+                call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.response
+        try:
+            call.response = self._get(url, timeout, None)
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[url]
+            call.done.set()
+        return call.response
+
+    def _get(self, url, timeout, headers):
+        with tracing.span("http.get", url=url) as sp:
+            r = self.session().get(url, timeout=timeout or self.timeout, headers=headers)
+            body = r.content                    # read now so waiters never touch the socket
+            sp.set("status", r.status_code)
+            sp.set("bytes", len(body))
+        return r
+
+    def get_json(self, url, timeout=None):
+        """GET, raise on an HTTP error status, and parse the body."""
+        r = self.get(url, timeout)
+        r.raise_for_status()
+        return r.json()
+
+    def stream(self, url, timeout=None, headers=None):
+        """Streaming GET for downloads; use as a context manager and iterate the body."""
+        self._count("requests")
+        with tracing.span("http.stream", url=url) as sp:
+            r = self.session().get(url, stream=True, timeout=timeout or self.timeout, headers=headers)
+            sp.set("status", r.status_code)
+        return r
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self.requests, "coalesced": self.coalesced, "sent": self.sent,
+                "connections": self.connections, "reused": max(0, self.sent - self.connections),
+                "handshake_ms": round(self.handshake_seconds * 1000, 2),
+            }
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def client():
+    """The process-wide client every caller shares."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
+
+
+def get(url, timeout=None, headers=None):
+    return client().get(url, timeout, headers)
+
+
+def get_json(url, timeout=None):
+    return client().get_json(url, timeout)
+
+
+def stream(url, timeout=None, headers=None):
+    return client().stream(url, timeout, headers)
+
+
+def stats():
+    return client().stats()
@@ -0,0 +1,144 @@
+"""
+Viola Launcher - Shared image loader
+Decodes images straight to the size they are displayed at (QImageReader scaled
+decode) and keeps the results in one process-wide LRU cache with a memory cap,
+so every page asking for background.png at 900x600 shares one pixmap.
+"""
+
+import os
+from collections import OrderedDict
+
+from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtGui import QGuiApplication, QImageReader, QPixmap
+
+import tracing
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+class PixmapCache:
+    """LRU cache of decoded pixmaps keyed by (path, size, mode, DPR, mtime)."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        pixmap = self._items.get(key)
+        if pixmap is not None:
+            self._items.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+        return pixmap
+
+    def put(self, key, pixmap):
+        cost = _pixmap_bytes(pixmap)
+        if cost > self.max_bytes:
+            return
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.bytes_used -= _pixmap_bytes(old)
+        self._items[key] = pixmap
+        self.bytes_used += cost
+        while self.bytes_used > self.max_bytes and self._items:
+            _, evicted = self._items.popitem(last=False)
+            self.bytes_used -= _pixmap_bytes(evicted)
+
+    def clear(self):
+        self._items.clear()
+        self.bytes_used = 0
+
+    def stats(self):
+        return {
+            "entries": len(self._items),
+            "bytes": self.bytes_used,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def _pixmap_bytes(pixmap):
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+_cache = PixmapCache()
+
+
+def cache():
+    """Return the process-wide pixmap cache."""
+    return _cache
+
+
+def _device_pixel_ratio():
+    app = QGuiApplication.instance()
+    if app is None:
+        return 1.0
+    screen = app.primaryScreen()
+    return screen.devicePixelRatio() if screen is not None else app.devicePixelRatio()
+
+
+def load_pixmap(path, width, height, mode=Qt.AspectRatioMode.KeepAspectRatio, dpr=None):
+    """
+    Return a QPixmap of path scaled to fit (width, height) logical pixels.
+    Returns a null QPixmap if the file is missing or cannot be decoded.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return QPixmap()
+    dpr = dpr or _device_pixel_ratio()
+    key = (os.path.abspath(path), width, height, mode.value, dpr, mtime)
+    pixmap = _cache.get(key)
+    if pixmap is not None:
+        return pixmap
+
+    with tracing.span("image.decode", path=os.path.basename(path), width=width, height=height):
+        image = decode_scaled(path, round(width * dpr), round(height * dpr), mode)
+        if image.isNull():
+            return QPixmap()
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(dpr)
+
+    _cache.put(key, pixmap)
+    return pixmap
+
+
+def decode_scaled(path, width, height, mode=Qt.AspectRatioMode.KeepAspectRatio):
+    """
+    Decode path straight to fit (width, height) device pixels. Returns a QImage,
+    null on failure; safe to call off the GUI thread.
+    """
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    source = reader.size()
+    target = QSize(width, height)
+    if source.isValid():
+        reader.setScaledSize(source.scaled(target, mode))
+    image = reader.read()
+    if image.isNull():
+        print(f"Failed to load image {path}: {reader.errorString()}")
+        return image
+    if not source.isValid():
+        image = image.scaled(target, mode, Qt.TransformationMode.SmoothTransformation)
+    return image
+
+
+def write_thumbnail(src, dst, width, height):
+    """Decode src at (width, height) device pixels and save it as PNG at dst. Returns False on failure."""
+    with tracing.span("image.thumbnail", path=os.path.basename(src), width=width, height=height):
+        image = decode_scaled(src, width, height, Qt.AspectRatioMode.KeepAspectRatioByExpanding)
+        if image.isNull():
+            return False
+        if image.width() > width or image.height() > height:
+            image = image.copy((image.width() - width) // 2, (image.height() - height) // 2, width, height)
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        tmp = dst + ".tmp"
+        if not image.save(tmp, "PNG"):
+            return False
+        os.replace(tmp, dst)
+    return True
@@ -0,0 +1,68 @@
+"""
+Viola Launcher - Keyboard input backends
+HotkeyService reads raw key events from a pluggable backend:
+
+    backend.start(callback)   callback(event) runs on the backend's own thread;
+                              event has .event_type ("down"/"up"), .scan_code, .time
+    backend.stop()
+    backend.key_codes(name)   codes the backend reports for a keymap key name
+
+KeyboardBackend is the global hook of the `keyboard` module. SyntheticBackend
+delivers events injected from code, so the hotkey path can be exercised
+headless (benchmarks, Linux without a hook).
+"""
+
+import time
+from collections import namedtuple
+
+KeyEvent = namedtuple("KeyEvent", "event_type scan_code time")
+
+
+class KeyboardBackend:
+    """Global hook through the `keyboard` module. Raises ImportError if it is missing."""
+
+    name = "keyboard"
+
+    def __init__(self):
+        import keyboard
+        self._keyboard = keyboard
+        self._hook = None
+
+    def start(self, callback):
+        self._hook = self._keyboard.hook(callback)
+
+    def stop(self):
+        if self._hook is not None:
+            self._keyboard.unhook(self._hook)
+            self._hook = None
+
+    def key_codes(self, name):
+        return self._keyboard.key_to_scan_codes(name)
+
+
+class SyntheticBackend:
+    """Key events come from send()/tap(); codes are the key names themselves."""
+
+    name = "synthetic"
+
+    def __init__(self):
+        self._callback = None
+
+    def start(self, callback):
+        self._callback = callback
+
+    def stop(self):
+        self._callback = None
+
+    def key_codes(self, name):
+        return (name,)
+
+    def send(self, name, down=True):
+        """Deliver one event on the calling thread, like an OS hook thread would."""
+        callback = self._callback
+        if callback is not None:
+            callback(KeyEvent("down" if down else "up", name, time.time()))
+
+    def tap(self, name):
+        self.send(name, True)
+        self.send(name, False)
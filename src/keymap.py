@@ -0,0 +1,254 @@
+"""
+Viola Launcher - Keymap engine
+Parses every binding in config.json once into a compiled lookup table, so a key
+event is dispatched to its action with plain dict lookups and no string work.
+
+Binding syntax follows the `keyboard` module: "ctrl+shift+z", "right shift",
+and chords as comma-separated steps ("ctrl+k, z"). The comma key is "comma".
+Actions are "toggle_overlay" and "module:<id>" (show or hide one overlay module).
+"""
+
+import time
+
+CTRL = 1
+SHIFT = 2
+ALT = 4
+META = 8
+
+# Modifier key name -> bit. A modifier is only a modifier when followed by another key.
+MODIFIER_KEYS = {
+    "ctrl": CTRL, "left ctrl": CTRL, "right ctrl": CTRL,
+    "shift": SHIFT, "left shift": SHIFT, "right shift": SHIFT,
+    "alt": ALT, "left alt": ALT, "right alt": ALT, "alt gr": ALT,
+    "windows": META, "left windows": META, "right windows": META,
+}
+
+ALIASES = {
+    "return": "enter",
+    "escape": "esc",
+    "backtick": "`",
+    "grave": "`",
+    "plus": "+",
+    "comma": ",",
+    "minus": "-",
+    "equals": "=",
+    "control": "ctrl",
+    "ctl": "ctrl",
+    "option": "alt",
+    "altgr": "alt gr",
+    "win": "windows",
+    "meta": "windows",
+    "cmd": "windows",
+    "super": "windows",
+    "del": "delete",
+    "ins": "insert",
+    "pgup": "page up",
+    "pageup": "page up",
+    "pgdn": "page down",
+    "pagedown": "page down",
+    "capslock": "caps lock",
+    "numlock": "num lock",
+    "scrolllock": "scroll lock",
+    "printscreen": "print screen",
+    "prtsc": "print screen",
+    "spacebar": "space",
+    "lshift": "left shift",
+    "rshift": "right shift",
+    "lctrl": "left ctrl",
+    "rctrl": "right ctrl",
+}
+
+NAMED_KEYS = {
+    "space", "enter", "esc", "tab", "backspace", "delete", "insert", "home", "end",
+    "page up", "page down", "up", "down", "left", "right", "caps lock", "num lock",
+    "scroll lock", "print screen", "pause", "menu",
+    "`", "-", "=", "[", "]", "\\", ";", "'", ",", ".", "/", "+",
+}
+NAMED_KEYS.update(MODIFIER_KEYS)
+NAMED_KEYS.update(chr(c) for c in range(ord("a"), ord("z") + 1))
+NAMED_KEYS.update(str(d) for d in range(10))
+NAMED_KEYS.update(f"f{n}" for n in range(1, 25))
+
+CHORD_TIMEOUT = 1.0
+MODULE_ACTION_PREFIX = "module:"
+
+
+class KeymapError(ValueError):
+    """Raised for a binding that cannot be parsed."""
+
+
+def normalize_key(name):
+    """Return the canonical name of a single key, or raise KeymapError."""
+    s = " ".join((name or "").strip().lower().split())
+    s = ALIASES.get(s, s)
+    if s not in NAMED_KEYS:
+        raise KeymapError(f"unknown key '{name}'")
+    return s
+
+
+def parse_binding(text):
+    """
+    Parse a binding into a tuple of steps, each (modifier bits, key name).
+    "ctrl+k, z" -> ((CTRL, "k"), (0, "z"))
+    """
+    steps = []
+    for raw_step in (text or "").split(","):
+        raw_step = raw_step.strip()
+        if not raw_step:
+            raise KeymapError(f"empty step in '{text}'")
+        # A trailing "+" means the plus key itself ("ctrl++")
+        parts = raw_step.split("+")
+        if raw_step.endswith("+"):
+            parts = parts[:-2] + ["+"]
+        names = [normalize_key(p) for p in parts]
+        mods = 0
+        for mod in names[:-1]:
+            bit = MODIFIER_KEYS.get(mod)
+            if bit is None:
+                raise KeymapError(f"'{mod}' is not a modifier in '{text}'")
+            mods |= bit
+        steps.append((mods, names[-1]))
+    return tuple(steps)
+
+
+def format_binding(steps):
+    """Inverse of parse_binding: return the canonical binding string."""
+    out = []
+    for mods, key in steps:
+        names = [n for n, bit in (("ctrl", CTRL), ("shift", SHIFT), ("alt", ALT), ("windows", META)) if mods & bit]
+        # "," separates chord steps, so the comma key is spelled out
+        out.append("+".join(names + ["comma" if key == "," else key]))
+    return ", ".join(out)
+
+
+def _name_codes(name):
+    return (name,)
+
+
+def module_action(module_id):
+    """Action name of the binding that toggles one overlay module."""
+    return MODULE_ACTION_PREFIX + module_id
+
+
+# ---------------------- Compiled Keymap ----------------------
+class Keymap:
+    """
+    Immutable compiled bindings.
+    key_codes maps a canonical key name to the codes an input backend reports
+    for it (scan codes, Qt key values...). By default the code is the name itself.
+    When actions is given, bindings for any other action are rejected into errors.
+    """
+
+    def __init__(self, bindings, key_codes=None, actions=None):
+        key_codes = key_codes or _name_codes
+        self.bindings = {}
+        self.errors = []
+        self.root = {}
+        self.mod_bits = {}
+
+        for name, bit in MODIFIER_KEYS.items():
+            for code in self._codes(key_codes, name):
+                self.mod_bits[code] = bit
+
+        for action, text in bindings.items():
+            try:
+                if actions is not None and action not in actions:
+                    raise KeymapError("no handler for this action")
+                steps = parse_binding(text)
+                paths = [[]]
+                for mods, key in steps:
+                    codes = self._codes(key_codes, key)
+                    if not codes:
+                        raise KeymapError(f"key '{key}' is not available on this input backend")
+                    paths = [p + [(mods, c)] for p in paths for c in codes]
+                for path in paths:
+                    self._insert(path, action)
+            except KeymapError as e:
+                self.errors.append(f"{action}: {e}")
+                continue
+            self.bindings[action] = format_binding(steps)
+
+    @staticmethod
+    def _codes(key_codes, name):
+        try:
+            return tuple(key_codes(name))
+        except Exception:
+            return ()
+
+    def _insert(self, path, action):
+        node = self.root
+        for i, step in enumerate(path):
+            last = i == len(path) - 1
+            existing = node.get(step)
+            if last:
+                if isinstance(existing, dict):
+                    raise KeymapError("is a prefix of another chord")
+                if existing is not None and existing != action:
+                    raise KeymapError(f"conflicts with '{existing}'")
+                node[step] = action
+            else:
+                if isinstance(existing, str):
+                    raise KeymapError(f"chord starts with the binding of '{existing}'")
+                node = node.setdefault(step, {})
+
+    def __len__(self):
+        return len(self.bindings)
+
+
+class KeyMatcher:
+    """Per-input-source state (held modifiers, partial chord) over a compiled Keymap."""
+
+    __slots__ = ("keymap", "mods", "node", "chord_started", "held")
+
+    def __init__(self, keymap):
+        self.keymap = keymap
+        self.mods = 0
+        self.node = keymap.root
+        self.chord_started = 0.0
+        self.held = set()
+
+    def feed(self, down, code):
+        """Feed a raw key down/up event. Returns the triggered action or None."""
+        bit = self.keymap.mod_bits.get(code)
+        if not down:
+            self.held.discard(code)
+            if bit:
+                self.mods &= ~bit
+            return None
+        if code in self.held:
+            return None  # auto-repeat
+        self.held.add(code)
+        if bit:
+            # Holding a modifier for the next chord step must not abandon the chord
+            step = (self.mods, code)
+            action = self.match(*step) if step in self.node or step in self.keymap.root else None
+            self.mods |= bit
+            return action
+        return self.match(self.mods, code)
+
+    def match(self, mods, code):
+        """Match one key press with explicit modifier bits (e.g. from a Qt event)."""
+        node = self.node
+        if node is not self.keymap.root and time.monotonic() - self.chord_started > CHORD_TIMEOUT:
+            node = self.keymap.root
+        hit = node.get((mods, code))
+        if hit is None and node is not self.keymap.root:
+            node = self.keymap.root
+            hit = node.get((mods, code))
+        if hit is None:
+            self.node = self.keymap.root
+            return None
+        if isinstance(hit, dict):
+            self.node = hit
+            self.chord_started = time.monotonic()
+            return None
+        self.node = self.keymap.root
+        return hit
+
+
+def bindings_from_config(cfg, default_toggle="right shift"):
+    """Collect action -> binding text from a config dict."""
+    bindings = dict(cfg.get("keybindings", {}))
+    # modules_hotkey stays the source of truth for the overlay toggle
+    bindings["toggle_overlay"] = cfg.get("modules_hotkey", default_toggle)
+    return bindings
@@ -0,0 +1,259 @@
+"""
+Viola Launcher - Staged launch pipeline
+Launching is split into stages (resolve install, pre-launch tasks, spawn,
+confirm) that run off the GUI thread. Stages whose dependencies are met run
+concurrently, report timing to a listener and can be cancelled between and
+inside stages. The platform spawner is pluggable so the pipeline also runs
+on Linux.
+"""
+
+import os
+import sys
+import glob
+import time
+import shutil
+import functools
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import tracing
+
+MINECRAFT_PROTOCOL = "minecraft://"
+MINECRAFT_PROCESS = "Minecraft.Windows.exe"
+CONFIRM_TIMEOUT = 30.0
+CONFIRM_POLL = 0.25
+
+
+class LaunchCancelled(Exception):
+    """Raised inside a stage when the launch was cancelled."""
+
+
+class CancelToken:
+    """Cancellation flag shared by every stage of one launch."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """Cancellation point: raise LaunchCancelled if cancel() was called."""
+        if self._event.is_set():
+            raise LaunchCancelled()
+
+    def wait(self, seconds):
+        """Sleep up to seconds; returns early (raising) if cancelled."""
+        if self._event.wait(seconds):
+            raise LaunchCancelled()
+
+
+# ---------------------- Game Install Lookup ----------------------
+@functools.lru_cache(maxsize=1)
+def find_minecraft_install():
+    """
+    Return the path of Minecraft.Windows.exe, or None.
+    Globbing WindowsApps is slow, so the result is cached for the process lifetime.
+    """
+    paths = glob.glob(r"C:\Program Files\WindowsApps\Microsoft.MinecraftUWP_*\Minecraft.Windows.exe")
+    paths.append(r"C:\Program Files\Microsoft Studios\Minecraft\Minecraft.Windows.exe")
+    for p in paths:
+        if os.path.exists(p):
+            return p
+    return None
+
+
+# ---------------------- Spawners ----------------------
+class WindowsSpawner:
+    """Starts Bedrock through the minecraft:// protocol or the installed exe."""
+
+    def __init__(self, find_install=None):
+        self.find_install = find_install
+
+    def resolve(self, cancel):
+        # The protocol handler needs no lookup; the exe path is only a fallback
+        path = self.find_install() if self.find_install else None
+        return {"protocol": MINECRAFT_PROTOCOL, "exe": path}
+
+    def spawn(self, target, cancel):
+        try:
+            os.startfile(target["protocol"])
+            return {"via": "protocol"}
+        except Exception:
+            pass
+        if target.get("exe"):
+            os.startfile(target["exe"])
+            return {"via": target["exe"]}
+        raise RuntimeError("Failed to launch Minecraft. Check installation.")
+
+    def is_running(self, spawned):
+        return process_running(MINECRAFT_PROCESS)
+
+
+class CommandSpawner:
+    """Runs an arbitrary command; used on Linux and for testing the pipeline."""
+
+    def __init__(self, argv, process_name=None):
+        self.argv = list(argv)
+        self.process_name = process_name
+
+    def resolve(self, cancel):
+        exe = shutil.which(self.argv[0]) or (self.argv[0] if os.path.exists(self.argv[0]) else None)
+        if exe is None:
+            raise RuntimeError(f"{self.argv[0]} not found")
+        return {"argv": [exe] + self.argv[1:]}
+
+    def spawn(self, target, cancel):
+        proc = subprocess.Popen(target["argv"])
+        return {"via": target["argv"][0], "pid": proc.pid, "proc": proc}
+
+    def is_running(self, spawned):
+        if self.process_name:
+            return process_running(self.process_name)
+        return spawned["proc"].poll() is None
+
+
+def process_running(name):
+    """Return True if a process with this executable name exists."""
+    try:
+        import psutil
+        lname = name.lower()
+        return any((p.info["name"] or "").lower() == lname for p in psutil.process_iter(["name"]))
+    except ImportError:
+        pass
+    if sys.platform == "win32":
+        out = subprocess.run(
+            ["tasklist", "/FI", f"IMAGENAME eq {name}", "/NH"],
+            capture_output=True, text=True, creationflags=0x08000000,
+        ).stdout
+        return name.lower() in out.lower()
+    return subprocess.run(["pgrep", "-x", name], capture_output=True).returncode == 0
+
+
+# ---------------------- Pipeline ----------------------
+class Stage:
+    """One pipeline step. func(ctx, cancel) returns a value stored in ctx[name]."""
+
+    def __init__(self, name, func, depends=(), required=True):
+        self.name = name
+        self.func = func
+        self.depends = tuple(depends)
+        self.required = required
+
+
+class LaunchPipeline:
+    """
+    Runs stages as a dependency graph on a small thread pool.
+    listener(stage, state, seconds, detail) is called with state in
+    "running", "done", "failed", "skipped", "cancelled".
+    """
+
+    def __init__(self, stages, listener=None, max_workers=4):
+        self.stages = {s.name: s for s in stages}
+        self.listener = listener or (lambda *a: None)
+        self.max_workers = max_workers
+        self.cancel_token = CancelToken()
+        for s in stages:
+            for d in s.depends:
+                if d not in self.stages:
+                    raise ValueError(f"stage {s.name} depends on unknown stage {d}")
+
+    def cancel(self):
+        self.cancel_token.cancel()
+
+    def _run_stage(self, stage, ctx):
+        self.cancel_token.check()
+        self.listener(stage.name, "running", 0.0, None)
+        t0 = time.perf_counter()
+        with tracing.span(f"launch.{stage.name}"):
+            result = stage.func(ctx, self.cancel_token)
+        return result, time.perf_counter() - t0
+
+    def run(self, ctx=None):
+        """Run every stage. Returns (ok, ctx, timings); ctx["error"] holds the failure."""
+        ctx = dict(ctx or {})
+        timings = {}
+        pending = dict(self.stages)
+        done = set()
+        failed = False
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="launch") as pool:
+            running = {}
+            while pending or running:
+                if not failed and not self.cancel_token.cancelled:
+                    for name, stage in list(pending.items()):
+                        if all(d in done for d in stage.depends):
+                            running[pool.submit(self._run_stage, stage, ctx)] = stage
+                            del pending[name]
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    stage = running.pop(fut)
+                    try:
+                        ctx[stage.name], seconds = fut.result()
+                        timings[stage.name] = seconds
+                        done.add(stage.name)
+                        self.listener(stage.name, "done", seconds, ctx[stage.name])
+                    except LaunchCancelled:
+                        self.listener(stage.name, "cancelled", 0.0, None)
+                    except Exception as e:
+                        if stage.required:
+                            failed = True
+                            ctx.setdefault("error", f"{stage.name}: {e}")
+                            self.listener(stage.name, "failed", 0.0, str(e))
+                        else:
+                            # Optional stages never block the launch
+                            done.add(stage.name)
+                            self.listener(stage.name, "skipped", 0.0, str(e))
+        for name in pending:
+            self.listener(name, "cancelled" if self.cancel_token.cancelled else "skipped", 0.0, None)
+        if self.cancel_token.cancelled and "error" not in ctx:
+            ctx["error"] = "cancelled"
+        timings["total"] = time.perf_counter() - t0
+        ok = not failed and not self.cancel_token.cancelled and not pending
+        return ok, ctx, timings
+
+
+def build_launch_pipeline(spawner, pre_launch_tasks=(), listener=None, confirm_timeout=CONFIRM_TIMEOUT):
+    """
+    Standard launch graph:
+        resolve_install ─┐
+        pre-launch tasks ┼─> spawn ─> confirm
+    pre_launch_tasks is a sequence of (name, func(ctx, cancel)); they are optional.
+    """
+    def resolve(ctx, cancel):
+        return spawner.resolve(cancel)
+
+    def spawn(ctx, cancel):
+        cancel.check()
+        return spawner.spawn(ctx["resolve_install"], cancel)
+
+    def confirm(ctx, cancel):
+        deadline = time.monotonic() + confirm_timeout
+        while time.monotonic() < deadline:
+            if spawner.is_running(ctx["spawn"]):
+                return {"running": True}
+            cancel.wait(CONFIRM_POLL)
+        raise RuntimeError(f"game did not start within {confirm_timeout:.0f}s")
+
+    stages = [Stage("resolve_install", resolve)]
+    pre_names = []
+    for name, func in pre_launch_tasks:
+        stages.append(Stage(name, func, required=False))
+        pre_names.append(name)
+    stages.append(Stage("spawn", spawn, depends=["resolve_install"] + pre_names))
+    stages.append(Stage("confirm", confirm, depends=["spawn"]))
+    return LaunchPipeline(stages, listener)
+
+
+def default_spawner(launch_command=None, process_name=None, find_install=None):
+    """Return a CommandSpawner when launch_command is configured, else the Windows spawner."""
+    if launch_command:
+        return CommandSpawner(launch_command, process_name)
+    return WindowsSpawner(find_install)
@@ -0,0 +1,52 @@
+"""
+Viola Launcher - Paths & config
+Shared by the GUI and the Qt-free tools, so importing it never pulls in PyQt6.
+"""
+
+import sys
+import os
+import json
+
+CONFIG_FILENAME = "config.json"
+
+def resource_dir():
+    """
+    Return folder where assets are located.
+    Works in VS Codium and PyInstaller _MEIPASS.
+    """
+    return getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+
+def app_dir():
+    """
+    Return writable folder for launcher files and config.
+    Uses %APPDATA%\ViolaLauncher on Windows for .exe compatibility.
+    """
+    if getattr(sys, "frozen", False):
+        path = os.path.join(os.getenv("APPDATA", os.path.expanduser("~")), "ViolaLauncher")
+        os.makedirs(path, exist_ok=True)
+        return path
+    return os.path.dirname(os.path.abspath(__file__))
+
+def config_path():
+    """Return full path to config.json"""
+    return os.path.join(app_dir(), CONFIG_FILENAME)
+
+def read_json(path, default=None):
+    """Read JSON file safely, return default if fails."""
+    try:
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+    except Exception:
+        pass
+    return default if default is not None else {}
+
+def write_json(path, data):
+    """Write JSON file safely."""
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=4)
+        return True
+    except Exception as e:
+        print("Failed to write config:", e)
+        return False
@@ -0,0 +1,163 @@
+"""
+Viola Launcher - Session metrics history
+Append-only store of fixed-size binary records (timestamp, metric, launcher
+version, value) in app_dir()/metrics.bin, rotated to metrics.1.bin when it
+grows past MAX_BYTES. Nothing leaves the machine; the report subcommand
+prints p50/p95/p99 per metric and version.
+
+    python src/metrics.py report [--metric PREFIX] [--days N] [--json]
+"""
+
+import os
+import sys
+import json
+import time
+import struct
+import argparse
+import threading
+from collections import defaultdict
+
+from launcher_config import app_dir, config_path, read_json
+
+METRICS_FILENAME = "metrics.bin"
+ROTATED_FILENAME = "metrics.1.bin"
+MAGIC = b"VMET"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHH")             # magic, format version, record size
+RECORD = struct.Struct("<d24s12sd")         # unix time, metric, version, value
+MAX_BYTES = 1024 * 1024                     # ~20k records per file
+
+_lock = threading.Lock()
+_version = ""
+_enabled = None
+
+
+def metrics_path():
+    return os.path.join(app_dir(), METRICS_FILENAME)
+
+
+def set_version(version):
+    """Set the launcher version stamped on subsequent records."""
+    global _version
+    _version = str(version)
+
+
+def enabled():
+    global _enabled
+    if _enabled is None:
+        _enabled = bool(read_json(config_path(), {}).get("metrics", True))
+    return _enabled
+
+
+def _pack(name, size):
+    return name.encode("utf-8")[:size]
+
+
+def record(metric, value, version=None, path=None, timestamp=None):
+    """Append one sample. Never raises; metrics must not break the launcher."""
+    if path is None and not enabled():
+        return
+    path = path or metrics_path()
+    rec = RECORD.pack(timestamp or time.time(), _pack(metric, 24), _pack(version or _version, 12), float(value))
+    try:
+        with _lock:
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            if size >= MAX_BYTES:
+                os.replace(path, os.path.join(os.path.dirname(path), ROTATED_FILENAME))
+                size = 0
+            with open(path, "r+b" if size else "wb") as f:
+                if size < HEADER.size:
+                    f.seek(0)
+                    f.truncate()
+                    f.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size))
+                else:
+                    # Drop a torn record left by a crash mid-write
+                    f.seek(HEADER.size + (size - HEADER.size) // RECORD.size * RECORD.size)
+                    f.truncate()
+                f.write(rec)
+    except OSError as e:
+        print("[Metrics] Failed to record:", e)
+
+
+def read_records(path):
+    """Yield (timestamp, metric, version, value) from one metrics file."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return
+    if len(data) < HEADER.size:
+        return
+    magic, fmt, size = HEADER.unpack_from(data)
+    if magic != MAGIC or fmt != FORMAT_VERSION or size != RECORD.size:
+        print(f"[Metrics] Unknown format in {path}")
+        return
+    end = HEADER.size + (len(data) - HEADER.size) // size * size
+    for ts, metric, version, value in RECORD.iter_unpack(data[HEADER.size:end]):
+        yield ts, metric.rstrip(b"\0").decode("utf-8", "replace"), version.rstrip(b"\0").decode("utf-8", "replace"), value
+
+
+def all_records(path=None):
+    """Records from the rotated file and then the current one (oldest first)."""
+    path = path or metrics_path()
+    rotated = os.path.join(os.path.dirname(path), ROTATED_FILENAME)
+    yield from read_records(rotated)
+    yield from read_records(path)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(records, metric_prefix=None, since=None):
+    """Group samples by (metric, version) and return {key: {n, p50, p95, p99}}."""
+    groups = defaultdict(list)
+    for ts, metric, version, value in records:
+        if since and ts < since:
+            continue
+        if metric_prefix and not metric.startswith(metric_prefix):
+            continue
+        groups[(metric, version)].append(value)
+    out = {}
+    for key in sorted(groups):
+        values = sorted(groups[key])
+        out[key] = {"n": len(values), "p50": percentile(values, 50),
+                    "p95": percentile(values, 95), "p99": percentile(values, 99)}
+    return out
+
+
+# ---------------------- Entry Point ----------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Launcher metrics history")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rep = sub.add_parser("report", help="p50/p95/p99 per metric and launcher version")
+    rep.add_argument("--metric", help="only metrics starting with this prefix")
+    rep.add_argument("--days", type=float, help="only samples from the last N days")
+    rep.add_argument("--file", help="metrics file (default: metrics.bin in the app dir)")
+    rep.add_argument("--json", action="store_true", help="print JSON")
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in ("report", "-h", "--help"):
+        argv.insert(0, "report")  # report is the default subcommand
+    args = parser.parse_args(argv)
+
+    since = time.time() - args.days * 86400 if args.days else None
+    stats = summarize(all_records(args.file), args.metric, since)
+    if args.json:
+        print(json.dumps([dict(metric=m, version=v, **s) for (m, v), s in stats.items()], indent=2))
+        return 0
+    if not stats:
+        print("No metrics recorded.")
+        return 0
+    print(f"{'metric':<26}{'version':<12}{'n':>7}{'p50':>12}{'p95':>12}{'p99':>12}")
+    for (metric, version), s in stats.items():
+        print(f"{metric:<26}{version or '-':<12}{s['n']:>7}{s['p50']:>12.2f}{s['p95']:>12.2f}{s['p99']:>12.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,17 @@
+"""Overlay module: player position and facing."""
+
+MODULE = {
+    "id": "coordinates",
+    "name": "Coordinates HUD",
+    "description": "Player position and facing.",
+    "order": 20,
+    "enabled": True,
+}
+
+
+def create(parent):
+    from PyQt6.QtWidgets import QLabel
+
+    label = QLabel(f"• {MODULE['name']}", parent)
+    label.setProperty("role", "overlayItem")
+    return label
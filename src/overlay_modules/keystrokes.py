@@ -0,0 +1,17 @@
+"""Overlay module: key presses, clicks per second and frame rate."""
+
+MODULE = {
+    "id": "keystrokes",
+    "name": "Keystrokes / CPS / FPS",
+    "description": "Key presses, clicks per second and frame rate.",
+    "order": 10,
+    "enabled": True,
+}
+
+
+def create(parent):
+    from PyQt6.QtWidgets import QLabel
+
+    label = QLabel(f"• {MODULE['name']}", parent)
+    label.setProperty("role", "overlayItem")
+    return label
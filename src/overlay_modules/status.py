@@ -0,0 +1,17 @@
+"""Overlay module: armor durability, active effects and loaded packs."""
+
+MODULE = {
+    "id": "status",
+    "name": "Armor / Potions / Packs",
+    "description": "Armor durability, active effects and loaded packs.",
+    "order": 50,
+    "enabled": True,
+}
+
+
+def create(parent):
+    from PyQt6.QtWidgets import QLabel
+
+    label = QLabel(f"• {MODULE['name']}", parent)
+    label.setProperty("role", "overlayItem")
+    return label
@@ -0,0 +1,17 @@
+"""Overlay module: latch sprint and sneak keys."""
+
+MODULE = {
+    "id": "toggle_sprint",
+    "name": "ToggleSprint / ToggleSneak",
+    "description": "Latch sprint and sneak keys.",
+    "order": 40,
+    "enabled": True,
+}
+
+
+def create(parent):
+    from PyQt6.QtWidgets import QLabel
+
+    label = QLabel(f"• {MODULE['name']}", parent)
+    label.setProperty("role", "overlayItem")
+    return label
@@ -0,0 +1,17 @@
+"""Overlay module: hold-to-zoom field of view."""
+
+MODULE = {
+    "id": "zoom",
+    "name": "Zoom",
+    "description": "Hold-to-zoom field of view.",
+    "order": 30,
+    "enabled": True,
+}
+
+
+def create(parent):
+    from PyQt6.QtWidgets import QLabel
+
+    label = QLabel(f"• {MODULE['name']}", parent)
+    label.setProperty("role", "overlayItem")
+    return label
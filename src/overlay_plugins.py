@@ -0,0 +1,163 @@
+"""
+Viola Launcher - Overlay module plugins
+Overlay modules are single .py files in the bundled overlay_modules folder
+or in <app dir>/overlay_modules. Each starts with a literal metadata dict
+
+    MODULE = {"id": "zoom", "name": "Zoom", "order": 30, "enabled": False}
+
+and defines create(parent) returning the module's widget. Discovery reads
+MODULE with ast, so listing modules imports nothing. A module is imported
+and built only when it is enabled and the overlay is first shown; disabled
+modules cost no import time and no memory. config.json "overlay_modules"
+({"zoom": true, ...}) overrides each module's default.
+"""
+
+import os
+import ast
+import sys
+import time
+import importlib.util
+
+import tracing
+from launcher_config import app_dir, config_path, read_json, resource_dir
+from process_stats import rss_bytes
+
+MODULES_DIRNAME = "overlay_modules"
+PACKAGE = "viola_overlay_modules"
+
+
+class ModuleInfo:
+    """Metadata of one discovered module plus what loading it cost."""
+
+    def __init__(self, meta, path):
+        self.id = meta["id"]
+        self.name = meta.get("name", self.id)
+        self.description = meta.get("description", "")
+        self.order = meta.get("order", 100)
+        self.default_enabled = bool(meta.get("enabled", True))
+        self.enabled = self.default_enabled
+        self.path = path
+        self.module = None
+        self.widget = None
+        self.error = None
+        self.import_seconds = 0.0
+        self.build_seconds = 0.0
+        self.rss_delta = 0
+
+    @property
+    def loaded(self):
+        return self.module is not None
+
+    def as_dict(self):
+        return {
+            "id": self.id, "name": self.name, "enabled": self.enabled, "loaded": self.loaded,
+            "import_ms": round(self.import_seconds * 1000, 2), "build_ms": round(self.build_seconds * 1000, 2),
+            "rss_kb": self.rss_delta // 1024, "error": self.error,
+        }
+
+
+def read_metadata(path):
+    """Return the MODULE dict of a plugin file without importing it (None if absent)."""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name) and node.targets[0].id == "MODULE"):
+            meta = ast.literal_eval(node.value)
+            return meta if isinstance(meta, dict) and meta.get("id") else None
+    return None
+
+
+def default_paths():
+    """Bundled modules first; user modules with the same id replace them."""
+    return [os.path.join(resource_dir(), MODULES_DIRNAME), os.path.join(app_dir(), MODULES_DIRNAME)]
+
+
+class ModuleRegistry:
+    def __init__(self, paths=None, overrides=None):
+        self.paths = default_paths() if paths is None else list(paths)
+        self.overrides = dict(overrides or {})
+        self.modules = {}
+        self.discovered = False
+
+    @classmethod
+    def from_config(cls):
+        return cls(overrides=read_json(config_path(), {}).get("overlay_modules") or {})
+
+    def discover(self):
+        """Read metadata of every module file. Nothing is imported."""
+        with tracing.span("overlay.discover_modules") as sp:
+            found = {}
+            for folder in self.paths:
+                if not os.path.isdir(folder):
+                    continue
+                for name in sorted(os.listdir(folder)):
+                    if not name.endswith(".py") or name.startswith("_"):
+                        continue
+                    path = os.path.join(folder, name)
+                    try:
+                        meta = read_metadata(path)
+                    except (OSError, SyntaxError, ValueError) as e:
+                        print(f"[Modules] Skipping {name}: {e}")
+                        continue
+                    if meta:
+                        found[meta["id"]] = ModuleInfo(meta, path)
+            for info in found.values():
+                if info.id in self.overrides:
+                    info.enabled = bool(self.overrides[info.id])
+            self.modules = dict(sorted(found.items(), key=lambda kv: (kv[1].order, kv[0])))
+            self.discovered = True
+            sp.set("modules", len(self.modules))
+        return list(self.modules.values())
+
+    def enabled(self):
+        if not self.discovered:
+            self.discover()
+        return [m for m in self.modules.values() if m.enabled]
+
+    def load(self, info):
+        """Import one module from its file, recording time and resident memory it added."""
+        if info.loaded:
+            return info.module
+        rss0 = rss_bytes()
+        t0 = time.perf_counter()
+        with tracing.span("overlay.import_module", module=info.id):
+            spec = importlib.util.spec_from_file_location(f"{PACKAGE}.{info.id}", info.path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[spec.name] = module
+            try:
+                spec.loader.exec_module(module)
+            except Exception:
+                del sys.modules[spec.name]
+                raise
+        info.import_seconds = time.perf_counter() - t0
+        info.rss_delta = max(0, rss_bytes() - rss0)
+        info.module = module
+        return module
+
+    def build(self, info, parent):
+        """Load (if needed) and create the module's widget under parent. Returns it, or None on error."""
+        try:
+            module = self.load(info)
+            rss0 = rss_bytes()
+            t0 = time.perf_counter()
+            with tracing.span("overlay.build_module", module=info.id):
+                info.widget = module.create(parent)
+            info.build_seconds = time.perf_counter() - t0
+            info.rss_delta += max(0, rss_bytes() - rss0)
+        except Exception as e:
+            info.error = f"{type(e).__name__}: {e}"
+            print(f"[Modules] {info.id} failed to load: {info.error}")
+            return None
+        return info.widget
+
+    def stats(self):
+        return [m.as_dict() for m in self.modules.values()]
+
+    def report(self):
+        for m in self.modules.values():
+            if m.loaded:
+                print(f"[Modules] {m.id}: import {m.import_seconds * 1000:.1f} ms, "
+                      f"build {m.build_seconds * 1000:.1f} ms, +{m.rss_delta // 1024} KB")
+            else:
+                print(f"[Modules] {m.id}: {'failed' if m.error else 'disabled'}")
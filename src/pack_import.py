@@ -0,0 +1,300 @@
+"""
+Viola Launcher - Bulk pack import
+Imports many .mcpack/.mcaddon/.zip files at once. Manifests are validated and
+deduplicated by (uuid, version) up front, then archives are extracted on a
+bounded process pool. Each pack is written into a temp folder inside its
+destination root and renamed into place, so a crash never leaves half a pack.
+
+    python src/pack_import.py PATH [PATH ...] [--dest DIR] [--jobs N] [--json]
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import shutil
+import zipfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from launcher_config import config_path, read_json
+from pack_index import ARCHIVE_EXTS, PackIndex, default_pack_roots, parse_lang, parse_manifest_bytes, pack_info
+
+TMP_PREFIX = ".viola-import-"
+COPY_BUFFER = 1024 * 1024
+
+
+def import_roots():
+    """Return {kind: folder} destinations from config ("pack_import_roots") or the Bedrock defaults."""
+    roots = read_json(config_path(), {}).get("pack_import_roots")
+    if roots:
+        return {k: os.path.expandvars(os.path.expanduser(v)) for k, v in roots.items()}
+    resource, behavior = default_pack_roots()[:2]
+    return {"resource": resource, "behavior": behavior}
+
+
+def collect_archives(paths):
+    """Expand directories into the archives they contain (recursively)."""
+    out = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, _, files in os.walk(path):
+                out.extend(os.path.join(dirpath, f) for f in sorted(files) if f.lower().endswith(ARCHIVE_EXTS))
+        elif path.lower().endswith(ARCHIVE_EXTS):
+            out.append(path)
+    return out
+
+
+# ---------------------- Validation ----------------------
+def validate_manifest(manifest):
+    """Return a list of problems with a parsed manifest (empty if valid)."""
+    problems = []
+    header = manifest.get("header")
+    if not isinstance(header, dict):
+        return ["missing header"]
+    try:
+        uuid.UUID(str(header.get("uuid", "")))
+    except ValueError:
+        problems.append("header.uuid is not a UUID")
+    version = header.get("version")
+    if not (isinstance(version, list) and len(version) == 3 and all(isinstance(v, int) for v in version)):
+        if not isinstance(version, str):
+            problems.append("header.version must be [major, minor, patch]")
+    if not header.get("name"):
+        problems.append("header.name is empty")
+    if not manifest.get("modules"):
+        problems.append("no modules")
+    return problems
+
+
+def _manifests_in(zf):
+    """Yield (prefix, manifest, lang) for every manifest.json inside an open zip; lang resolves "pack.name"."""
+    names = zf.namelist()
+    for member in names:
+        if member.rsplit("/", 1)[-1].lower() == "manifest.json":
+            prefix = member[: -len("manifest.json")]
+            lang_member = prefix + "texts/en_US.lang"
+            lang = parse_lang(zf.read(lang_member)) if lang_member in names else None
+            yield prefix, parse_manifest_bytes(zf.read(member)), lang
+
+
+def _safe_folder_name(name):
+    name = re.sub(r"§.", "", name)
+    name = re.sub(r'[<>:"/\\|?*\x00-\x1f]', "_", name).strip(" .")
+    return name[:64] or "pack"
+
+
+# ---------------------- Planning ----------------------
+def plan_import(paths, dest_roots, installed=None):
+    """
+    Read every manifest and decide what to extract, including each pack's
+    destination folder, so parallel workers never race for the same name.
+    Returns (jobs, skipped); skipped is a list of (source, reason).
+    installed is a set of (uuid, version) already present.
+    """
+    seen = set(installed or ())
+    taken = set()
+    jobs = []
+    skipped = []
+    for archive in collect_archives(paths):
+        try:
+            with zipfile.ZipFile(archive) as zf:
+                found = [(None,) + m for m in _manifests_in(zf)]
+                # .mcaddon files may bundle whole .mcpack archives
+                for member in zf.namelist():
+                    if member.lower().endswith((".mcpack", ".zip")):
+                        with zipfile.ZipFile(io.BytesIO(zf.read(member))) as inner:
+                            found.extend((member,) + m for m in _manifests_in(inner))
+        except Exception as e:
+            skipped.append((archive, f"unreadable archive: {e}"))
+            continue
+        if not found:
+            skipped.append((archive, "no manifest.json"))
+            continue
+
+        for inner, prefix, manifest, lang in found:
+            source = f"{archive}!{inner}" if inner else archive
+            problems = validate_manifest(manifest)
+            if problems:
+                skipped.append((source, "invalid manifest: " + "; ".join(problems)))
+                continue
+            info = pack_info(manifest, lang)
+            key = (info["uuid"], info["version"])
+            if key in seen:
+                skipped.append((source, f"duplicate {info['uuid']} {info['version']}"))
+                continue
+            dest_root = dest_roots.get(info["kind"])
+            if not dest_root:
+                skipped.append((source, f"no destination for {info['kind']} packs"))
+                continue
+            seen.add(key)
+            folder = _safe_folder_name(info["name"])
+            dest = _unique_dest(dest_root, folder, taken)
+            taken.add(os.path.normcase(os.path.abspath(dest)))
+            jobs.append({
+                "archive": archive,
+                "inner": inner,
+                "prefix": prefix,
+                "dest_root": dest_root,
+                "dest": dest,
+                "folder": folder,
+                "name": info["name"],
+                "uuid": info["uuid"],
+                "version": info["version"],
+            })
+    return jobs, skipped
+
+
+# ---------------------- Extraction ----------------------
+def _unique_dest(dest_root, folder, taken=()):
+    """First of folder, folder_2, ... that neither exists nor is in taken (normalized paths)."""
+    dest = os.path.join(dest_root, folder)
+    n = 2
+    while os.path.exists(dest) or os.path.normcase(os.path.abspath(dest)) in taken:
+        dest = os.path.join(dest_root, f"{folder}_{n}")
+        n += 1
+    return dest
+
+
+def extract_job(job):
+    """Extract one planned pack. Runs in a worker process; returns a result dict."""
+    t0 = time.perf_counter()
+    files = 0
+    written = 0
+    os.makedirs(job["dest_root"], exist_ok=True)
+    # Absolute, so the zip-slip check below compares like with like for relative dest roots
+    tmp = os.path.abspath(os.path.join(job["dest_root"], f"{TMP_PREFIX}{job['uuid']}-{os.getpid()}"))
+    try:
+        with zipfile.ZipFile(job["archive"]) as outer:
+            zf = zipfile.ZipFile(io.BytesIO(outer.read(job["inner"]))) if job["inner"] else outer
+            with zf:
+                prefix = job["prefix"]
+                for info in zf.infolist():
+                    if info.is_dir() or not info.filename.startswith(prefix):
+                        continue
+                    rel = info.filename[len(prefix):]
+                    target = os.path.normpath(os.path.join(tmp, rel))
+                    # Reject zip-slip paths escaping the pack folder
+                    if os.path.isabs(rel) or not target.startswith(tmp + os.sep):
+                        continue
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    with zf.open(info) as src, open(target, "wb") as dst:
+                        shutil.copyfileobj(src, dst, COPY_BUFFER)
+                    files += 1
+                    written += info.file_size
+        dest = job["dest"]
+        while True:
+            try:
+                os.replace(tmp, dest)
+                break
+            except OSError:
+                # Something outside this import created the folder since planning
+                if not os.path.exists(dest):
+                    raise
+                dest = _unique_dest(job["dest_root"], job["folder"])
+        return {"name": job["name"], "uuid": job["uuid"], "version": job["version"], "dest": dest,
+                "files": files, "bytes": written, "seconds": time.perf_counter() - t0, "error": None}
+    except Exception as e:
+        shutil.rmtree(tmp, ignore_errors=True)
+        return {"name": job["name"], "uuid": job["uuid"], "version": job["version"], "dest": None,
+                "files": 0, "bytes": 0, "seconds": time.perf_counter() - t0, "error": str(e)}
+
+
+def clean_stale_temp(dest_root):
+    """Remove temp folders left behind by an interrupted import."""
+    try:
+        names = os.listdir(dest_root)
+    except OSError:
+        return
+    for name in names:
+        if name.startswith(TMP_PREFIX):
+            shutil.rmtree(os.path.join(dest_root, name), ignore_errors=True)
+
+
+def default_jobs():
+    return max(1, min(8, (os.cpu_count() or 2) - 1))
+
+
+def import_packs(paths, dest_roots=None, jobs=None, progress_callback=None, skip_installed=True):
+    """
+    Import packs from files or folders. Returns a report dict with per-pack
+    results, skipped sources, files/s and total bytes written.
+    jobs=1 runs serially in-process.
+    """
+    t0 = time.perf_counter()
+    dest_roots = dest_roots or import_roots()
+    for root in set(dest_roots.values()):
+        clean_stale_temp(root)
+    installed = set()
+    if skip_installed:
+        index = PackIndex(roots=sorted(set(dest_roots.values())), persist=False)
+        installed = {(p["uuid"], p["version"]) for p in index.scan()[0]}
+    planned, skipped = plan_import(paths, dest_roots, installed)
+    plan_seconds = time.perf_counter() - t0
+
+    workers = min(jobs or default_jobs(), max(1, len(planned)))
+    results = []
+    if workers <= 1:
+        for job in planned:
+            results.append(extract_job(job))
+            if progress_callback:
+                progress_callback(len(results), len(planned))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(extract_job, job) for job in planned]
+            for fut in as_completed(futures):
+                results.append(fut.result())
+                if progress_callback:
+                    progress_callback(len(results), len(planned))
+
+    elapsed = time.perf_counter() - t0
+    files = sum(r["files"] for r in results)
+    written = sum(r["bytes"] for r in results)
+    return {
+        "imported": [r for r in results if not r["error"]],
+        "failed": [r for r in results if r["error"]],
+        "skipped": [{"source": s, "reason": why} for s, why in skipped],
+        "workers": workers,
+        "files": files,
+        "bytes": written,
+        "plan_seconds": plan_seconds,
+        "seconds": elapsed,
+        "files_per_second": files / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+# ---------------------- Entry Point ----------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import .mcpack/.mcaddon files")
+    parser.add_argument("paths", nargs="+", help="archives or folders containing them")
+    parser.add_argument("--dest", help="extract every pack kind into this folder")
+    parser.add_argument("--jobs", type=int, default=0, help="worker processes (default: CPUs - 1, max 8)")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    dest_roots = None
+    if args.dest:
+        dest_roots = {k: args.dest for k in ("resource", "behavior", "skin", "world", "unknown")}
+    report = import_packs(args.paths, dest_roots, jobs=args.jobs or None)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for r in report["imported"]:
+            print(f"[Import] {r['name']} {r['version']} -> {r['dest']}")
+        for r in report["failed"]:
+            print(f"[Import] FAILED {r['name']}: {r['error']}")
+        for s in report["skipped"]:
+            print(f"[Import] Skipped {s['source']}: {s['reason']}")
+        print(f"[Import] {len(report['imported'])} packs, {report['files']} files, "
+              f"{report['bytes'] / (1024 * 1024):.1f} MB in {report['seconds']:.2f}s "
+              f"({report['files_per_second']:.0f} files/s, {report['workers']} workers)")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""
+Viola Launcher - Resource/behavior pack index
+Scans the Bedrock pack folders plus loose .mcpack/.mcaddon/.zip archives.
+Archives are never extracted: only the zip central directory and the
+manifest.json members are read. Results are persisted next to config.json and
+only entries whose stat changed are re-read on the next scan.
+
+    python src/pack_index.py [--root DIR ...] [--rebuild] [--json]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import zipfile
+import argparse
+
+from launcher_config import app_dir, config_path, read_json, write_json
+
+INDEX_FILENAME = "pack_index.json"
+INDEX_VERSION = 1
+ARCHIVE_EXTS = (".mcpack", ".mcaddon", ".zip")
+MOJANG_DIR = os.path.join(
+    "Packages", "Microsoft.MinecraftUWP_8wekyb3d8bbwe", "LocalState", "games", "com.mojang"
+)
+PACK_FOLDERS = ("resource_packs", "behavior_packs", "development_resource_packs", "development_behavior_packs")
+MODULE_KINDS = {"resources": "resource", "data": "behavior", "script": "behavior", "skin_pack": "skin", "world_template": "world"}
+
+
+def default_pack_roots():
+    """Return the Bedrock pack folders for the current user."""
+    base = os.path.join(os.getenv("LOCALAPPDATA") or os.path.expanduser("~"), MOJANG_DIR)
+    return [os.path.join(base, name) for name in PACK_FOLDERS]
+
+
+def pack_roots():
+    """Return pack roots from config.json ("pack_roots"), or the Bedrock defaults."""
+    roots = read_json(config_path(), {}).get("pack_roots")
+    return [os.path.expandvars(os.path.expanduser(r)) for r in roots] if roots else default_pack_roots()
+
+
+def index_path():
+    return os.path.join(app_dir(), INDEX_FILENAME)
+
+
+# ---------------------- Manifest Parsing ----------------------
+_COMMENT_RE = re.compile(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/', re.S)
+_TRAILING_COMMA_RE = re.compile(r",(\s*[}\]])")
+
+
+def parse_manifest_bytes(data):
+    """Parse a manifest.json, tolerating the comments and trailing commas some packs ship with."""
+    text = data.decode("utf-8-sig", errors="replace")
+    try:
+        return json.loads(text)
+    except ValueError:
+        text = _COMMENT_RE.sub(lambda m: m.group(1) or "", text)
+        return json.loads(_TRAILING_COMMA_RE.sub(r"\1", text))
+
+
+def _version_str(v):
+    if isinstance(v, list):
+        return ".".join(str(p) for p in v)
+    return str(v or "")
+
+
+def pack_info(manifest, lang=None):
+    """Extract the indexed fields from a parsed manifest."""
+    header = manifest.get("header", {}) or {}
+    name = str(header.get("name", ""))
+    if lang and name in lang:
+        name = lang[name]
+    modules = manifest.get("modules") or [{}]
+    kind = MODULE_KINDS.get(str(modules[0].get("type", "")), "unknown")
+    return {
+        "name": name,
+        "uuid": str(header.get("uuid", "")).lower(),
+        "version": _version_str(header.get("version")),
+        "kind": kind,
+    }
+
+
+def parse_lang(data):
+    """Parse a .lang file into a dict (only used to resolve "pack.name" keys)."""
+    out = {}
+    for line in data.decode("utf-8-sig", errors="replace").splitlines():
+        line = line.split("##", 1)[0].strip()
+        if "=" in line:
+            k, v = line.split("=", 1)
+            out[k.strip()] = v.strip()
+    return out
+
+
+# ---------------------- Readers ----------------------
+def read_archive(path):
+    """Return pack infos for every manifest inside an archive, reading only those members."""
+    packs = []
+    with zipfile.ZipFile(path) as zf:
+        names = zf.namelist()  # from the central directory, no member data touched
+        for member in names:
+            if member.rsplit("/", 1)[-1].lower() != "manifest.json":
+                continue
+            prefix = member[: -len("manifest.json")]
+            lang = None
+            lang_member = prefix + "texts/en_US.lang"
+            try:
+                manifest = parse_manifest_bytes(zf.read(member))
+                if lang_member in names:
+                    lang = parse_lang(zf.read(lang_member))
+            except Exception as e:
+                print(f"[Packs] Bad manifest in {path}!{member}: {e}")
+                continue
+            info = pack_info(manifest, lang)
+            info["member"] = member
+            packs.append(info)
+    return packs
+
+
+def read_folder(path):
+    """Return pack info for an extracted pack folder."""
+    manifest_path = os.path.join(path, "manifest.json")
+    with open(manifest_path, "rb") as f:
+        manifest = parse_manifest_bytes(f.read())
+    lang = None
+    lang_path = os.path.join(path, "texts", "en_US.lang")
+    if os.path.exists(lang_path):
+        with open(lang_path, "rb") as f:
+            lang = parse_lang(f.read())
+    return [pack_info(manifest, lang)]
+
+
+def folder_size(path):
+    total = 0
+    for dirpath, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                pass
+    return total
+
+
+# ---------------------- Index ----------------------
+class PackIndex:
+    """Persistent, incrementally refreshed index of installed packs."""
+
+    def __init__(self, path=None, roots=None, persist=True):
+        self.path = path or index_path()
+        self.roots = roots if roots is not None else pack_roots()
+        self.persist = persist
+        data = read_json(self.path, {}) if persist else {}
+        self.entries = data.get("entries", {}) if data.get("version") == INDEX_VERSION else {}
+        self.last_scan = {}
+
+    def _stat_key(self, entry):
+        st = entry.stat()
+        if entry.is_dir():
+            # Pack folders change when their manifest does
+            m = os.stat(os.path.join(entry.path, "manifest.json"))
+            return [st.st_mtime_ns, m.st_mtime_ns, m.st_size]
+        return [st.st_mtime_ns, st.st_size]
+
+    def scan(self, rebuild=False):
+        """Refresh the index. Returns (packs, stats)."""
+        t0 = time.perf_counter()
+        seen = {}
+        reread = 0
+        failed = 0
+        for root in self.roots:
+            try:
+                it = os.scandir(root)
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    is_archive = entry.name.lower().endswith(ARCHIVE_EXTS)
+                    try:
+                        if entry.is_dir():
+                            if not os.path.exists(os.path.join(entry.path, "manifest.json")):
+                                continue
+                        elif not is_archive:
+                            continue
+                        key = self._stat_key(entry)
+                    except OSError:
+                        continue
+                    old = self.entries.get(entry.path)
+                    if not rebuild and old and old.get("stat") == key:
+                        seen[entry.path] = old
+                        continue
+                    try:
+                        if entry.is_dir():
+                            packs, size = read_folder(entry.path), folder_size(entry.path)
+                        else:
+                            packs, size = read_archive(entry.path), key[1]
+                    except Exception as e:
+                        print(f"[Packs] Failed to read {entry.path}: {e}")
+                        failed += 1
+                        packs, size = [], 0
+                    reread += 1
+                    seen[entry.path] = {
+                        "stat": key,
+                        "root": root,
+                        "archive": not entry.is_dir(),
+                        "size": size,
+                        "mtime": key[0] / 1e9,
+                        "packs": packs,
+                    }
+
+        changed = reread > 0 or len(seen) != len(self.entries)
+        self.entries = seen
+        if changed and self.persist:
+            write_json(self.path, {"version": INDEX_VERSION, "entries": self.entries})
+        self.last_scan = {
+            "entries": len(seen),
+            "reread": reread,
+            "failed": failed,
+            "seconds": time.perf_counter() - t0,
+        }
+        return self.packs(), self.last_scan
+
+    def packs(self):
+        """Return a flat list of indexed packs with their source path, size and mtime."""
+        out = []
+        for path, entry in self.entries.items():
+            for p in entry.get("packs", []):
+                out.append(dict(p, path=path, size=entry["size"], mtime=entry["mtime"], archive=entry["archive"]))
+        out.sort(key=lambda p: (p["kind"], p["name"].lower()))
+        return out
+
+
+# ---------------------- Entry Point ----------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List installed Bedrock packs")
+    parser.add_argument("--root", action="append", help="pack folder to scan (repeatable)")
+    parser.add_argument("--index", help="index file (default: pack_index.json in the app dir)")
+    parser.add_argument("--rebuild", action="store_true", help="ignore the cached index")
+    parser.add_argument("--json", action="store_true", help="print JSON")
+    args = parser.parse_args(argv)
+
+    index = PackIndex(args.index, args.root)
+    packs, stats = index.scan(rebuild=args.rebuild)
+    if args.json:
+        print(json.dumps({"packs": packs, "scan": stats}, indent=2))
+    else:
+        for p in packs:
+            print(f"{p['kind']:<9} {p['name'][:40]:<40} {p['version']:<10} {p['uuid']}")
+        print(f"{len(packs)} packs in {stats['entries']} entries, re-read {stats['reread']} "
+              f"in {stats['seconds'] * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
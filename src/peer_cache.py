@@ -0,0 +1,248 @@
+"""
+Viola Launcher - LAN peer cache for update payloads
+A launcher holding a verified update zip answers UDP discovery queries and
+serves the file over a small HTTP endpoint. Before downloading from GitHub,
+peers ask the LAN who has the manifest's sha256, stream it from a neighbour
+while hashing, and fall back to the origin on any mismatch or failure.
+
+Several instances can run on one machine: each binds its own UDP port and
+queries the ports listed in config.json ("peer_cache": {"peers": [...]}).
+"""
+
+import os
+import re
+import json
+import time
+import socket
+import shutil
+import hashlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import tracing
+import http_client
+from launcher_config import app_dir, config_path, read_json
+
+DISCOVERY_PORT = 47821
+DISCOVERY_WAIT = 0.3
+FETCH_TIMEOUT = 10.0
+KEEP_PAYLOADS = 2
+QUERY = b"VIOLA-PEER?"
+REPLY = b"VIOLA-PEER!"
+_SHA_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+def peer_config():
+    """Return the "peer_cache" config dict ({} when the feature is off)."""
+    cfg = read_json(config_path(), {}).get("peer_cache") or {}
+    if cfg is True:
+        cfg = {"enabled": True}
+    return cfg if cfg.get("enabled") else {}
+
+
+def _parse_addr(text, default_port):
+    host, _, port = str(text).rpartition(":")
+    return (host, int(port)) if host else (text, default_port)
+
+
+class PeerCache:
+    """Holds verified payloads by sha256, answers discovery and serves them over HTTP."""
+
+    def __init__(self, folder=None, discovery_port=DISCOVERY_PORT, peers=None, http_port=0, bind="0.0.0.0"):
+        self.folder = folder or os.path.join(app_dir(), "peer_cache")
+        os.makedirs(self.folder, exist_ok=True)
+        self.discovery_port = discovery_port
+        # Where queries go: LAN broadcast plus any explicitly configured peers
+        self.targets = [("255.255.255.255", discovery_port)] + [_parse_addr(p, discovery_port) for p in (peers or [])]
+        self.http_port = http_port
+        self.bind = bind
+        self._udp = None
+        self._http = None
+        self.counters = {"served": 0, "served_bytes": 0, "peer_hits": 0, "peer_bytes": 0,
+                         "origin_fallbacks": 0, "bad_peers": 0}
+
+    @classmethod
+    def from_config(cls):
+        cfg = peer_config()
+        if not cfg:
+            return None
+        return cls(cfg.get("folder"), int(cfg.get("discovery_port", DISCOVERY_PORT)), cfg.get("peers"))
+
+    # ---------- Local store ----------
+    def path_for(self, sha256):
+        return os.path.join(self.folder, f"{sha256.lower()}.zip")
+
+    def has(self, sha256):
+        return os.path.exists(self.path_for(sha256))
+
+    def add(self, path, sha256, move=False):
+        """Store a payload after checking its hash; older payloads beyond KEEP_PAYLOADS are removed."""
+        sha256 = sha256.lower()
+        if _file_sha256(path) != sha256:
+            raise ValueError("payload does not match sha256")
+        tmp = self.path_for(sha256) + ".part"
+        (shutil.move if move else shutil.copyfile)(path, tmp)
+        os.replace(tmp, self.path_for(sha256))
+        cached = sorted((os.path.join(self.folder, f) for f in os.listdir(self.folder) if f.endswith(".zip")),
+                        key=os.path.getmtime, reverse=True)
+        for old in cached[KEEP_PAYLOADS:]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+    # ---------- Serving ----------
+    def start(self):
+        """Start the HTTP endpoint and the discovery responder (daemon threads)."""
+        cache = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                sha = self.path.rsplit("/", 1)[-1].lower()
+                if not self.path.startswith("/payload/") or not _SHA_RE.match(sha) or not cache.has(sha):
+                    self.send_error(404)
+                    return
+                path = cache.path_for(sha)
+                size = os.path.getsize(path)
+                self.send_response(200)
+                self.send_header("Content-Type", "application/zip")
+                self.send_header("Content-Length", str(size))
+                self.end_headers()
+                with open(path, "rb") as f:
+                    shutil.copyfileobj(f, self.wfile, 1024 * 1024)
+                cache.counters["served"] += 1
+                cache.counters["served_bytes"] += size
+
+            def log_message(self, fmt, *args):
+                pass
+
+        self._http = ThreadingHTTPServer((self.bind, self.http_port), Handler)
+        self._http.daemon_threads = True
+        self.http_port = self._http.server_address[1]
+        threading.Thread(target=self._http.serve_forever, name="peer-http", daemon=True).start()
+
+        self._udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._udp.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._udp.bind((self.bind, self.discovery_port))
+        self.discovery_port = self._udp.getsockname()[1]
+        threading.Thread(target=self._answer_queries, name="peer-discovery", daemon=True).start()
+        return self
+
+    def _answer_queries(self):
+        while True:
+            try:
+                data, addr = self._udp.recvfrom(512)
+            except OSError:
+                return
+            if not data.startswith(QUERY):
+                continue
+            sha = data[len(QUERY):].strip().decode("ascii", "replace").lower()
+            if _SHA_RE.match(sha) and self.has(sha):
+                reply = REPLY + json.dumps({"sha256": sha, "port": self.http_port}).encode()
+                try:
+                    self._udp.sendto(reply, addr)
+                except OSError:
+                    pass
+
+    def stop(self):
+        if self._http:
+            self._http.shutdown()
+            self._http.server_close()
+        if self._udp:
+            self._udp.close()
+
+    # ---------- Fetching ----------
+    def discover(self, sha256, wait=DISCOVERY_WAIT):
+        """Ask the LAN who has sha256. Returns a list of (host, http_port), fastest first."""
+        sha256 = sha256.lower()
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        found = []
+        try:
+            for target in self.targets:
+                try:
+                    sock.sendto(QUERY + sha256.encode(), target)
+                except OSError:
+                    pass
+            own = ("127.0.0.1", self.http_port) if self._http else None
+            deadline = time.monotonic() + wait
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                sock.settimeout(remaining)
+                try:
+                    data, addr = sock.recvfrom(512)
+                except OSError:
+                    break
+                if not data.startswith(REPLY):
+                    continue
+                try:
+                    info = json.loads(data[len(REPLY):])
+                except ValueError:
+                    continue
+                peer = (addr[0], int(info["port"]))
+                if info.get("sha256") == sha256 and peer not in found and peer != own:
+                    found.append(peer)
+        finally:
+            sock.close()
+        return found
+
+    def fetch(self, sha256, dest, progress_callback=None, timeout=FETCH_TIMEOUT):
+        """
+        Download sha256 from the first neighbour that serves a matching payload.
+        Returns the peer (host, port), or None so the caller falls back to the origin.
+        """
+        sha256 = sha256.lower()
+        if self.has(sha256):
+            shutil.copyfile(self.path_for(sha256), dest)
+            return ("local", 0)
+        with tracing.span("peer.fetch") as sp:
+            for peer in self.discover(sha256):
+                try:
+                    n = _download(f"http://{peer[0]}:{peer[1]}/payload/{sha256}", dest, sha256,
+                                  progress_callback, timeout)
+                except Exception as e:
+                    self.counters["bad_peers"] += 1
+                    print(f"[Peers] {peer[0]}:{peer[1]} failed: {e}")
+                    continue
+                self.counters["peer_hits"] += 1
+                self.counters["peer_bytes"] += n
+                sp.set("peer", f"{peer[0]}:{peer[1]}")
+                return peer
+            self.counters["origin_fallbacks"] += 1
+            sp.set("peer", None)
+        return None
+
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _download(url, dest, sha256, progress_callback, timeout):
+    """Stream url to dest while hashing; raises (and removes dest) on mismatch."""
+    h = hashlib.sha256()
+    done = 0
+    try:
+        with http_client.stream(url, timeout) as r, open(dest, "wb") as f:
+            r.raise_for_status()
+            total = int(r.headers.get("Content-Length") or 0)
+            for chunk in r.iter_content(chunk_size=256 * 1024):
+                f.write(chunk)
+                h.update(chunk)
+                done += len(chunk)
+                if progress_callback and total:
+                    progress_callback(min(100, int(done * 100 / total)))
+        if h.hexdigest() != sha256:
+            raise ValueError("sha256 mismatch")
+    except Exception:
+        try:
+            os.remove(dest)
+        except OSError:
+            pass
+        raise
+    return done
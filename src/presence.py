@@ -0,0 +1,287 @@
+"""
+Viola Launcher - Discord Rich Presence
+Publishes launcher state (idle, updating, in game) on a dedicated worker thread.
+Callers only record the latest desired state; the worker coalesces changes into
+at most one SET_ACTIVITY per rate window and reconnects with backoff, so the Qt
+thread never touches the IPC pipe.
+
+Speaks the Discord IPC framing directly (little-endian opcode + length + JSON)
+so it can run against a local fake socket; the pypresence client needs an
+asyncio loop per thread.
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import socket
+import struct
+import threading
+
+import tracing
+from launcher_config import config_path, read_json
+
+RATE_WINDOW = 15.0          # Discord allows 5 activity updates per 20s
+BACKOFF_MIN = 1.0
+BACKOFF_MAX = 60.0
+IO_TIMEOUT = 5.0
+
+OP_HANDSHAKE = 0
+OP_FRAME = 1
+OP_CLOSE = 2
+
+STATES = {
+    "idle": {"details": "In the launcher"},
+    "updating": {"details": "Updating Viola Launcher"},
+    "in_game": {"details": "Playing Minecraft: Bedrock Edition"},
+}
+
+
+def ipc_paths():
+    """Candidate Discord IPC endpoints for this platform."""
+    if sys.platform == "win32":
+        return [rf"\\?\pipe\discord-ipc-{i}" for i in range(10)]
+    base = os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or "/tmp"
+    return [os.path.join(base, f"discord-ipc-{i}") for i in range(10)]
+
+
+def presence_client_id():
+    """Return the Discord application id from config.json, or None when presence is off."""
+    cfg = read_json(config_path(), {})
+    if not cfg.get("discord_presence", True):
+        return None
+    return cfg.get("discord_client_id") or None
+
+
+# ---------------------- IPC Client ----------------------
+class _NamedPipe:
+    """
+    Windows named pipe opened for overlapped IO, so connects, reads and writes
+    give up after timeout seconds like the Unix socket does.
+    """
+
+    def __init__(self, path, timeout):
+        import _winapi
+        self._winapi = _winapi
+        self.timeout_ms = max(1, int(timeout * 1000))
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                self.handle = _winapi.CreateFile(
+                    path, _winapi.GENERIC_READ | _winapi.GENERIC_WRITE, 0, _winapi.NULL,
+                    _winapi.OPEN_EXISTING, _winapi.FILE_FLAG_OVERLAPPED, _winapi.NULL,
+                )
+                return
+            except OSError as e:
+                # Every pipe instance busy: wait for one within what is left of the timeout
+                left = deadline - time.monotonic()
+                if e.winerror != _winapi.ERROR_PIPE_BUSY or left <= 0:
+                    raise
+                _winapi.WaitNamedPipe(path, max(1, int(left * 1000)))
+
+    def _wait(self, ov, err, what):
+        w = self._winapi
+        if err == w.ERROR_IO_PENDING:
+            if w.WaitForMultipleObjects([ov.event], False, self.timeout_ms) == w.WAIT_TIMEOUT:
+                ov.cancel()
+                ov.GetOverlappedResult(True)
+                raise TimeoutError(f"Discord IPC {what} timed out")
+        n, err = ov.GetOverlappedResult(True)
+        if err not in (0, w.ERROR_MORE_DATA):
+            raise OSError(err, f"Discord IPC {what} failed")
+        return n
+
+    def read(self, n):
+        ov, err = self._winapi.ReadFile(self.handle, n, overlapped=True)
+        self._wait(ov, err, "read")
+        return bytes(ov.getbuffer())
+
+    def write(self, data):
+        ov, err = self._winapi.WriteFile(self.handle, data, overlapped=True)
+        return self._wait(ov, err, "write")
+
+    def close(self):
+        if self.handle is not None:
+            self._winapi.CloseHandle(self.handle)
+            self.handle = None
+
+
+class IpcClient:
+    """Blocking Discord IPC connection. Only used from the presence worker."""
+
+    def __init__(self, client_id, paths=None, timeout=IO_TIMEOUT):
+        self.client_id = str(client_id)
+        self.paths = paths or ipc_paths()
+        self.timeout = timeout
+        self._sock = None
+        self._pipe = None
+
+    def connect(self):
+        last = None
+        for path in self.paths:
+            try:
+                if path.startswith("\\\\?\\pipe\\"):
+                    self._pipe = _NamedPipe(path, self.timeout)
+                else:
+                    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                    sock.settimeout(self.timeout)
+                    sock.connect(path)
+                    self._sock = sock
+                break
+            except OSError as e:
+                last = e
+        else:
+            raise ConnectionError(f"Discord IPC not available: {last}")
+        self.send(OP_HANDSHAKE, {"v": 1, "client_id": self.client_id})
+        op, data = self.recv()
+        if op != OP_FRAME or data.get("evt") != "READY":
+            self.close()
+            raise ConnectionError(f"handshake rejected: {data}")
+
+    def _write(self, data):
+        if self._sock:
+            self._sock.sendall(data)
+        else:
+            self._pipe.write(data)
+
+    def _read(self, n):
+        buf = b""
+        while len(buf) < n:
+            part = self._sock.recv(n - len(buf)) if self._sock else self._pipe.read(n - len(buf))
+            if not part:
+                raise ConnectionError("IPC connection closed")
+            buf += part
+        return buf
+
+    def send(self, op, payload):
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        self._write(struct.pack("<II", op, len(body)) + body)
+
+    def recv(self):
+        op, length = struct.unpack("<II", self._read(8))
+        return op, json.loads(self._read(length) or b"{}")
+
+    def set_activity(self, activity):
+        self.send(OP_FRAME, {
+            "cmd": "SET_ACTIVITY",
+            "args": {"pid": os.getpid(), "activity": activity},
+            "nonce": uuid.uuid4().hex,
+        })
+        op, data = self.recv()
+        if op == OP_CLOSE or data.get("evt") == "ERROR":
+            raise ConnectionError(f"SET_ACTIVITY failed: {data.get('data', data)}")
+
+    def close(self):
+        for handle in (self._sock, self._pipe):
+            if handle is not None:
+                try:
+                    handle.close()
+                except OSError:
+                    pass
+        self._sock = self._pipe = None
+
+
+# ---------------------- Presence Service ----------------------
+class PresenceService:
+    """
+    Latest-state-wins publisher. set_state() never blocks on IO.
+    Counters: sent, coalesced (replaced before publishing), dropped
+    (identical to what is already shown, or discarded on stop), errors,
+    connects.
+    """
+
+    def __init__(self, client_id, client_factory=None, rate_window=RATE_WINDOW):
+        self.client_factory = client_factory or (lambda: IpcClient(client_id))
+        self.rate_window = rate_window
+        self._cond = threading.Condition()
+        self._pending = None
+        self._published = None
+        self._running = False
+        self._thread = None
+        self.counters = {"sent": 0, "coalesced": 0, "dropped": 0, "errors": 0, "connects": 0}
+        self.last_latency_ms = None
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._worker, name="presence", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        with self._cond:
+            self._running = False
+            if self._pending is not None:
+                self.counters["dropped"] += 1
+                self._pending = None
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def set_state(self, name, **fields):
+        """Record the state to show; fields override STATES (e.g. state="Realm", start=ts)."""
+        activity = dict(STATES.get(name, {"details": name}))
+        start = fields.pop("start", None)
+        activity.update(fields)
+        if start:
+            activity["timestamps"] = {"start": int(start)}
+        with self._cond:
+            if not self._running:
+                self.counters["dropped"] += 1
+            elif self._pending is None and activity == self._published:
+                self.counters["dropped"] += 1
+            else:
+                if self._pending is not None:
+                    self.counters["coalesced"] += 1
+                self._pending = activity
+                self._cond.notify()
+
+    def stats(self):
+        with self._cond:
+            return dict(self.counters, last_latency_ms=self.last_latency_ms)
+
+    def _worker(self):
+        client = None
+        backoff = BACKOFF_MIN
+        next_send = 0.0
+        while True:
+            with self._cond:
+                while self._running and (self._pending is None or time.monotonic() < next_send):
+                    self._cond.wait(None if self._pending is None else next_send - time.monotonic())
+                if not self._running:
+                    break
+                activity = self._pending
+                self._pending = None
+            t0 = time.perf_counter()
+            try:
+                if client is None:
+                    client = self.client_factory()
+                    client.connect()
+                    with self._cond:
+                        self.counters["connects"] += 1
+                client.set_activity(activity)
+            except Exception as e:
+                if client is not None:
+                    client.close()
+                client = None
+                with self._cond:
+                    self.counters["errors"] += 1
+                    if self._pending is None:
+                        self._pending = activity   # retry unless something newer arrived
+                    else:
+                        self.counters["coalesced"] += 1
+                tracing.instant("presence.error", error=str(e), backoff=backoff)
+                next_send = time.monotonic() + backoff * random.uniform(0.8, 1.2)
+                backoff = min(backoff * 2, BACKOFF_MAX)
+                continue
+            backoff = BACKOFF_MIN
+            next_send = time.monotonic() + self.rate_window
+            with self._cond:
+                self._published = activity
+                self.counters["sent"] += 1
+                self.last_latency_ms = (time.perf_counter() - t0) * 1000
+        if client is not None:
+            client.close()
@@ -0,0 +1,216 @@
+"""
+Viola Launcher - Process statistics
+Cheap readings of the launcher's own memory and CPU usage.
+Uses psutil when installed and falls back to the OS APIs otherwise.
+"""
+
+import os
+import sys
+import time
+
+try:
+    import psutil
+    _proc = psutil.Process()
+except ImportError:
+    psutil = None
+    _proc = None
+
+
+def rss_bytes():
+    """Return current resident set size in bytes (0 if unknown)."""
+    if _proc is not None:
+        return _proc.memory_info().rss
+    if sys.platform == "win32":
+        return _win_working_set()
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except Exception:
+        return 0
+
+
+def thread_count():
+    """Return the number of OS threads in this process."""
+    if _proc is not None:
+        return _proc.num_threads()
+    status = _proc_status()
+    if "Threads" in status:
+        return status["Threads"]
+    import threading
+    return threading.active_count()
+
+
+def context_switches():
+    """
+    Return total context switches so far, or None if unavailable. Voluntary
+    switches are mostly wakeups of sleeping threads and timers.
+    """
+    if _proc is not None:
+        try:
+            ctx = _proc.num_ctx_switches()
+            return ctx.voluntary + ctx.involuntary
+        except Exception:
+            return None
+    status = _proc_status()
+    if "voluntary_ctxt_switches" in status:
+        return status["voluntary_ctxt_switches"] + status.get("nonvoluntary_ctxt_switches", 0)
+    return None
+
+
+def _proc_status():
+    """Integer fields of /proc/self/status (empty off Linux)."""
+    out = {}
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                value = value.split()
+                if value and value[0].isdigit():
+                    out[key] = int(value[0])
+    except OSError:
+        pass
+    return out
+
+
+def cpu_seconds():
+    """Return total user + system CPU time consumed by this process."""
+    return time.process_time()
+
+
+def process_start_time(pid=None):
+    """
+    Return the wall-clock creation time of a process (default: this one), or None.
+    On Linux this is good to one clock tick (10 ms); see _proc_start_time.
+    """
+    if os.path.exists("/proc/self/stat"):
+        try:
+            return _proc_start_time(pid)
+        except Exception:
+            return None
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).create_time()
+        except Exception:
+            return None
+    if sys.platform == "win32":
+        return _win_process_start(pid)
+    return None
+
+
+def _proc_start_time(pid=None):
+    """
+    Process age from /proc instead of btime + start ticks: btime (which psutil
+    uses too) is whole seconds, so that sum can be off by up to a second.
+    /proc/uptime and the start ticks are both 10 ms resolution.
+    """
+    with open(f"/proc/{pid or 'self'}/stat", "r") as f:
+        # Field 22 (after the parenthesised name) is start time in clock ticks since boot
+        ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+    with open("/proc/uptime", "r") as f:
+        uptime = float(f.read().split()[0])
+    return time.time() - (uptime - ticks / os.sysconf("SC_CLK_TCK"))
+
+
+def launch_start_time():
+    """
+    Wall-clock time the user started the app. A PyInstaller onefile build runs
+    as a child of its unpacking bootloader, so that parent's start is used.
+    """
+    if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
+        parent = os.getppid()
+        exe = os.path.basename(sys.executable).lower()
+        try:
+            if psutil is not None and psutil.Process(parent).name().lower() == exe:
+                return process_start_time(parent)
+        except Exception:
+            pass
+    return process_start_time()
+
+
+def format_mb(n):
+    return f"{n / (1024 * 1024):.1f} MB"
+
+
+class CpuMeter:
+    """Reports CPU usage as a percentage of one core since the previous sample."""
+
+    def __init__(self):
+        self._wall = time.perf_counter()
+        self._cpu = cpu_seconds()
+
+    def sample(self):
+        wall, cpu = time.perf_counter(), cpu_seconds()
+        elapsed = wall - self._wall
+        percent = 100.0 * (cpu - self._cpu) / elapsed if elapsed > 0 else 0.0
+        self._wall, self._cpu = wall, cpu
+        return percent
+
+
+def trim_working_set():
+    """Ask the OS to drop pages we are not actively using. Best effort."""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            ctypes.windll.psapi.EmptyWorkingSet(handle)
+        elif sys.platform.startswith("linux"):
+            import ctypes
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except Exception as e:
+        print("Failed to trim working set:", e)
+
+
+def _win_process_start(pid=None):
+    try:
+        import ctypes
+        from ctypes import wintypes
+        kernel32 = ctypes.windll.kernel32
+        if pid is None:
+            handle = kernel32.GetCurrentProcess()
+        else:
+            handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        times = [wintypes.FILETIME() for _ in range(4)]
+        ok = kernel32.GetProcessTimes(handle, *[ctypes.byref(t) for t in times])
+        if pid is not None:
+            kernel32.CloseHandle(handle)
+        if ok:
+            created = (times[0].dwHighDateTime << 32) | times[0].dwLowDateTime
+            return created / 1e7 - 11644473600  # FILETIME epoch is 1601
+    except Exception:
+        pass
+    return None
+
+
+def _win_working_set():
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+    except Exception:
+        pass
+    return 0
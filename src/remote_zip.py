@@ -0,0 +1,289 @@
+"""
+Viola Launcher - Remote zip member reads over HTTP ranges
+Reads a release zip's end-of-central-directory and central directory with
+range requests, compares each member's CRC and size with the installed
+files, and downloads and inflates only the members that changed. Ranges of
+neighbouring members are coalesced into one request. Servers that ignore
+Range (answering 200 with the whole file) raise RangeNotSupported so the
+caller can fall back to a full download.
+"""
+
+import os
+import re
+import zlib
+import struct
+import hashlib
+from collections import namedtuple
+
+import tracing
+import http_client
+
+EOCD = struct.Struct("<4s4H2LH")                # end of central directory
+EOCD64_LOCATOR = struct.Struct("<4sLQL")
+EOCD64 = struct.Struct("<4sQ2H2L4Q")
+CENTRAL = struct.Struct("<4s4B4HL2L5H2L")       # central directory file header
+LOCAL = struct.Struct("<4s2B4HL2L2H")           # local file header
+EOCD_SIG = b"PK\x05\x06"
+EOCD64_LOCATOR_SIG = b"PK\x06\x07"
+EOCD64_SIG = b"PK\x06\x06"
+CENTRAL_SIG = b"PK\x01\x02"
+LOCAL_SIG = b"PK\x03\x04"
+TAIL_BYTES = EOCD.size + 0xFFFF + EOCD64_LOCATOR.size   # room for the longest zip comment
+MAX_GAP = 64 * 1024                             # fetch up to this much waste to save a round trip
+CHUNK = 256 * 1024
+STORED, DEFLATED = 0, 8
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+RemoteMember = namedtuple("RemoteMember", "name crc method compressed_size size header_offset mode end")
+
+
+class RangeNotSupported(Exception):
+    """The server answered a range request with the whole file (or not at all)."""
+
+
+class RemoteZipError(Exception):
+    pass
+
+
+def file_crc32(path):
+    crc = 0
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+class _RangeReader:
+    """Sequential reader over one range response that knows its absolute file position."""
+
+    def __init__(self, response, start):
+        self.response = response
+        self.pos = start
+
+    def read_exact(self, n):
+        data = self.response.read(n)
+        while len(data) < n:
+            more = self.response.read(n - len(data))
+            if not more:
+                raise RemoteZipError("range response ended early")
+            data += more
+        self.pos += n
+        return data
+
+    def skip_to(self, offset):
+        while self.pos < offset:
+            self.read_exact(min(CHUNK, offset - self.pos))
+
+    def stream(self, n):
+        while n > 0:
+            chunk = self.read_exact(min(CHUNK, n))
+            n -= len(chunk)
+            yield chunk
+
+
+class RemoteZip:
+    """Central directory of a zip at url; members are fetched on demand."""
+
+    def __init__(self, url, timeout=30, max_gap=MAX_GAP):
+        self.url = url
+        self.timeout = timeout
+        self.max_gap = max_gap
+        self.requests = 0
+        self.bytes_downloaded = 0
+        with tracing.span("remote_zip.directory"):
+            tail, self.size = self._fetch_tail()
+            self.members = self._read_directory(tail)
+
+    # ---------- HTTP ----------
+    def _request(self, range_header):
+        # identity keeps the body byte-for-byte what the offsets describe
+        r = http_client.stream(self.url, self.timeout, {"Range": range_header, "Accept-Encoding": "identity"})
+        self.requests += 1
+        if r.status_code != 206:
+            r.close()
+            r.raise_for_status()
+            raise RangeNotSupported(f"server ignored Range (HTTP {r.status_code})")
+        m = _CONTENT_RANGE.match(r.headers.get("Content-Range", ""))
+        if not m:
+            r.close()
+            raise RangeNotSupported("missing Content-Range in 206 response")
+        return r, int(m.group(1)), int(m.group(2)), m.group(3)
+
+    def _read(self, start, end):
+        """Bytes [start, end) in one request."""
+        r, first, last, _ = self._request(f"bytes={start}-{end - 1}")
+        with r:
+            if first != start:
+                raise RemoteZipError(f"asked for offset {start}, got {first}")
+            data = r.content
+        self.bytes_downloaded += len(data)
+        return data
+
+    def _fetch_tail(self):
+        r, first, last, total = self._request(f"bytes=-{TAIL_BYTES}")
+        with r:
+            data = r.content
+        self.bytes_downloaded += len(data)
+        size = int(total) if total != "*" else last + 1
+        return data, size
+
+    # ---------- Directory ----------
+    def _read_directory(self, tail):
+        pos = tail.rfind(EOCD_SIG)
+        if pos < 0 or pos + EOCD.size > len(tail):
+            raise RemoteZipError("end of central directory not found")
+        _, _, _, _, count, cd_size, cd_offset, _ = EOCD.unpack_from(tail, pos)
+        tail_start = self.size - len(tail)
+        if count == 0xFFFF or cd_size == 0xFFFFFFFF or cd_offset == 0xFFFFFFFF:
+            loc = pos - EOCD64_LOCATOR.size
+            sig, _, eocd64_offset, _ = EOCD64_LOCATOR.unpack_from(tail, loc)
+            if sig != EOCD64_LOCATOR_SIG:
+                raise RemoteZipError("zip64 locator not found")
+            if eocd64_offset >= tail_start:
+                record = tail[eocd64_offset - tail_start:eocd64_offset - tail_start + EOCD64.size]
+            else:
+                record = self._read(eocd64_offset, eocd64_offset + EOCD64.size)
+            fields = EOCD64.unpack(record)
+            if fields[0] != EOCD64_SIG:
+                raise RemoteZipError("zip64 end of central directory not found")
+            count, cd_size, cd_offset = fields[7], fields[8], fields[9]
+
+        if cd_offset >= tail_start:
+            cd = tail[cd_offset - tail_start:cd_offset - tail_start + cd_size]
+        else:
+            cd = self._read(cd_offset, cd_offset + cd_size)
+        return self._parse_central(cd, count, cd_offset)
+
+    @staticmethod
+    def _parse_central(cd, count, cd_offset):
+        entries = []
+        pos = 0
+        for _ in range(count):
+            fields = CENTRAL.unpack_from(cd, pos)
+            if fields[0] != CENTRAL_SIG:
+                raise RemoteZipError("bad central directory entry")
+            flags, method, crc = fields[5], fields[6], fields[9]
+            csize, size, name_len, extra_len, comment_len = fields[10:15]
+            mode, offset = fields[17] >> 16, fields[18]
+            pos += CENTRAL.size
+            raw_name = cd[pos:pos + name_len]
+            name = raw_name.decode("utf-8" if flags & 0x800 else "cp437")
+            extra = cd[pos + name_len:pos + name_len + extra_len]
+            pos += name_len + extra_len + comment_len
+            # zip64 extra field: only the fields that overflowed, in this order
+            i = 0
+            while i + 4 <= len(extra):
+                tag, length = struct.unpack_from("<HH", extra, i)
+                if tag == 0x0001:
+                    values = list(struct.unpack_from(f"<{length // 8}Q", extra, i + 4))
+                    if size == 0xFFFFFFFF:
+                        size = values.pop(0)
+                    if csize == 0xFFFFFFFF:
+                        csize = values.pop(0)
+                    if offset == 0xFFFFFFFF:
+                        offset = values.pop(0)
+                i += 4 + length
+            if flags & 0x1:
+                raise RemoteZipError(f"{name} is encrypted")
+            entries.append((name, crc, method, csize, size, offset, mode))
+
+        # A member's bytes run up to the next local header (or the directory)
+        starts = sorted({e[5] for e in entries}) + [cd_offset]
+        following = {start: starts[i + 1] for i, start in enumerate(starts[:-1])}
+        return {e[0]: RemoteMember(*e, end=following[e[5]]) for e in entries}
+
+    # ---------- Members ----------
+    def changed_members(self, dest, compare="crc"):
+        """Members whose installed copy under dest is missing or differs (by size, then CRC)."""
+        changed = []
+        for m in self.members.values():
+            if m.name.endswith("/"):
+                continue
+            path = os.path.join(dest, m.name)
+            if not os.path.isfile(path) or os.path.getsize(path) != m.size:
+                changed.append(m)
+            elif compare == "crc" and file_crc32(path) != m.crc:
+                changed.append(m)
+        return changed
+
+    def plan(self, members):
+        """Group members into coalesced byte ranges: [(start, end, [members])]."""
+        groups = []
+        for m in sorted(members, key=lambda m: m.header_offset):
+            if groups and m.header_offset - groups[-1][1] <= self.max_gap:
+                groups[-1][1] = max(groups[-1][1], m.end)
+                groups[-1][2].append(m)
+            else:
+                groups.append([m.header_offset, m.end, [m]])
+        return [tuple(g) for g in groups]
+
+    def extract(self, members, staging, progress_callback=None, expected_sha256=None):
+        """
+        Download and inflate members into staging, checking CRC, size and (when
+        expected_sha256 maps names to hashes) sha256. Returns (relative paths, bytes).
+        """
+        staging = os.path.abspath(staging)
+        if expected_sha256 is not None:
+            expected_sha256 = {name: sha.lower() for name, sha in expected_sha256.items()}
+        groups = self.plan(members)
+        total = sum(end - start for start, end, _ in groups) or 1
+        fetched = 0
+        files = []
+        nbytes = 0
+        for start, end, group in groups:
+            with tracing.span("remote_zip.range", start=start, bytes=end - start, members=len(group)):
+                r, first, _, _ = self._request(f"bytes={start}-{end - 1}")
+                with r:
+                    if first != start:
+                        raise RemoteZipError(f"asked for offset {start}, got {first}")
+                    reader = _RangeReader(r.raw, start)
+                    for m in group:
+                        reader.skip_to(m.header_offset)
+                        files.append(self._extract_one(reader, m, staging, expected_sha256))
+                        nbytes += m.size
+                        if progress_callback:
+                            progress_callback(min(100, int((fetched + reader.pos - start) * 100 / total)))
+                    reader.skip_to(end)
+            fetched += end - start
+            self.bytes_downloaded += end - start
+        return files, nbytes
+
+    def _extract_one(self, reader, m, staging, expected_sha256):
+        header = LOCAL.unpack(reader.read_exact(LOCAL.size))
+        if header[0] != LOCAL_SIG:
+            raise RemoteZipError(f"bad local header for {m.name}")
+        reader.read_exact(header[10] + header[11])       # name and local extra field
+        target = os.path.normpath(os.path.join(staging, m.name))
+        if os.path.isabs(m.name) or not target.startswith(staging + os.sep):
+            raise RemoteZipError(f"unsafe path in update archive: {m.name}")
+        if m.method not in (STORED, DEFLATED):
+            raise RemoteZipError(f"{m.name}: unsupported compression method {m.method}")
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        inflater = zlib.decompressobj(-15) if m.method == DEFLATED else None
+        crc = 0
+        size = 0
+        h = hashlib.sha256() if expected_sha256 is not None else None
+        with open(target, "wb") as out:
+            for chunk in reader.stream(m.compressed_size):
+                data = inflater.decompress(chunk) if inflater else chunk
+                crc = zlib.crc32(data, crc)
+                size += len(data)
+                if h:
+                    h.update(data)
+                out.write(data)
+            if inflater:
+                data = inflater.flush()
+                crc = zlib.crc32(data, crc)
+                size += len(data)
+                if h:
+                    h.update(data)
+                out.write(data)
+        if crc != m.crc or size != m.size:
+            raise RemoteZipError(f"{m.name}: CRC or size mismatch")
+        if h is not None:
+            expected = expected_sha256.get(m.name)
+            if not expected or h.hexdigest() != expected:
+                raise RemoteZipError(f"{m.name}: sha256 missing from manifest or mismatched")
+        if m.mode and os.name != "nt":
+            os.chmod(target, m.mode & 0o777)
+        return os.path.relpath(target, staging)
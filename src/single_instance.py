@@ -0,0 +1,104 @@
+"""
+Viola Launcher - Single-instance handoff
+The first launcher listens on a local socket. Later invocations forward their
+argv to it and exit, instead of cold-starting a second Qt app, update check,
+hotkey hook and overlay.
+"""
+
+import os
+import sys
+import json
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtNetwork import QLocalServer, QLocalSocket
+
+CONNECT_TIMEOUT_MS = 150
+REPLY_TIMEOUT_MS = 1000
+
+
+def server_name():
+    """Per-user socket name so two accounts on one machine don't collide."""
+    user = os.getenv("USERNAME") or os.getenv("USER") or "default"
+    return f"ViolaLauncher-{user}"
+
+
+def forward_to_running(argv, name=None, timeout_ms=CONNECT_TIMEOUT_MS):
+    """
+    Send argv to an already running launcher.
+    Returns True if one accepted it, False if this process should start normally.
+    Uses blocking socket calls, so it works before QApplication exists.
+    """
+    sock = QLocalSocket()
+    sock.connectToServer(name or server_name())
+    if not sock.waitForConnected(timeout_ms):
+        return False
+    try:
+        sock.write(json.dumps({"argv": list(argv)}).encode("utf-8") + b"\n")
+        if not sock.waitForBytesWritten(REPLY_TIMEOUT_MS):
+            return False
+        while not sock.canReadLine():
+            if not sock.waitForReadyRead(REPLY_TIMEOUT_MS):
+                return False
+        return bytes(sock.readLine()).strip() == b"ok"
+    finally:
+        sock.disconnectFromServer()
+
+
+def hand_off_or_continue(argv=None):
+    """
+    Entry-point preamble of every launcher script. Lets the pool workers of a
+    frozen build run their task, then forwards argv to a running launcher and
+    exits if it accepted (unless --new-instance is given). Returns otherwise.
+    """
+    import multiprocessing
+    multiprocessing.freeze_support()
+    argv = sys.argv if argv is None else argv
+    if "--new-instance" not in argv and forward_to_running(argv[1:]):
+        sys.exit(0)
+
+
+class InstanceServer(QObject):
+    """Accepts forwarded argv from later invocations and re-emits it on the GUI thread."""
+
+    message_received = pyqtSignal(list)
+
+    def __init__(self, name=None, parent=None):
+        super().__init__(parent)
+        self.name = name or server_name()
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self._on_new_connection)
+
+    def listen(self):
+        """Start listening. Returns False if another live instance owns the name."""
+        if self.server.listen(self.name):
+            return True
+        # A crashed launcher can leave a stale socket file behind on Unix
+        probe = QLocalSocket()
+        probe.connectToServer(self.name)
+        if probe.waitForConnected(CONNECT_TIMEOUT_MS):
+            probe.disconnectFromServer()
+            return False
+        QLocalServer.removeServer(self.name)
+        return self.server.listen(self.name)
+
+    def close(self):
+        self.server.close()
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            sock = self.server.nextPendingConnection()
+            sock.readyRead.connect(lambda s=sock: self._on_ready_read(s))
+            sock.disconnected.connect(sock.deleteLater)
+
+    def _on_ready_read(self, sock):
+        while sock.canReadLine():
+            line = bytes(sock.readLine())
+            try:
+                argv = json.loads(line.decode("utf-8")).get("argv", [])
+            except Exception as e:
+                print("Ignoring malformed instance message:", e)
+                sock.write(b"error\n")
+                continue
+            sock.write(b"ok\n")
+            sock.flush()
+            self.message_received.emit([str(a) for a in argv])
@@ -0,0 +1,160 @@
+"""
+Viola Launcher - Themes
+Colours live in palettes and every style is written once below, keyed by
+objectName (unique widgets) or the "role" dynamic property (repeated kinds
+of widget). A theme compiles to one application-wide stylesheet, so Qt
+parses a single sheet at startup instead of one per widget, and switching
+themes at runtime is one setStyleSheet call on the QApplication.
+
+Widgets opt in with setObjectName(...) or setProperty("role", ...) before
+they are first shown. Importing this module never pulls in PyQt6.
+"""
+
+import time
+
+import tracing
+from launcher_config import config_path, read_json, write_json
+
+DEFAULT_THEME = "dark"
+
+PALETTES = {
+    "dark": {
+        "window": "#1e1e1e",
+        "text": "white",
+        "scrim": "rgba(0, 0, 0, 120)",
+        "accent": "#7C1FFF",
+        "accent_hover": "#9B47FF",
+        "on_accent": "white",
+        "neutral": "#818589",
+        "neutral_hover": "#9b9da0",
+        "field": "#2e2e2e",
+        "field_hover": "#454545",
+        "control_hover": "#aaaaaa",
+        "curtain": "black",
+    },
+    "light": {
+        "window": "#f2f2f5",
+        "text": "#1e1e1e",
+        "scrim": "rgba(255, 255, 255, 150)",
+        "accent": "#7C1FFF",
+        "accent_hover": "#9B47FF",
+        "on_accent": "white",
+        "neutral": "#6b6e72",
+        "neutral_hover": "#55585c",
+        "field": "#e2e2e6",
+        "field_hover": "#d0d0d6",
+        "control_hover": "#555555",
+        "curtain": "#f2f2f5",
+    },
+    "midnight": {
+        "window": "#0d1021",
+        "text": "#e6e8ff",
+        "scrim": "rgba(5, 8, 30, 140)",
+        "accent": "#3d5afe",
+        "accent_hover": "#6f83ff",
+        "on_accent": "white",
+        "neutral": "#39406b",
+        "neutral_hover": "#4d5690",
+        "field": "#1b2040",
+        "field_hover": "#2a3160",
+        "control_hover": "#8c93c9",
+        "curtain": "#0d1021",
+    },
+}
+
+# The in-game overlay always sits on its own dark chrome, whatever the theme
+HUD = {
+    "hud_text": "white",
+    "hud_dim": "rgba(255, 255, 255, 180)",
+    "hud_faint": "rgba(255, 255, 255, 140)",
+}
+
+# (selector, declarations); {name} is filled from the palette
+RULES = [
+    ('QLabel[role="background"]', 'background-color: {window};'),
+    ('QLabel[role="scrim"]', 'background-color: {scrim}; border-radius: 25px;'),
+    ('QLabel#appTitle', 'color: {text}; font: bold 18pt "Segoe UI";'),
+    ('QLabel#greeting', 'color: {text}; font: bold 32pt "Segoe UI";'),
+    ('QLabel[role="pageTitle"]', 'color: {text}; font: bold 24pt "Segoe UI";'),
+    ('QLabel#updateOverlay', 'background-color: {curtain}; color: {text}; font: bold 24px "Segoe UI";'),
+
+    ('QPushButton[role="primary"]',
+     'background-color: {accent}; color: {on_accent}; border-radius: 15px; font: bold 16px "Segoe UI";'),
+    ('QPushButton[role="primary"]:hover', 'background-color: {accent_hover};'),
+    ('QPushButton#launchButton', 'font: bold 18px "Segoe UI";'),
+    ('QPushButton[role="secondary"]',
+     'background-color: {neutral}; color: {on_accent}; border-radius: 15px; font: bold 16px "Segoe UI";'),
+    ('QPushButton[role="secondary"]:hover', 'background-color: {neutral_hover};'),
+    ('QPushButton[role="field"]',
+     'background-color: {field}; color: {text}; border-radius: 12px; font: bold 16px "Segoe UI";'),
+    ('QPushButton[role="field"]:hover', 'background-color: {field_hover};'),
+    ('QPushButton[role="windowControl"]',
+     'color: {text}; background: transparent; border: none; font: bold 20px "Segoe UI";'),
+    ('QPushButton[role="windowControl"]:hover', 'color: {control_hover};'),
+
+    ('QLabel#worldsStatus', 'color: {text}; font: 12px "Segoe UI";'),
+    ('QListWidget[role="worldList"]',
+     'background: transparent; color: {text}; border: none; font: 14px "Segoe UI";'),
+    ('QListWidget[role="worldList"]::item', 'padding: 6px; border-radius: 10px;'),
+    ('QListWidget[role="worldList"]::item:hover', 'background-color: {field};'),
+    ('QListWidget[role="worldList"]::item:selected', 'background-color: {field_hover}; color: {text};'),
+
+    ('QLabel#overlayTitle', 'color: {hud_text}; font: bold 20px "Segoe UI";'),
+    ('QLabel#overlayHint', 'color: {hud_dim}; font: 12px "Segoe UI";'),
+    ('QLabel[role="overlayItem"]', 'color: {hud_text}; font: 14px "Segoe UI";'),
+    ('QLabel#overlayStats', 'color: {hud_faint}; font: 11px "Segoe UI";'),
+]
+
+_compiled = {}
+_current = None
+
+
+def theme_names():
+    return list(PALETTES)
+
+
+def build_stylesheet(name):
+    """Return the application stylesheet for a theme; compiled once per theme."""
+    sheet = _compiled.get(name)
+    if sheet is None:
+        if name not in PALETTES:
+            raise KeyError(f"unknown theme: {name}")
+        values = dict(PALETTES[name], **HUD)
+        sheet = "\n".join(f"{selector} {{ {decl.format(**values)} }}" for selector, decl in RULES)
+        _compiled[name] = sheet
+    return sheet
+
+
+def configured_theme():
+    """Theme named in config.json ("theme"), falling back to the default."""
+    name = read_json(config_path(), {}).get("theme", DEFAULT_THEME)
+    return name if name in PALETTES else DEFAULT_THEME
+
+
+def current_theme():
+    return _current
+
+
+def apply_theme(app, name=None):
+    """
+    Install a theme on the QApplication (startup and runtime switches alike).
+    Qt re-polishes every existing widget. Returns the seconds it took.
+    """
+    global _current
+    name = name or configured_theme()
+    t0 = time.perf_counter()
+    with tracing.span("theme.apply", theme=name):
+        app.setStyleSheet(build_stylesheet(name))
+    _current = name
+    return time.perf_counter() - t0
+
+
+def save_theme(name):
+    cfg = read_json(config_path(), {})
+    cfg["theme"] = name
+    write_json(config_path(), cfg)
+
+
+def next_theme(name):
+    names = theme_names()
+    return names[(names.index(name) + 1) % len(names)] if name in names else DEFAULT_THEME
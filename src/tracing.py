@@ -0,0 +1,138 @@
+"""
+Viola Launcher - Lightweight tracing
+Spans are buffered in memory and can be exported as a Chrome trace-event file
+(open it in https://ui.perfetto.dev or chrome://tracing).
+Recording a span is a couple of perf_counter calls and a deque append, so it stays on.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import functools
+from collections import deque
+
+MAX_EVENTS = 100_000
+
+_events = deque(maxlen=MAX_EVENTS)
+_thread_names = {}
+_pid = os.getpid()
+_t0 = time.perf_counter_ns()
+enabled = True
+
+
+def _now_us():
+    return (time.perf_counter_ns() - _t0) / 1000.0
+
+
+def _tid():
+    tid = threading.get_ident()
+    if tid not in _thread_names:
+        _thread_names[tid] = threading.current_thread().name
+    return tid
+
+
+# ---------------------- Spans ----------------------
+class span:
+    """
+    Context manager recording one complete ("X") event.
+    Extra keyword args and set() values show up under "args" in the viewer.
+    """
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, **args):
+        self.name = name
+        self.args = args
+        self.start = 0.0
+
+    def set(self, key, value):
+        self.args[key] = value
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if not enabled:
+            return False
+        if exc_type is not None:
+            self.args["error"] = f"{exc_type.__name__}: {exc}"
+        _events.append(("X", self.name, self.start, _now_us() - self.start, _tid(), self.args))
+        return False
+
+
+def traced(name=None):
+    """Decorator wrapping every call of a function in a span."""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instant(name, **args):
+    """Record a zero-duration marker event."""
+    if enabled:
+        _events.append(("i", name, _now_us(), 0.0, _tid(), args))
+
+
+def counter(name, **values):
+    """Record a counter ("C") event; each keyword becomes a track in the viewer."""
+    if enabled:
+        _events.append(("C", name, _now_us(), 0.0, _tid(), values))
+
+
+def reset():
+    """Drop all buffered events."""
+    _events.clear()
+
+
+def events():
+    """Return a snapshot of the buffered events."""
+    return list(_events)
+
+
+# ---------------------- Export ----------------------
+def chrome_trace():
+    """Build a Chrome trace-event document from the buffered events."""
+    trace = []
+    for tid, tname in list(_thread_names.items()):
+        trace.append({"ph": "M", "name": "thread_name", "pid": _pid, "tid": tid, "args": {"name": tname}})
+    for ph, name, ts, dur, tid, args in list(_events):
+        ev = {"ph": ph, "name": name, "cat": name.split(".", 1)[0], "ts": ts, "pid": _pid, "tid": tid}
+        if ph == "X":
+            ev["dur"] = dur
+        elif ph == "i":
+            ev["s"] = "t"
+        if args:
+            ev["args"] = {k: v if isinstance(v, (int, float, bool, str)) or v is None else str(v) for k, v in args.items()}
+        trace.append(ev)
+    return {"traceEvents": trace, "displayTimeUnit": "ms"}
+
+
+def export_chrome_trace(path):
+    """Write buffered events to path. Returns True on success."""
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(chrome_trace(), f)
+        print(f"[Trace] Wrote {len(_events)} events to {path}")
+        return True
+    except Exception as e:
+        print("Failed to write trace:", e)
+        return False
+
+
+def trace_path_from_argv(argv=None):
+    """Return the output path given via --trace out.json / --trace=out.json, or None."""
+    argv = sys.argv if argv is None else argv
+    for i, arg in enumerate(argv):
+        if arg == "--trace" and i + 1 < len(argv):
+            return argv[i + 1]
+        if arg.startswith("--trace="):
+            return arg.split("=", 1)[1]
+    return None
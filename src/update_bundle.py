@@ -0,0 +1,249 @@
+"""
+Viola Launcher - Offline update bundles
+A single file that carries a whole release for machines that cannot reach
+the manifest URL:
+
+    header   magic, format, entry count, index size, version, sha256 of index
+    index    per file: offset, length, sha256, mode, path
+    payloads file contents, each starting on a PAGE boundary
+
+Applying memory-maps the bundle and hashes and writes every entry straight
+from the mapping, so a large bundle on a USB stick is limited by the disks,
+not by copies through Python buffers.
+
+    python src/update_bundle.py build RELEASE_DIR OUT.vbundle --version 1.2.3
+    python src/update_bundle.py info|verify BUNDLE
+"""
+
+import os
+import sys
+import mmap
+import json
+import stat
+import struct
+import hashlib
+import argparse
+from collections import namedtuple
+
+BUNDLE_SUFFIX = ".vbundle"
+MAGIC = b"VBDL"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHII16s32s")     # magic, format, reserved, entries, index bytes, version, index sha256
+ENTRY = struct.Struct("<QQ32sIH")           # offset, length, sha256, mode, path bytes (path follows)
+PAGE = 4096
+CHUNK = 8 * 1024 * 1024
+
+BundleEntry = namedtuple("BundleEntry", "path offset length sha256 mode")
+
+
+class BundleError(Exception):
+    pass
+
+
+def is_bundle(path):
+    """True when path starts with the bundle magic (cheap; reads 4 bytes)."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _align(n):
+    return (n + PAGE - 1) // PAGE * PAGE
+
+
+# ---------------------- Building ----------------------
+def build_bundle(release_dir, out_path, version):
+    """Pack every file under release_dir into out_path. Returns the entry list."""
+    release_dir = os.path.abspath(release_dir)
+    files = []
+    for root, dirs, names in os.walk(release_dir):
+        dirs.sort()
+        for name in sorted(names):
+            full = os.path.join(root, name)
+            if os.path.abspath(full) == os.path.abspath(out_path):
+                continue
+            files.append((os.path.relpath(full, release_dir).replace(os.sep, "/"), full))
+    if not files:
+        raise BundleError(f"{release_dir} has no files")
+
+    # Offsets depend only on sizes, so the index is laid out before any data is read
+    index_bytes = sum(ENTRY.size + len(rel.encode("utf-8")) for rel, _ in files)
+    offset = _align(HEADER.size + index_bytes)
+    layout = []
+    for rel, full in files:
+        size = os.path.getsize(full)
+        layout.append((rel, full, offset, size))
+        offset = _align(offset + size)
+
+    entries = []
+    with open(out_path, "wb") as out:
+        for rel, full, offset, size in layout:
+            out.seek(offset)
+            h = hashlib.sha256()
+            with open(full, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK), b""):
+                    h.update(chunk)
+                    out.write(chunk)
+            mode = stat.S_IMODE(os.stat(full).st_mode)
+            entries.append(BundleEntry(rel, offset, size, h.hexdigest(), mode))
+        # A trailing empty file still needs its offset inside the file
+        out.truncate(entries[-1].offset + entries[-1].length)
+
+        index = b"".join(ENTRY.pack(e.offset, e.length, bytes.fromhex(e.sha256), e.mode, len(e.path.encode("utf-8")))
+                         + e.path.encode("utf-8") for e in entries)
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(entries), len(index),
+                              str(version).encode("utf-8")[:16], hashlib.sha256(index).digest()))
+        out.write(index)
+    return entries
+
+
+# ---------------------- Reading ----------------------
+class Bundle:
+    """A memory-mapped bundle. Use as a context manager."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < HEADER.size:
+            self._file.close()
+            raise BundleError(f"{path} is too small to be an update bundle")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if hasattr(self._map, "madvise"):
+            self._map.madvise(mmap.MADV_SEQUENTIAL)
+        try:
+            self.version, self.entries = self._read_index(size)
+        except Exception:
+            self.close()
+            raise
+
+    def _read_index(self, size):
+        magic, fmt, _, count, index_bytes, version, index_sha = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise BundleError(f"{self.path} is not an update bundle")
+        if fmt != FORMAT_VERSION:
+            raise BundleError(f"unsupported bundle format {fmt}")
+        if HEADER.size + index_bytes > size:
+            raise BundleError("bundle index is truncated")
+        with memoryview(self._map)[HEADER.size:HEADER.size + index_bytes] as index:
+            if hashlib.sha256(index).digest() != index_sha:
+                raise BundleError("bundle index is corrupt")
+            entries = []
+            pos = 0
+            for _ in range(count):
+                offset, length, digest, mode, path_len = ENTRY.unpack_from(index, pos)
+                pos += ENTRY.size
+                path = bytes(index[pos:pos + path_len]).decode("utf-8")
+                pos += path_len
+                if offset + length > size:
+                    raise BundleError(f"bundle is truncated at {path}")
+                entries.append(BundleEntry(path, offset, length, digest.hex(), mode))
+        return version.rstrip(b"\0").decode("utf-8", "replace"), entries
+
+    @property
+    def total_bytes(self):
+        return sum(e.length for e in self.entries)
+
+    def view(self, entry):
+        """Zero-copy memoryview of one entry's bytes (release it before close())."""
+        return memoryview(self._map)[entry.offset:entry.offset + entry.length]
+
+    def verify(self, entry=None, out=None, progress=None):
+        """
+        Hash entry (or every entry) straight from the mapping, writing the bytes
+        to the file object out as they are hashed. Raises BundleError on mismatch.
+        progress(n) is called with the byte count of each chunk.
+        """
+        for e in ([entry] if entry else self.entries):
+            h = hashlib.sha256()
+            with self.view(e) as data:
+                for start in range(0, e.length, CHUNK):
+                    with data[start:start + CHUNK] as chunk:
+                        h.update(chunk)
+                        if out is not None:
+                            out.write(chunk)
+                    if progress:
+                        progress(min(CHUNK, e.length - start))
+            if h.hexdigest() != e.sha256:
+                raise BundleError(f"sha256 mismatch for {e.path}")
+
+    def extract(self, staging, progress=None):
+        """Write every entry below staging, verifying as it goes. Returns (relative paths, bytes)."""
+        staging = os.path.abspath(staging)
+        files = []
+        for e in self.entries:
+            target = os.path.normpath(os.path.join(staging, e.path))
+            if os.path.isabs(e.path) or not target.startswith(staging + os.sep):
+                raise BundleError(f"unsafe path in update bundle: {e.path}")
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "wb") as out:
+                self.verify(e, out, progress)
+            if e.mode and os.name != "nt":
+                os.chmod(target, e.mode & 0o777)
+            files.append(os.path.relpath(target, staging))
+        if not files:
+            raise BundleError("update bundle is empty")
+        return files, self.total_bytes
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_version(path):
+    """Version stamped in a bundle header, without mapping the file."""
+    with open(path, "rb") as f:
+        data = f.read(HEADER.size)
+    if len(data) < HEADER.size or data[:4] != MAGIC:
+        raise BundleError(f"{path} is not an update bundle")
+    return HEADER.unpack(data)[5].rstrip(b"\0").decode("utf-8", "replace")
+
+
+# ---------------------- Entry Point ----------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline update bundles")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("build", help="pack a release folder into a bundle")
+    p.add_argument("release_dir")
+    p.add_argument("out")
+    p.add_argument("--version", required=True, help="version recorded as installed after applying")
+    p = sub.add_parser("info", help="list the entries of a bundle")
+    p.add_argument("bundle")
+    p.add_argument("--json", action="store_true", help="print JSON")
+    p = sub.add_parser("verify", help="check every entry against its sha256")
+    p.add_argument("bundle")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "build":
+            entries = build_bundle(args.release_dir, args.out, args.version)
+            print(f"[Bundle] Wrote {args.out}: {len(entries)} files, "
+                  f"{sum(e.length for e in entries) / 2**20:.1f} MB, version {args.version}")
+            return 0
+        with Bundle(args.bundle) as bundle:
+            if args.command == "verify":
+                bundle.verify()
+                print(f"[Bundle] {len(bundle.entries)} files OK")
+            elif args.json:
+                print(json.dumps({"version": bundle.version, "entries": [e._asdict() for e in bundle.entries]}, indent=2))
+            else:
+                print(f"version {bundle.version}, {len(bundle.entries)} files")
+                for e in bundle.entries:
+                    print(f"{e.length:>12}  {e.sha256[:12]}  {e.path}")
+    except (BundleError, OSError) as e:
+        print(f"[Bundle] {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,53 +1,354 @@
-import os, requests, hashlib, zipfile, io, tempfile, json, sys, subprocess
+import os, hashlib, zipfile, tempfile, sys, subprocess, shutil, time
+
+from launcher_config import config_path, read_json, write_json
 
 APP_NAME = "ViolaLauncher"
-MANIFEST_URL = "https://github.com/ThatWeirdGuy259/ViolaLauncher/releases/latest/download/latest.json"
-CONFIG_FILENAME = "config.json"
+MANIFEST_URL = "https://raw.githubusercontent.com/ThatWeirdGuy259/ViolaLauncher/main/latest.json"
+EXE_NAME = "ViolaLauncher.exe"
+CLI_EXE_NAME = "ViolaCLI.exe"
+STAGING_DIR = ".viola-update-staging"
+BACKUP_DIR = ".viola-update-backup"
+OLD_SUFFIX = ".old"
+NEW_SUFFIX = ".new"
+
+def sha256sum(data):
+    h = hashlib.sha256()
+    h.update(data)
+    return h.hexdigest()
 
-def get_app_dir():
-    """Return a writable folder for updates and config."""
+def file_sha256(path, block=1024 * 1024):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(block), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def install_dir():
+    """Folder holding the launcher executable (the source folder when not frozen)."""
     if getattr(sys, "frozen", False):
-        path = os.path.join(os.getenv("LOCALAPPDATA") or os.path.expanduser("~"), APP_NAME)
-        os.makedirs(path, exist_ok=True)
-        return path
+        return os.path.dirname(sys.executable)
     return os.path.dirname(os.path.abspath(__file__))
 
-def config_path():
-    return os.path.join(get_app_dir(), CONFIG_FILENAME)
+def running_executable():
+    """The exe that cannot be overwritten while we run (None when not frozen)."""
+    return sys.executable if getattr(sys, "frozen", False) else None
+
+# ---------------------- Apply Engine ----------------------
+class UpdateError(Exception):
+    pass
+
+def verify_payload(zip_path, expected_sha256=None):
+    """Check the download against the manifest hash and every member CRC."""
+    if expected_sha256:
+        actual = file_sha256(zip_path)
+        if actual.lower() != expected_sha256.strip().lower():
+            raise UpdateError(f"sha256 mismatch: expected {expected_sha256.lower()}, got {actual}")
+    try:
+        with zipfile.ZipFile(zip_path) as zf:
+            bad = zf.testzip()
+    except zipfile.BadZipFile as e:
+        raise UpdateError(f"not a valid update archive: {e}")
+    if bad:
+        raise UpdateError(f"corrupt member in update archive: {bad}")
+
+def stage_payload(zip_path, staging):
+    """Extract the archive into staging (same volume as the install). Returns (relative paths, bytes)."""
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    files = []
+    total = 0
+    with zipfile.ZipFile(zip_path) as zf:
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            target = os.path.normpath(os.path.join(staging, info.filename))
+            if os.path.isabs(info.filename) or not target.startswith(staging + os.sep):
+                raise UpdateError(f"unsafe path in update archive: {info.filename}")
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with zf.open(info) as src, open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst, 1024 * 1024)
+            mode = info.external_attr >> 16
+            if mode and os.name != "nt":
+                os.chmod(target, mode & 0o777)
+            files.append(os.path.relpath(target, staging))
+            total += info.file_size
+    if not files:
+        raise UpdateError("update archive is empty")
+    return files, total
+
+def _exe_paths(running_exe):
+    """Normalized paths of running_exe: None, one path, or a list of paths."""
+    if not running_exe:
+        return set()
+    if isinstance(running_exe, str):
+        running_exe = [running_exe]
+    return {os.path.normcase(os.path.abspath(p)) for p in running_exe if p}
 
-def read_json(path, default=None):
+def swap_files(staging, dest, files, running_exe=None):
+    """
+    Move staged files into dest with os.replace. Replaced files go to a backup
+    folder and are restored if any move fails. Running exes (running_exe is a
+    path or a list) are renamed aside (Windows allows that); if even that is
+    refused, the new file is left as <exe>.new for the restart helper.
+    Returns the list of (new, target) pending.
+    """
+    backup = os.path.join(dest, BACKUP_DIR)
+    shutil.rmtree(backup, ignore_errors=True)
+    running = _exe_paths(running_exe)
+    done = []      # (target, replaced_path or None)
+    pending = []
     try:
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
+        for rel in files:
+            staged = os.path.join(staging, rel)
+            target = os.path.join(dest, rel)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            aside = None
+            if os.path.exists(target):
+                if os.path.normcase(os.path.abspath(target)) in running:
+                    aside = target + OLD_SUFFIX
+                    try:
+                        if os.path.exists(aside):
+                            os.remove(aside)
+                        os.replace(target, aside)
+                    except OSError:
+                        os.replace(staged, target + NEW_SUFFIX)
+                        pending.append((target + NEW_SUFFIX, target))
+                        continue
+                else:
+                    aside = os.path.join(backup, rel)
+                    os.makedirs(os.path.dirname(aside), exist_ok=True)
+                    os.replace(target, aside)
+            done.append((target, aside))
+            os.replace(staged, target)
     except Exception:
-        pass
-    return default if default is not None else {}
+        for target, aside in reversed(done):
+            try:
+                if aside:
+                    os.replace(aside, target)
+                elif os.path.exists(target):
+                    os.remove(target)
+            except OSError as e:
+                print(f"[Updater] Rollback failed for {target}: {e}")
+        for new, _ in pending:
+            try:
+                os.remove(new)
+            except OSError:
+                pass
+        raise
+    shutil.rmtree(backup, ignore_errors=True)
+    return pending
 
-def write_json(path, data):
+def stage_bundle(bundle_path, staging, progress_callback=None):
+    """
+    Extract an offline bundle into staging. Entries are hashed and written
+    straight from the memory-mapped bundle in one pass. Returns (relative paths, bytes).
+    """
+    from update_bundle import Bundle, BundleError
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
     try:
-        os.makedirs(os.path.dirname(path), exist_ok=True)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
-        return True
-    except Exception as e:
-        print("Failed to write config:", e)
-        return False
+        with Bundle(bundle_path) as bundle:
+            total = bundle.total_bytes or 1
+            done = [0, -1]
 
-def sha256sum(data):
-    h = hashlib.sha256()
-    h.update(data)
-    return h.hexdigest()
+            def progress(n):
+                done[0] += n
+                pct = min(100, done[0] * 100 // total)
+                if progress_callback and pct != done[1]:
+                    done[1] = pct
+                    progress_callback(pct)
+            return bundle.extract(staging, progress)
+    except BundleError as e:
+        raise UpdateError(str(e))
+
+def apply_update(zip_path, dest=None, expected_sha256=None, running_exe=None, version=None, progress_callback=None):
+    """
+    Verify, stage and atomically install an update archive (zip or offline
+    bundle) in-process. zip_path may also be a folder already staged and
+    verified by stage_remote_update. running_exe is the running exe, or a list
+    of them, that must be renamed aside instead of replaced. Returns a report
+    with timings; raises UpdateError if nothing was changed.
+    """
+    from update_bundle import is_bundle
+    dest = dest or install_dir()
+    if running_exe is None:
+        running_exe = running_executable()
+    staged = os.path.isdir(zip_path)
+    bundle = not staged and is_bundle(zip_path)
+    t0 = time.perf_counter()
+    if not staged and not bundle:
+        verify_payload(zip_path, expected_sha256)
+    elif bundle and expected_sha256 and file_sha256(zip_path) != expected_sha256.strip().lower():
+        raise UpdateError("sha256 mismatch for update bundle")
+    t1 = time.perf_counter()
+    staging = zip_path if staged else os.path.join(dest, STAGING_DIR)
+    try:
+        if staged:
+            files = [os.path.relpath(os.path.join(root, f), staging) for root, _, names in os.walk(staging) for f in names]
+            nbytes = sum(os.path.getsize(os.path.join(staging, f)) for f in files)
+        elif bundle:
+            # Per-entry hashes are checked while staging
+            files, nbytes = stage_bundle(zip_path, staging, progress_callback)
+        else:
+            files, nbytes = stage_payload(zip_path, staging)
+        t2 = time.perf_counter()
+        pending = swap_files(staging, dest, files, running_exe)
+        t3 = time.perf_counter()
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    if version:
+        cfg = read_json(config_path(), {})
+        cfg["installed_version"] = version
+        write_json(config_path(), cfg)
+    targets = {os.path.normcase(os.path.abspath(os.path.join(dest, f))) for f in files}
+    replaced = sorted(_exe_paths(running_exe) & targets)
+    return {
+        "files": len(files),
+        "bytes": nbytes,
+        "pending": pending,
+        "running_replaced": replaced,
+        "restart_required": bool(replaced),
+        "verify_seconds": t1 - t0,
+        "stage_seconds": t2 - t1,
+        "swap_seconds": t3 - t2,
+        "seconds": t3 - t0,
+    }
+
+def remove_old_executables(dest=None):
+    """Delete the <exe>.old files an update renamed aside; one still running is left for next time."""
+    dest = dest or install_dir()
+    exe = running_executable()
+    paths = {os.path.join(dest, name) + OLD_SUFFIX for name in (EXE_NAME, CLI_EXE_NAME)}
+    if exe:
+        paths.add(exe + OLD_SUFFIX)
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def cleanup_previous_update(dest=None):
+    """Remove files left behind by the last update (the renamed-aside exes, stale staging)."""
+    dest = dest or install_dir()
+    remove_old_executables(dest)
+    for path in [os.path.join(dest, STAGING_DIR), os.path.join(dest, BACKUP_DIR)]:
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            elif os.path.exists(path):
+                os.remove(path)
+        except OSError:
+            pass
 
-def check_and_update(progress_callback=None):
-    """Check for updates and apply them if needed."""
+def spawn_restart_helper(pid, exe, pending=(), args=("--skip-update",)):
+    """
+    Start a tiny shell helper that waits for pid to exit, moves pending
+    <file>.new files into place and starts exe again. No Python is involved,
+    so the helper is not a second launcher.
+    """
+    fd, script = tempfile.mkstemp(prefix="viola-restart-", suffix=".cmd" if os.name == "nt" else ".sh")
+    if os.name == "nt":
+        lines = ["@echo off", ":wait",
+                 f'tasklist /FI "PID eq {pid}" 2>nul | find "{pid}" >nul && (timeout /t 1 /nobreak >nul & goto wait)']
+        lines += [f'move /y "{new}" "{target}" >nul' for new, target in pending]
+        lines += [f'start "" "{exe}" ' + " ".join(args), 'del "%~f0"']
+        with os.fdopen(fd, "w") as f:
+            f.write("\r\n".join(lines) + "\r\n")
+        subprocess.Popen(["cmd", "/c", script], creationflags=0x00000008 | 0x08000000, close_fds=True)
+    else:
+        import shlex
+        q = shlex.quote
+        lines = ["#!/bin/sh", f"while kill -0 {pid} 2>/dev/null; do sleep 0.2; done"]
+        lines += [f"mv -f {q(new)} {q(target)}" for new, target in pending]
+        lines += [" ".join([q(exe)] + [q(a) for a in args]) + " &", 'rm -f -- "$0"']
+        with os.fdopen(fd, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        subprocess.Popen(["sh", script], start_new_session=True, close_fds=True)
+    return script
+
+def stage_remote_update(url, staging, dest=None, member_sha256=None, progress_callback=None):
+    """
+    Download only the members of the release zip at url that differ from the
+    installed files, verified, into staging. Raises remote_zip.RangeNotSupported
+    when the server cannot serve ranges. Returns download statistics.
+    """
+    from remote_zip import RemoteZip, RemoteZipError
+    dest = dest or install_dir()
+    t0 = time.perf_counter()
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
     try:
-        r = requests.get(MANIFEST_URL, timeout=10)
+        rz = RemoteZip(url)
+        changed = rz.changed_members(dest)
+        files, nbytes = rz.extract(changed, staging, progress_callback, member_sha256)
+    except RemoteZipError as e:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise UpdateError(str(e))
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return {"source": url, "mode": "ranges", "bytes": rz.bytes_downloaded, "requests": rz.requests,
+            "archive_bytes": rz.size, "changed": len(files), "members": len(rz.members),
+            "seconds": time.perf_counter() - t0}
+
+def apply_remote_update(url, dest=None, member_sha256=None, running_exe=None, version=None, progress_callback=None):
+    """stage_remote_update followed by the usual swap. Returns the apply report with "download" stats."""
+    dest = dest or install_dir()
+    staging = os.path.join(dest, STAGING_DIR)
+    download = stage_remote_update(url, staging, dest, member_sha256, progress_callback)
+    report = apply_update(staging, dest, None, running_exe, version)
+    report["download"] = download
+    return report
+
+def installed_version(default="0.0.0"):
+    return read_json(config_path(), {}).get("installed_version", default)
+
+def fetch_manifest(url=MANIFEST_URL, timeout=10):
+    """Download and parse latest.json (shared with any concurrent check of the same url)."""
+    import http_client
+    return http_client.get_json(url, timeout=timeout)
+
+def download_payload(url, dest, expected_sha256=None, progress_callback=None, peers=None):
+    """
+    Download an update archive to dest, from a LAN peer first when a peer
+    cache is given. Returns {"source", "bytes", "seconds"}.
+    """
+    t0 = time.perf_counter()
+    if peers is not None and expected_sha256:
+        peer = peers.fetch(expected_sha256, dest)
+        if peer:
+            return {"source": f"{peer[0]}:{peer[1]}", "bytes": os.path.getsize(dest), "seconds": time.perf_counter() - t0}
+    import http_client
+    with http_client.stream(url) as r:
         r.raise_for_status()
-        manifest = r.json()
-    except Exception as e:
-        print(f"[Updater] Could not check for updates: {e}")
-        return False
+        total = int(r.headers.get("content-length", 0))
+        done = 0
+        with open(dest, "wb") as f:
+            for chunk in r.iter_content(chunk_size=256 * 1024):
+                f.write(chunk)
+                done += len(chunk)
+                if progress_callback and total:
+                    progress_callback(min(100, int(done * 100 / total)))
+    return {"source": url, "bytes": done, "seconds": time.perf_counter() - t0}
+
+def check_and_update(progress_callback=None, manifest=None, dest=None, peers=None, running_exe=None, bundle=None):
+    """
+    Check for updates and apply them if needed. Returns a report dict, or False
+    when nothing was installed. latest.json either names one archive ("url",
+    "sha256") or lists loose "files". With bundle (an offline bundle path) no
+    network is used at all. A peer cache is asked for the archive before the
+    origin, and keeps it afterwards for LAN neighbours.
+    """
+    if bundle is not None:
+        return apply_bundle(bundle, progress_callback, dest, running_exe)
+
+    if manifest is None:
+        try:
+            manifest = fetch_manifest()
+        except Exception as e:
+            print(f"[Updater] Could not check for updates: {e}")
+            return False
 
     latest_version = manifest.get("version", "")
     if not latest_version:
@@ -55,16 +356,46 @@ def check_and_update(progress_callback=None):
         return False
 
     # Load installed version
-    cfg = read_json(config_path(), {})
-    installed_version = cfg.get("installed_version", "0.0.0")
+    current = installed_version()
 
-    if latest_version == installed_version:
-        print(f"[Updater] No update needed. Installed version: {installed_version}")
+    if latest_version == current:
+        print(f"[Updater] No update needed. Installed version: {current}")
         return False
 
-    print(f"[Updater] Updating from {installed_version} to {latest_version}...")
+    print(f"[Updater] Updating from {current} to {latest_version}...")
+
+    sharing = peers is not None and bool(manifest.get("sha256"))
+    if manifest.get("url") and manifest.get("members") and not sharing:
+        # Per-member hashes let us fetch only what changed with range requests. With a
+        # peer cache the whole archive is fetched instead (from a neighbour first) so
+        # this instance can serve it to the rest of the LAN.
+        from remote_zip import RangeNotSupported
+        try:
+            report = apply_remote_update(manifest["url"], dest, manifest["members"], running_exe,
+                                         latest_version, progress_callback)
+            report.update(version=latest_version, previous=current)
+            print(f"[Updater] Update complete! Fetched {report['download']['changed']} changed files, "
+                  f"{report['download']['bytes']} of {report['download']['archive_bytes']} bytes")
+            return report
+        except (RangeNotSupported, UpdateError, OSError) as e:
+            print(f"[Updater] Partial update unavailable ({e}); downloading the whole archive")
+
+    if manifest.get("url"):
+        tmp = os.path.join(tempfile.gettempdir(), f"viola_update_{latest_version}.zip")
+        try:
+            download = download_payload(manifest["url"], tmp, manifest.get("sha256"), progress_callback, peers)
+            report = apply_update(tmp, dest, manifest.get("sha256"), running_exe, latest_version)
+            if peers is not None and manifest.get("sha256"):
+                peers.add(tmp, manifest["sha256"], move=True)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        report.update(version=latest_version, previous=current, download=download)
+        print("[Updater] Update complete!")
+        return report
 
     # Download and replace files
+    updated = 0
     for file_info in manifest.get("files", []):
         name = file_info.get("name")
         url = file_info.get("url")
@@ -73,15 +404,19 @@ def check_and_update(progress_callback=None):
             continue
 
         try:
-            data = requests.get(url, timeout=30).content
+            import http_client
+            r = http_client.get(url)
+            r.raise_for_status()
+            data = r.content
             if sha256sum(data) != expected_hash:
                 print(f"[Updater] Hash mismatch for {name}! Skipping...")
                 continue
 
-            target_path = os.path.join(get_app_dir(), name)
+            target_path = os.path.join(dest or install_dir(), name)
             os.makedirs(os.path.dirname(target_path), exist_ok=True)
             with open(target_path, "wb") as f:
                 f.write(data)
+            updated += 1
 
             if progress_callback:
                 progress_callback(name)
@@ -91,17 +426,40 @@ def check_and_update(progress_callback=None):
             print(f"[Updater] Failed to update {name}: {e}")
 
     # Update version in config
+    cfg = read_json(config_path(), {})
     cfg["installed_version"] = latest_version
     write_json(config_path(), cfg)
     print("[Updater] Update complete!")
+    return {"files": updated, "version": latest_version, "previous": current, "restart_required": False}
 
-    # Relaunch the launcher without triggering another update
-    launcher_path = os.path.join(get_app_dir(), "ViolaLauncher.exe")
-    if os.path.exists(launcher_path):
-        subprocess.Popen([launcher_path, "--skip-update"])
-        sys.exit(0)
+def apply_bundle(bundle_path, progress_callback=None, dest=None, running_exe=None, force=False):
+    """Install an offline bundle unless it holds the installed version. Returns a report or False."""
+    from update_bundle import BundleError, read_version
+    try:
+        latest_version = read_version(bundle_path)
+    except (BundleError, OSError) as e:
+        print(f"[Updater] Cannot read bundle: {e}")
+        return False
+    current = installed_version()
+    if latest_version == current and not force:
+        print(f"[Updater] No update needed. Installed version: {current}")
+        return False
+    print(f"[Updater] Updating from {current} to {latest_version} (offline bundle)...")
+    report = apply_update(bundle_path, dest, None, running_exe, latest_version or None, progress_callback)
+    report.update(version=latest_version, previous=current, download={"source": bundle_path, "bytes": 0, "seconds": 0.0})
+    print("[Updater] Update complete!")
+    return report
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1].lower().endswith((".zip", ".vbundle")):
+        # updater.py UPDATE.zip|UPDATE.vbundle [INSTALL_DIR] [SHA256]
+        args = sys.argv[1:] + [None, None]
+        report = apply_update(args[0], args[1], args[2])
+        print(f"[Updater] Applied {report['files']} files in {report['seconds'] * 1000:.0f} ms")
     # Only run updater if --skip-update not provided
-    if "--skip-update" not in sys.argv:
-        check_and_update()
+    elif "--skip-update" not in sys.argv:
+        report = check_and_update()
+        # Relaunch the launcher without triggering another update
+        launcher_path = os.path.join(install_dir(), EXE_NAME)
+        if report and os.path.exists(launcher_path):
+            subprocess.Popen([launcher_path, "--skip-update"])
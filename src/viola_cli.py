@@ -0,0 +1,266 @@
+"""
+Viola Launcher - Headless command line
+Scriptable check/update/verify/launch/status/metrics for fleets of machines. Shares
+the updater, config and launch pipeline code with the GUI but never imports
+PyQt6, so a cold start costs an interpreter and a few stdlib modules.
+
+    viola_cli.py check|update|verify|launch|status|metrics [options] [--json]
+
+Exit codes: 0 ok, 1 error, 2 usage, 3 update available (check),
+4 verification failed (verify).
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+import updater
+from launcher_config import app_dir, config_path, read_json
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_UPDATE_AVAILABLE = 3
+EXIT_VERIFY_FAILED = 4
+
+LAUNCHER_PROCESS = updater.EXE_NAME
+
+
+def _peers():
+    from peer_cache import PeerCache
+    try:
+        return PeerCache.from_config()
+    except OSError:
+        return None
+
+
+# ---------------------- Commands ----------------------
+def cmd_check(args):
+    manifest = updater.fetch_manifest(args.manifest or updater.MANIFEST_URL)
+    latest = str(manifest.get("version", "")).strip()
+    current = updater.installed_version()
+    available = bool(latest) and latest != current
+    result = {"installed": current, "latest": latest, "update_available": available,
+              "url": manifest.get("url"), "sha256": manifest.get("sha256")}
+    return (EXIT_UPDATE_AVAILABLE if available else EXIT_OK), result
+
+
+def cmd_update(args):
+    # A running GUI launcher is swapped like our own exe and restarted once it exits
+    exe = os.path.join(args.dest or updater.install_dir(), LAUNCHER_PROCESS)
+    pid = _launcher_pid()
+    running_exe = [p for p in (exe if pid else None, updater.running_executable()) if p] or None
+    if args.bundle:
+        report = updater.check_and_update(dest=args.dest, running_exe=running_exe, bundle=args.bundle)
+    elif args.zip:
+        report = updater.apply_update(args.zip, args.dest, args.sha256, running_exe, args.version)
+    else:
+        manifest = updater.fetch_manifest(args.manifest or updater.MANIFEST_URL)
+        report = updater.check_and_update(manifest=manifest, dest=args.dest, peers=_peers(), running_exe=running_exe)
+        if report:
+            import http_client
+            report["http"] = http_client.stats()
+    if not report:
+        return EXIT_OK, {"updated": False, "installed": updater.installed_version()}
+    report["updated"] = True
+    report["installed"] = updater.installed_version()
+    gui_replaced = os.path.normcase(os.path.abspath(exe)) in report.get("running_replaced", ())
+    if pid and gui_replaced and args.restart:
+        report["restart_helper"] = updater.spawn_restart_helper(pid, exe, report.get("pending", []))
+    return EXIT_OK, report
+
+
+def cmd_verify(args):
+    """Verify an archive (with --sha256), or the health of the installation."""
+    if args.path:
+        from update_bundle import Bundle, BundleError, is_bundle
+        try:
+            if is_bundle(args.path):
+                if args.sha256 and updater.file_sha256(args.path) != args.sha256.strip().lower():
+                    raise BundleError("sha256 mismatch for update bundle")
+                with Bundle(args.path) as bundle:
+                    bundle.verify()
+            else:
+                updater.verify_payload(args.path, args.sha256)
+        except (updater.UpdateError, BundleError, OSError) as e:
+            return EXIT_VERIFY_FAILED, {"ok": False, "path": args.path, "error": str(e)}
+        return EXIT_OK, {"ok": True, "path": args.path, "sha256": updater.file_sha256(args.path)}
+
+    dest = args.dest or updater.install_dir()
+    exe = os.path.join(dest, LAUNCHER_PROCESS)
+    problems = []
+    leftovers = [name for name in (updater.STAGING_DIR, updater.BACKUP_DIR) if os.path.exists(os.path.join(dest, name))]
+    leftovers += [f for f in os.listdir(dest) if f.endswith(updater.NEW_SUFFIX)] if os.path.isdir(dest) else []
+    if leftovers:
+        problems.append("interrupted update: " + ", ".join(leftovers))
+    if os.path.exists(config_path()):
+        try:
+            with open(config_path(), "r", encoding="utf-8") as f:
+                json.load(f)
+        except (OSError, ValueError):
+            problems.append("config.json is unreadable")
+    result = {"ok": not problems, "install_dir": dest, "problems": problems,
+              "exe": exe if os.path.exists(exe) else None}
+    if result["exe"]:
+        result["exe_sha256"] = updater.file_sha256(exe)
+    return (EXIT_OK if not problems else EXIT_VERIFY_FAILED), result
+
+
+def cmd_launch(args):
+    from launch_pipeline import build_launch_pipeline, default_spawner, find_minecraft_install
+
+    cfg = read_json(config_path(), {})
+    spawner = default_spawner(cfg.get("launch_command"), cfg.get("launch_process"), find_minecraft_install)
+    tasks = []
+    if not args.no_backup:
+        import world_backup
+        if world_backup.backup_enabled():
+            # No GUI stays around to wait for a background process, so back up as a stage
+            tasks.append(("world_backup", lambda ctx, cancel: world_backup.backup()))
+    stages = []
+    pipeline = build_launch_pipeline(
+        spawner, tasks, listener=lambda name, state, seconds, detail: stages.append((name, state, seconds)),
+        confirm_timeout=args.timeout,
+    )
+    ok, ctx, timings = pipeline.run()
+    result = {"ok": ok, "error": ctx.get("error"),
+              "timings_ms": {k: round(v * 1000, 1) for k, v in timings.items()},
+              "stages": {name: state for name, state, _ in stages if state != "running"}}
+    if ok:
+        import metrics
+        metrics.set_version(updater.installed_version())
+        metrics.record("launch.total_ms", timings["total"] * 1000)
+    return (EXIT_OK if ok else EXIT_ERROR), result
+
+
+def cmd_status(args):
+    from launch_pipeline import process_running, MINECRAFT_PROCESS
+
+    result = {
+        "installed": updater.installed_version(),
+        "install_dir": updater.install_dir(),
+        "app_dir": app_dir(),
+        "config": config_path(),
+        "launcher_running": process_running(LAUNCHER_PROCESS),
+        "game_running": process_running(MINECRAFT_PROCESS),
+    }
+    try:
+        import world_backup
+        snaps = world_backup.BackupRepo(world_backup.repo_dir()).snapshots()
+        result["last_backup"] = snaps[-1] if snaps else None
+    except Exception:
+        result["last_backup"] = None
+    return EXIT_OK, result
+
+
+def cmd_metrics(args):
+    """p50/p95/p99 per metric and launcher version from the local metrics history."""
+    import metrics
+    since = time.time() - args.days * 86400 if args.days else None
+    stats = metrics.summarize(metrics.all_records(args.file), args.metric, since)
+    rows = [dict(metric=m, version=v or "-", n=s["n"], **{p: round(s[p], 2) for p in ("p50", "p95", "p99")})
+            for (m, v), s in stats.items()]
+    return EXIT_OK, {"metrics": rows}
+
+
+def _launcher_pid():
+    try:
+        import psutil
+        for p in psutil.process_iter(["name", "pid"]):
+            if (p.info["name"] or "").lower() == LAUNCHER_PROCESS.lower():
+                return p.info["pid"]
+    except ImportError:
+        pass
+    return 0
+
+
+COMMANDS = {
+    "check": cmd_check,
+    "update": cmd_update,
+    "verify": cmd_verify,
+    "launch": cmd_launch,
+    "status": cmd_status,
+    "metrics": cmd_metrics,
+}
+
+
+def _print_text(command, result):
+    for key, value in result.items():
+        if isinstance(value, dict):
+            value = ", ".join(f"{k}={v}" for k, v in value.items())
+        elif isinstance(value, list) and value and isinstance(value[0], dict):
+            print(key)
+            for item in value:
+                print("  " + ", ".join(f"{k}={v}" for k, v in item.items()))
+            continue
+        elif isinstance(value, list):
+            value = ", ".join(str(v) for v in value) or "-"
+        print(f"{key:<18} {value}")
+
+
+# ---------------------- Entry Point ----------------------
+def build_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true", help="print machine-readable JSON")
+    parser = argparse.ArgumentParser(prog="viola", description="Viola Launcher headless commands")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("check", parents=[common], help="compare the installed version with latest.json")
+    p.add_argument("--manifest", help="manifest URL (default: the GitHub latest.json)")
+
+    p = sub.add_parser("update", parents=[common], help="download and install the latest release")
+    p.add_argument("--manifest", help="manifest URL")
+    p.add_argument("--zip", help="install this archive instead of downloading")
+    p.add_argument("--bundle", help="install an offline .vbundle (no network needed)")
+    p.add_argument("--sha256", help="expected sha256 of --zip")
+    p.add_argument("--version", help="version to record for --zip")
+    p.add_argument("--dest", help="install folder (default: next to the launcher exe)")
+    p.add_argument("--no-restart", dest="restart", action="store_false",
+                   help="do not restart a running launcher after replacing it")
+
+    p = sub.add_parser("verify", parents=[common], help="verify an update archive, bundle or the installation")
+    p.add_argument("path", nargs="?", help="update archive or offline bundle to verify")
+    p.add_argument("--sha256", help="expected sha256 of the archive")
+    p.add_argument("--dest", help="install folder to check")
+
+    p = sub.add_parser("launch", parents=[common], help="launch Minecraft and wait until it runs")
+    p.add_argument("--no-backup", action="store_true", help="skip the pre-launch world backup")
+    p.add_argument("--timeout", type=float, default=30.0, help="seconds to wait for the game process")
+
+    sub.add_parser("status", parents=[common], help="installed version, paths and running processes")
+
+    p = sub.add_parser("metrics", parents=[common], help="p50/p95/p99 per metric and launcher version")
+    p.add_argument("--metric", help="only metrics starting with this prefix")
+    p.add_argument("--days", type=float, help="only samples from the last N days")
+    p.add_argument("--file", help="metrics file (default: metrics.bin in the app dir)")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return EXIT_USAGE if e.code else EXIT_OK
+    t0 = time.perf_counter()
+    # A self-update renamed our previous exe aside; it is no longer running now
+    updater.remove_old_executables()
+    try:
+        code, result = COMMANDS[args.command](args)
+    except Exception as e:
+        code, result = EXIT_ERROR, {"error": f"{type(e).__name__}: {e}"}
+    result["command"] = args.command
+    result["elapsed_seconds"] = round(time.perf_counter() - t0, 4)
+    if args.json:
+        print(json.dumps(result, indent=2, default=str))
+    else:
+        _print_text(args.command, result)
+    return code
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
+    sys.exit(main())
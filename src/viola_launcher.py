@@ -6,115 +6,253 @@ Handles assets, configuration, updater, hotkeys, and overlay menu.
 
 import sys
 import os
-import glob
-import json
-import requests
-import zipfile
+import gc
 import tempfile
-import subprocess
+import bisect
 import threading
 import time
 from datetime import datetime
 
+if __name__ == "__main__":
+    # Hand off to an already running launcher before importing the GUI stack
+    from single_instance import hand_off_or_continue
+    hand_off_or_continue()
+
 # PyQt6 imports
-from PyQt6.QtWidgets import QApplication, QWidget, QLabel, QPushButton, QLineEdit
-from PyQt6.QtGui import QPixmap, QFont, QPainterPath, QRegion, QCursor, QIcon, QPainter, QKeySequence
-from PyQt6.QtCore import Qt, QRectF, QThread, pyqtSignal, QTimer
+from PyQt6.QtWidgets import (
+    QApplication, QWidget, QLabel, QPushButton, QSystemTrayIcon, QMenu, QListWidget, QListWidgetItem,
+)
+from PyQt6.QtGui import QPainterPath, QRegion, QCursor, QIcon, QPainter, QAction, QPixmap
+from PyQt6.QtCore import Qt, QRectF, QSize, QThread, pyqtSignal, QTimer, QEvent, QObject
 
 # Import updater module (must be included via --add-data)
-from updater import check_and_update
+from updater import (
+    MANIFEST_URL, STAGING_DIR, apply_update, cleanup_previous_update, install_dir, running_executable,
+    spawn_restart_helper, stage_remote_update,
+)
+import tracing
+import metrics
+import theme
+import http_client
+from launcher_config import resource_dir, config_path, read_json, write_json
+from image_cache import load_pixmap, cache as pixmap_cache, write_thumbnail
+from single_instance import InstanceServer, forward_to_running
+from process_stats import rss_bytes, format_mb, CpuMeter, trim_working_set
+from world_backup import backup_enabled, start_background_backup
+from world_index import ICON_NAME, WorldIndex, prune_thumbnails, thumbnail_path
+from launch_pipeline import build_launch_pipeline, default_spawner, find_minecraft_install
+from presence import PresenceService, presence_client_id
+from peer_cache import PeerCache
+from resource_monitor import ResourceMonitor, SAMPLE_INTERVAL, monitor_enabled
+from overlay_plugins import ModuleRegistry
+from input_backend import KeyboardBackend
+from keymap import (
+    Keymap, KeyMatcher, KeymapError, MODIFIER_KEYS, NAMED_KEYS, CTRL, SHIFT, ALT, META,
+    parse_binding, format_binding, bindings_from_config, module_action,
+)
 
 # ---------------------- Updater Thread ----------------------
 class UpdateThread(QThread):
     progress = pyqtSignal(int)
-    finished = pyqtSignal(bool, str)
+    installing = pyqtSignal()
+    finished = pyqtSignal(bool, object)       # success, apply_update report or error message
 
-    def __init__(self, url, dest):
+    def __init__(self, url, dest, sha256=None, peers=None, members=None, version=None):
         super().__init__()
         self.url = url
         self.dest = dest
+        self.sha256 = sha256
+        self.peers = peers
+        self.members = members
+        self.version = version
 
     def run(self):
-        """Download update in a separate thread and emit progress signals."""
+        """Download and install the update off the UI thread, emitting progress and the install report."""
         try:
-            r = requests.get(self.url, stream=True, timeout=30)
-            r.raise_for_status()
-            total = int(r.headers.get("content-length", 0))
-            downloaded = 0
-            with open(self.dest, "wb") as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total > 0:
-                            percent = int(downloaded / total * 100)
-                            self.progress.emit(min(max(percent, 0), 100))
-            if total == 0:
-                self.progress.emit(100)
-            self.finished.emit(True, self.dest)
+            payload = self.download()
         except Exception as e:
             print("Update Finished Error:", e)
             self.finished.emit(False, str(e))
+            return
+        if not os.path.exists(payload):
+            self.finished.emit(False, f"downloaded update is missing: {payload}")
+            return
+        self.installing.emit()
+        try:
+            # payload is the staged folder after a partial (range) download
+            report = apply_update(payload, expected_sha256=self.sha256, version=self.version)
+            if self.peers and self.sha256 and os.path.isfile(payload):
+                # Verified: keep it so LAN peers can fetch this release from us
+                self.peers.add(payload, self.sha256, move=True)
+        except Exception as e:
+            self.finished.emit(False, str(e))
+            return
+        finally:
+            try:
+                os.remove(payload)
+            except OSError:
+                pass
+        self.finished.emit(True, report)
+
+    def download(self):
+        """Fetch the payload; returns the archive path or the staged folder."""
+        if self.peers and self.sha256:
+            # A LAN neighbour with the same verified payload saves the GitHub download
+            t0 = time.perf_counter()
+            try:
+                peer = self.peers.fetch(self.sha256, self.dest, self.progress.emit)
+            except Exception as e:
+                peer = None
+                print("[Peers] Lookup failed:", e)
+            if peer:
+                print(f"[Peers] Update fetched from {peer[0]}:{peer[1]}")
+                # Throughput including discovery, comparable with update.download_mbps
+                metrics.record("update.peer_mbps",
+                               os.path.getsize(self.dest) / 2**20 / max(time.perf_counter() - t0, 1e-6))
+                self.progress.emit(100)
+                return self.dest
+        if self.members and not (self.peers and self.sha256):
+            # Fetch only the changed members with range requests. With a peer cache the
+            # whole archive is downloaded instead, so it can be shared on the LAN.
+            staging = os.path.join(install_dir(), STAGING_DIR)
+            try:
+                stats = stage_remote_update(self.url, staging, member_sha256=self.members,
+                                            progress_callback=self.progress.emit)
+                print(f"[Updater] Fetched {stats['changed']} changed files, {format_mb(stats['bytes'])} of "
+                      f"{format_mb(stats['archive_bytes'])} in {stats['requests']} requests")
+                metrics.record("update.partial_bytes", stats["bytes"])
+                self.progress.emit(100)
+                return staging
+            except Exception as e:
+                print(f"[Updater] Partial update unavailable ({e}); downloading the whole archive")
+        sp = tracing.span("update.download", url=self.url)
+        t0 = time.perf_counter()
+        with sp:
+            with http_client.stream(self.url) as r:
+                r.raise_for_status()
+                total = int(r.headers.get("content-length", 0))
+                downloaded = 0
+                with open(self.dest, "wb") as f:
+                    for chunk in r.iter_content(chunk_size=8192):
+                        if chunk:
+                            f.write(chunk)
+                            downloaded += len(chunk)
+                            if total > 0:
+                                percent = int(downloaded / total * 100)
+                                self.progress.emit(min(max(percent, 0), 100))
+            if total == 0:
+                self.progress.emit(100)
+            sp.set("bytes", downloaded)
+        metrics.record("update.download_mbps", downloaded / 2**20 / max(time.perf_counter() - t0, 1e-6))
+        return self.dest
 
 
-# ---------------------- Paths & Config ----------------------
-CONFIG_FILENAME = "config.json"
+# ---------------------- Launch Thread ----------------------
+class LaunchThread(QThread):
+    stage_changed = pyqtSignal(str, str, float, object)   # stage, state, seconds, detail
+    finished = pyqtSignal(bool, str)
 
-def resource_dir():
-    """
-    Return folder where assets are located.
-    Works in VS Codium and PyInstaller _MEIPASS.
-    """
-    return getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
+    def __init__(self, pipeline):
+        super().__init__()
+        self.pipeline = pipeline
+        self.pipeline.listener = self.stage_changed.emit
+        self.timings = {}
 
-def app_dir():
-    """
-    Return writable folder for launcher files and config.
-    Uses %APPDATA%\ViolaLauncher on Windows for .exe compatibility.
-    """
-    if getattr(sys, "frozen", False):
-        path = os.path.join(os.getenv("APPDATA", os.path.expanduser("~")), "ViolaLauncher")
-        os.makedirs(path, exist_ok=True)
-        return path
-    return os.path.dirname(os.path.abspath(__file__))
-
-def config_path():
-    """Return full path to config.json"""
-    return os.path.join(app_dir(), CONFIG_FILENAME)
-
-def read_json(path, default=None):
-    """Read JSON file safely, return default if fails."""
-    try:
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-    except Exception:
-        pass
-    return default if default is not None else {}
-
-def write_json(path, data):
-    """Write JSON file safely."""
-    try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+    def cancel(self):
+        self.pipeline.cancel()
+
+    def run(self):
+        """Run the launch stages off the GUI thread; stage updates arrive as queued signals."""
+        ok, ctx, self.timings = self.pipeline.run()
+        self.finished.emit(ok, ctx.get("error", ""))
+
+
+class UpdateCheckThread(QThread):
+    result = pyqtSignal(object)
+
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+
+    def run(self):
+        """Fetch latest.json off the GUI thread; emits the parsed dict or the exception."""
+        t0 = time.perf_counter()
+        try:
+            data = http_client.get_json(self.url, timeout=5)
+            metrics.record("update.check_ms", (time.perf_counter() - t0) * 1000)
+        except Exception as e:
+            data = e
+        self.result.emit(data)
+
+
+class WorldLoadThread(QThread):
+    """Refresh the world index off the GUI thread; worlds arrive in small batches as they are known."""
+    batch = pyqtSignal(list)
+    done = pyqtSignal(dict)
+
+    BATCH_SIZE = 24
+    BATCH_SECONDS = 0.05
+
+    def __init__(self, index, thumb_pixels):
+        super().__init__()
+        self.index = index
+        self.thumb_pixels = thumb_pixels
+
+    def run(self):
+        if self.index is None:
+            self.index = WorldIndex()
+        width, height = self.thumb_pixels
+        pending = []
+        last = time.perf_counter()
+        written = 0
+
+        def on_world(world):
+            nonlocal last, written
+            thumb = thumbnail_path(world, width, height)
+            if thumb and not os.path.exists(thumb):
+                if write_thumbnail(os.path.join(world["path"], ICON_NAME), thumb, width, height):
+                    written += 1
+                else:
+                    thumb = None
+            world["thumbnail"] = thumb
+            pending.append(world)
+            now = time.perf_counter()
+            if len(pending) >= self.BATCH_SIZE or now - last >= self.BATCH_SECONDS:
+                self.batch.emit(pending[:])
+                pending.clear()
+                last = now
+
+        with tracing.span("worlds.scan") as sp:
+            worlds, stats = self.index.scan(on_world=on_world)
+            sp.set("worlds", stats["worlds"])
+            sp.set("reread", stats["reread"])
+        if pending:
+            self.batch.emit(pending)
+        stats["thumbnails"] = written
+        stats["pruned"] = prune_thumbnails(worlds, width, height)
+        self.done.emit(stats)
+
+
+# ---------------------- Config ----------------------
+def resident_mode_enabled():
+    """Return True if closing the window should hide to the tray instead of exiting."""
+    if "--resident" in sys.argv:
         return True
-    except Exception as e:
-        print("Failed to write config:", e)
+    return bool(read_json(config_path(), {}).get("resident_mode", False))
+
+def gameplay_mode_enabled():
+    """Return True if the launcher UI should be released while the game runs."""
+    if "--no-gameplay-mode" in sys.argv:
         return False
+    return bool(read_json(config_path(), {}).get("gameplay_mode", True))
 
 # ---------------------- Hotkey Handling ----------------------
 def normalize_hotkey(hk_str: str) -> str:
     """Normalize hotkey strings for consistency."""
-    mapping = {
-        "return": "enter",
-        "escape": "esc",
-        "backtick": "`",
-        "plus": "+",
-        "minus": "-",
-        "equals": "=",
-    }
-    s = (hk_str or "").strip().lower()
-    return mapping.get(s, s)
+    try:
+        return format_binding(parse_binding(hk_str))
+    except KeymapError:
+        return (hk_str or "").strip().lower()
 
 def load_hotkey():
     """Load hotkey from config, default to Right Shift."""
@@ -127,32 +265,166 @@ def save_hotkey(hk: str):
     cfg["modules_hotkey"] = hk.strip()
     write_json(config_path(), cfg)
 
-def hotkey_listener(toggle_callback, hk_display: str):
+def load_keymap(key_codes=None, actions=None):
+    """Compile every binding in config into a Keymap, reporting invalid and unhandled ones."""
+    km = Keymap(bindings_from_config(read_json(config_path(), {})), key_codes, actions)
+    for err in km.errors:
+        print("Invalid key binding:", err)
+    return km
+
+class HotkeyService:
     """
-    Listen for hotkey presses in a separate thread.
-    Requires 'keyboard' module.
+    Owns the single global keyboard hook and dispatches through the compiled keymap.
+    dispatch(action) runs on the input backend's thread, never the GUI thread.
+    The default backend requires the 'keyboard' module. actions, when given, are
+    the only actions bindings may name.
     """
-    try:
-        import keyboard
-    except ImportError:
-        print("Missing dependency: pip install keyboard")
-        return
-    hk = normalize_hotkey(hk_display)
-    print(f"[Viola Overlay] Listening for hotkey: {hk_display} (normalized: '{hk}')")
-    try:
-        keyboard.add_hotkey(hk, toggle_callback, suppress=False, trigger_on_release=False)
-    except Exception as e:
-        print("Failed to bind hotkey:", e)
-    while True:
-        time.sleep(0.25)
+
+    def __init__(self, dispatch, backend=None, actions=None):
+        self.dispatch = dispatch
+        self.backend = backend
+        self.actions = actions
+        self.matcher = KeyMatcher(Keymap({}))
+        self._started = False
+
+    def start(self):
+        if not self._started:
+            if self.backend is None:
+                try:
+                    self.backend = KeyboardBackend()
+                except ImportError:
+                    print("Missing dependency: pip install keyboard")
+                    return False
+            try:
+                self.backend.start(self._on_event)
+            except Exception as e:
+                print("Failed to hook keyboard:", e)
+                return False
+            self._started = True
+        self.reload()
+        return True
+
+    def stop(self):
+        if self._started:
+            self.backend.stop()
+            self._started = False
+
+    def reload(self, keymap=None):
+        """Recompile bindings from config (or install keymap) and swap them in."""
+        if not self._started:
+            return
+        km = keymap or load_keymap(self.backend.key_codes, self.actions)
+        self.matcher = KeyMatcher(km)
+        print(f"[Viola Overlay] Listening for hotkeys: {km.bindings}")
+
+    def _on_event(self, event):
+        action = self.matcher.feed(event.event_type == "down", event.scan_code)
+        if action is not None:
+            with tracing.span("hotkey.callback", action=action):
+                self.dispatch(action)
+
+
+class HotkeyBridge(QObject):
+    """
+    Carries hotkey actions from the input thread to the GUI thread. post() may be
+    called from any thread; handlers always run on the thread owning the bridge.
+    """
+    triggered = pyqtSignal(str)
+
+    def __init__(self, handlers, parent=None):
+        super().__init__(parent)
+        self.handlers = handlers
+        # Emitted from the hook thread, so Qt queues the call to the GUI event loop
+        self.triggered.connect(self._deliver)
+
+    def post(self, action):
+        self.triggered.emit(action)
+
+    def _deliver(self, action):
+        handler = self.handlers.get(action)
+        if handler is not None:
+            handler()
+
+# Qt key value -> keymap key name, built on first use
+_QT_KEY_NAMES = {}
+_QT_KEY_ALIASES = {
+    "Return": "enter", "Enter": "enter", "Escape": "esc", "Backtab": "tab",
+    "PageUp": "page up", "PageDown": "page down", "CapsLock": "caps lock",
+    "NumLock": "num lock", "ScrollLock": "scroll lock", "Print": "print screen",
+    "Control": "ctrl", "Meta": "windows", "AltGr": "alt gr",
+    "QuoteLeft": "`", "Minus": "-", "Equal": "=", "Plus": "+",
+    "BracketLeft": "[", "BracketRight": "]", "Backslash": "\\",
+    "Semicolon": ";", "Apostrophe": "'", "Comma": ",", "Period": ".", "Slash": "/",
+}
+RIGHT_SHIFT_SCAN_CODES = (54, 62)  # Windows set 1, X11
+
+def qt_key_names():
+    if not _QT_KEY_NAMES:
+        for key in Qt.Key:
+            raw = key.name[4:]
+            name = _QT_KEY_ALIASES.get(raw, raw.lower())
+            if name in NAMED_KEYS:
+                _QT_KEY_NAMES[key.value] = name
+    return _QT_KEY_NAMES
+
+def qt_binding(event):
+    """Return the keymap binding string for a Qt key event, or None."""
+    name = qt_key_names().get(event.key())
+    if name is None:
+        return None
+    if name == "shift" and event.nativeScanCode() in RIGHT_SHIFT_SCAN_CODES:
+        name = "right shift"
+    mods = 0
+    qt_mods = event.modifiers()
+    for flag, bit in (
+        (Qt.KeyboardModifier.ControlModifier, CTRL),
+        (Qt.KeyboardModifier.ShiftModifier, SHIFT),
+        (Qt.KeyboardModifier.AltModifier, ALT),
+        (Qt.KeyboardModifier.MetaModifier, META),
+    ):
+        if qt_mods & flag:
+            mods |= bit
+    mods &= ~MODIFIER_KEYS.get(name, 0)
+    return format_binding(((mods, name),))
 
 
 # ---------------------- Overlay Window ----------------------
+class PaintStats:
+    """Counts paint events and paint time, reported once per second."""
+
+    def __init__(self, label):
+        self.label = label
+        self.window_start = time.perf_counter()
+        self.paints = 0
+        self.paint_time = 0.0
+        self.total_paints = 0
+
+    def record(self, seconds):
+        self.paints += 1
+        self.total_paints += 1
+        self.paint_time += seconds
+        now = time.perf_counter()
+        if now - self.window_start >= 1.0:
+            ms = self.paint_time * 1000
+            tracing.counter(f"{self.label}.paint", paints_per_s=self.paints, paint_ms_per_s=round(ms, 3))
+            print(f"[{self.label}] {self.paints} paints/s, {ms:.2f} ms painting/s")
+            self.window_start = now
+            self.paints = 0
+            self.paint_time = 0.0
+
+
 class OverlayWindow(QWidget):
     """Simple overlay showing modules info."""
 
-    def __init__(self):
+    def __init__(self, cache_chrome=True, paint_stats=None, registry=None):
         super().__init__()
+        # The rounded translucent background is rendered once and reused until resize
+        self.cache_chrome = cache_chrome
+        self._chrome = None
+        self._first_paint_pending = False
+        if paint_stats is None:
+            paint_stats = "--overlay-stats" in sys.argv
+        self.paint_stats = PaintStats("Overlay") if paint_stats else None
         self.setWindowFlags(
             Qt.WindowType.FramelessWindowHint
             | Qt.WindowType.Tool
@@ -163,35 +435,81 @@ class OverlayWindow(QWidget):
         self.move(300, 200)
 
         self.title = QLabel("Viola Modules Menu", self)
-        self.title.setStyleSheet("color: white; font: bold 20px 'Segoe UI';")
+        self.title.setObjectName("overlayTitle")
         self.title.adjustSize()
         self.title.move(30, 24)
 
         self.hint = QLabel("(Press hotkey again to hide)", self)
-        self.hint.setStyleSheet("color: rgba(255,255,255,180); font: 12px 'Segoe UI';")
+        self.hint.setObjectName("overlayHint")
         self.hint.adjustSize()
         self.hint.move(30, 60)
 
-        self.items = [
-            "• Keystrokes / CPS / FPS",
-            "• Coordinates HUD",
-            "• Zoom",
-            "• ToggleSprint / ToggleSneak",
-            "• Armor / Potions / Packs",
-        ]
-        y = 100
-        self.item_labels = []
-        for txt in self.items:
-            lab = QLabel(txt, self)
-            lab.setStyleSheet("color: white; font: 14px 'Segoe UI';")
-            lab.adjustSize()
-            lab.move(40, y)
-            y += 28
-            self.item_labels.append(lab)
+        # Modules are discovered, imported and built on first show, and only if enabled
+        self.registry = registry if registry is not None else ModuleRegistry.from_config()
+        self.module_widgets = []
+        self.modules_built = False
 
-    def paintEvent(self, event):
+        # Launcher resource usage, filled in by the resource monitor
+        self.stats_label = QLabel("", self)
+        self.stats_label.setObjectName("overlayStats")
+        self.stats_label.setGeometry(30, self.height() - 40, self.width() - 60, 20)
+
+    def set_stats_line(self, text):
+        if text != self.stats_label.text():
+            self.stats_label.setText(text)
+
+    def ensure_modules(self):
+        if self.modules_built:
+            return
+        self.modules_built = True
+        self._next_y = 100
+        for info in self.registry.enabled():
+            widget = self.registry.build(info, self)
+            if widget is not None:
+                self._place(widget)
+        self.registry.report()
+
+    def _place(self, widget):
+        widget.adjustSize()
+        widget.move(40, self._next_y)
+        widget.show()
+        self._next_y += max(28, widget.height() + 8)
+        self.module_widgets.append(widget)
+
+    @tracing.traced("hotkey.toggle_overlay")
+    def toggle(self):
+        if self.isVisible():
+            self.hide()
+        else:
+            self.show()
+
+    @tracing.traced("hotkey.toggle_module")
+    def toggle_module(self, module_id):
+        """Show or hide one module (building it even if disabled), showing the overlay if needed."""
+        self.ensure_modules()
+        info = self.registry.modules.get(module_id)
+        if info is None:
+            return
+        widget = info.widget
+        if widget is None:
+            widget = self.registry.build(info, self)
+            if widget is None:
+                return
+            self._place(widget)
+        elif self.isVisible():
+            widget.setVisible(not widget.isVisible())
+        else:
+            widget.show()
+        if not self.isVisible():
+            self.show()
+
+    def showEvent(self, event):
+        self.ensure_modules()
+        self._first_paint_pending = True
+        super().showEvent(event)
+
+    def draw_chrome(self, painter):
         """Draw semi-transparent rounded background."""
-        painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
         rect = self.rect().adjusted(0, 0, -1, -1)
         painter.setBrush(Qt.GlobalColor.black)
@@ -200,85 +518,118 @@ class OverlayWindow(QWidget):
         painter.drawRoundedRect(rect, 20, 20)
         painter.setOpacity(1.0)
 
+    def chrome_pixmap(self):
+        """Return the cached background, re-rendering it if size or DPR changed."""
+        dpr = self.devicePixelRatioF()
+        if self._chrome is None or self._chrome.devicePixelRatio() != dpr:
+            with tracing.span("overlay.render_chrome"):
+                pixmap = QPixmap(round(self.width() * dpr), round(self.height() * dpr))
+                pixmap.setDevicePixelRatio(dpr)
+                pixmap.fill(Qt.GlobalColor.transparent)
+                painter = QPainter(pixmap)
+                self.draw_chrome(painter)
+                painter.end()
+                self._chrome = pixmap
+        return self._chrome
+
+    def resizeEvent(self, event):
+        self._chrome = None
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        t0 = time.perf_counter() if self.paint_stats else 0.0
+        painter = QPainter(self)
+        if self.cache_chrome:
+            painter.drawPixmap(0, 0, self.chrome_pixmap())
+        else:
+            self.draw_chrome(painter)
+        painter.end()
+        if self._first_paint_pending:
+            # Last hop of the hotkey path: the overlay is actually on screen
+            self._first_paint_pending = False
+            tracing.instant("overlay.first_paint")
+        if self.paint_stats:
+            self.paint_stats.record(time.perf_counter() - t0)
+
 
 # ---------------------- Settings Page ----------------------
 class SettingsPage(QWidget):
     """Settings page to configure hotkey."""
 
-    def __init__(self, parent_launcher=None):
-        super().__init__(parent_launcher)
+    def __init__(self, parent_launcher=None, parent=None):
+        super().__init__(parent or parent_launcher)
         self.parent_launcher = parent_launcher
         self.setGeometry(0, 0, parent_launcher.width(), parent_launcher.height())
         self.waiting_for_key = False
         self.setup_ui()
 
+    @tracing.traced("settings.setup_ui")
     def setup_ui(self):
         rdir = resource_dir()
         bg_path = os.path.join(rdir, "assets", "background.png")
 
         # Background label
         self.bg_label = QLabel(self)
+        self.bg_label.setProperty("role", "background")
         if os.path.exists(bg_path):
-            bg_pixmap = QPixmap(bg_path).scaled(
-                self.width(), self.height(),
-                Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                Qt.TransformationMode.SmoothTransformation
+            bg_pixmap = load_pixmap(
+                bg_path, self.width(), self.height(),
+                Qt.AspectRatioMode.KeepAspectRatioByExpanding
             )
             self.bg_label.setPixmap(bg_pixmap)
-        else:
-            self.bg_label.setStyleSheet("background-color: #1e1e1e;")
         self.bg_label.setGeometry(0, 0, self.width(), self.height())
         self.bg_label.lower()
 
         # Overlay semi-transparent layer
         self.overlay = QLabel(self)
-        self.overlay.setStyleSheet("background-color: rgba(0,0,0,120); border-radius: 25px;")
+        self.overlay.setProperty("role", "scrim")
         self.overlay.setGeometry(0, 0, self.width(), self.height())
         self.overlay.raise_()
 
         # Settings title
         label = QLabel("Settings", self)
-        label.setFont(QFont("Segoe UI", 24, QFont.Weight.Bold))
-        label.setStyleSheet("color: white;")
+        label.setProperty("role", "pageTitle")
         label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         label.setGeometry(0, 40, self.width(), 60)
 
         # Hotkey button
         self.hotkey_button = QPushButton(load_hotkey(), self)
         self.hotkey_button.setGeometry(self.width()//2 - 120, 140, 240, 40)
-        self.hotkey_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2e2e2e;
-                color: white;
-                border-radius: 12px;
-                font: bold 16px "Segoe UI";
-            }
-            QPushButton:hover {
-                background-color: #454545;
-            }
-        """)
+        self.hotkey_button.setProperty("role", "field")
         self.hotkey_button.clicked.connect(self.wait_for_key)
 
         # Save hotkey button
         save_button = QPushButton("Save Hotkey", self)
         save_button.setGeometry(self.width() // 2 - 70, 200, 140, 40)
-        save_button.setStyleSheet("""
-            QPushButton { background-color: #7C1FFF; color: white; border-radius: 15px; font: bold 16px "Segoe UI"; }
-            QPushButton:hover { background-color: #9B47FF; }
-        """)
+        save_button.setProperty("role", "primary")
         save_button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
         save_button.clicked.connect(self.save_hotkey)
 
         # Back button
         self.back_button = QPushButton("Back", self)
         self.back_button.setGeometry(self.width() // 2 - 60, self.height() - 80, 120, 40)
-        self.back_button.setStyleSheet("""
-            QPushButton { background-color: #818589; color: white; border-radius: 15px; font: bold 16px "Segoe UI"; }
-            QPushButton:hover { background-color: #9b9da0; }
-        """)
+        self.back_button.setProperty("role", "secondary")
         self.back_button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
         self.back_button.clicked.connect(lambda: self.parent_launcher.return_to_main())
 
+        # Theme switcher: applies to the whole app immediately
+        self.theme_button = QPushButton(self.theme_label(), self)
+        self.theme_button.setGeometry(self.width() // 2 - 120, 260, 240, 40)
+        self.theme_button.setProperty("role", "field")
+        self.theme_button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        self.theme_button.clicked.connect(self.cycle_theme)
+
+    @staticmethod
+    def theme_label():
+        return f"Theme: {(theme.current_theme() or theme.configured_theme()).title()}"
+
+    def cycle_theme(self):
+        name = theme.next_theme(theme.current_theme() or theme.configured_theme())
+        seconds = theme.apply_theme(QApplication.instance(), name)
+        theme.save_theme(name)
+        self.theme_button.setText(self.theme_label())
+        print(f"[Theme] Switched to {name} in {seconds * 1000:.1f} ms")
+
     def wait_for_key(self):
         """Wait for user to press a key to set hotkey."""
         if self.waiting_for_key:
@@ -290,8 +641,8 @@ class SettingsPage(QWidget):
     def keyPressEvent(self, event):
         """Handle key press to set hotkey."""
         if self.waiting_for_key:
-            key_text = QKeySequence(event.key()).toString()
-            self.hotkey_button.setText(key_text.lower() if key_text else "Unknown")
+            binding = qt_binding(event)
+            self.hotkey_button.setText(binding or "Unknown")
             self.waiting_for_key = False
             self.releaseKeyboard()
 
@@ -304,12 +655,130 @@ class SettingsPage(QWidget):
             self.parent_launcher.rebind_hotkey(new_hk)
 
 
+# ---------------------- Worlds Page ----------------------
+class WorldsPage(QWidget):
+    """Local worlds, most recently played first. The list fills in as WorldLoadThread reports worlds."""
+
+    THUMB_SIZE = (96, 54)
+
+    def __init__(self, parent_launcher=None, parent=None):
+        super().__init__(parent or parent_launcher)
+        self.parent_launcher = parent_launcher
+        self.setGeometry(0, 0, parent_launcher.width(), parent_launcher.height())
+        self._worlds = {}
+        self._keys = []
+        self._seen = set()
+        self.setup_ui()
+
+    @tracing.traced("worlds.setup_ui")
+    def setup_ui(self):
+        rdir = resource_dir()
+        bg_path = os.path.join(rdir, "assets", "background.png")
+
+        self.bg_label = QLabel(self)
+        self.bg_label.setProperty("role", "background")
+        if os.path.exists(bg_path):
+            self.bg_label.setPixmap(load_pixmap(
+                bg_path, self.width(), self.height(),
+                Qt.AspectRatioMode.KeepAspectRatioByExpanding
+            ))
+        self.bg_label.setGeometry(0, 0, self.width(), self.height())
+        self.bg_label.lower()
+
+        self.overlay = QLabel(self)
+        self.overlay.setProperty("role", "scrim")
+        self.overlay.setGeometry(0, 0, self.width(), self.height())
+        self.overlay.raise_()
+
+        label = QLabel("Worlds", self)
+        label.setProperty("role", "pageTitle")
+        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        label.setGeometry(0, 40, self.width(), 60)
+
+        self.status_label = QLabel("", self)
+        self.status_label.setObjectName("worldsStatus")
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.status_label.setGeometry(0, 100, self.width(), 20)
+
+        # Uniform rows keep layout cheap when hundreds of worlds are inserted
+        self.world_list = QListWidget(self)
+        self.world_list.setProperty("role", "worldList")
+        self.world_list.setGeometry(60, 125, self.width() - 120, self.height() - 220)
+        self.world_list.setIconSize(QSize(*self.THUMB_SIZE))
+        self.world_list.setUniformItemSizes(True)
+        self.world_list.setVerticalScrollMode(QListWidget.ScrollMode.ScrollPerPixel)
+
+        self.back_button = QPushButton("Back", self)
+        self.back_button.setGeometry(self.width() // 2 - 60, self.height() - 80, 120, 40)
+        self.back_button.setProperty("role", "secondary")
+        self.back_button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        self.back_button.clicked.connect(lambda: self.parent_launcher.return_to_main())
+
+    def thumbnail_pixels(self):
+        dpr = self.devicePixelRatioF()
+        return round(self.THUMB_SIZE[0] * dpr), round(self.THUMB_SIZE[1] * dpr)
+
+    @staticmethod
+    def world_text(world):
+        mode = world["game_mode"].title() + (" (Hardcore)" if world.get("hardcore") else "")
+        played = (datetime.fromtimestamp(world["last_played"]).strftime("%d %b %Y %H:%M")
+                  if world["last_played"] else "Never played")
+        return f"{world['name']}\n{mode}  ·  {played}  ·  {format_mb(world['size'])}"
+
+    @staticmethod
+    def _sort_key(world):
+        return (-world["last_played"], world["name"].lower(), world["path"])
+
+    def scan_started(self):
+        self._seen = set()
+        if not self._worlds:
+            self.status_label.setText("Loading worlds…")
+
+    def add_worlds(self, worlds):
+        """Insert or refresh a batch of worlds in last-played order; unchanged rows are left alone."""
+        for world in worlds:
+            path = world["path"]
+            self._seen.add(path)
+            old = self._worlds.get(path)
+            if old == world:
+                continue
+            if old is not None:
+                self._remove(old)
+            key = self._sort_key(world)
+            row = bisect.bisect(self._keys, key)
+            self._keys.insert(row, key)
+            item = QListWidgetItem(self.world_text(world))
+            item.setToolTip(path)
+            if world.get("thumbnail"):
+                pixmap = QPixmap(world["thumbnail"])
+                pixmap.setDevicePixelRatio(self.devicePixelRatioF())
+                item.setIcon(QIcon(pixmap))
+            self.world_list.insertItem(row, item)
+            self._worlds[path] = world
+        self.status_label.setText(f"Loading worlds… {len(self._seen)}")
+
+    def _remove(self, world):
+        row = bisect.bisect_left(self._keys, self._sort_key(world))
+        del self._keys[row]
+        self.world_list.takeItem(row)
+        del self._worlds[world["path"]]
+
+    def scan_finished(self, stats):
+        for world in [w for path, w in self._worlds.items() if path not in self._seen]:
+            self._remove(world)
+        count = len(self._worlds)
+        self.status_label.setText(f"{count} world{'s' if count != 1 else ''}" if count else "No worlds found")
+
+
 # ---------------------- Main Launcher ----------------------
 class ViolaLauncher(QWidget):
     CURRENT_VERSION = "1.0.6"
+    LATEST_URL = MANIFEST_URL
 
+    @tracing.traced("launcher.init")
     def __init__(self):
         super().__init__()
+        metrics.set_version(read_json(config_path(), {}).get("installed_version", self.CURRENT_VERSION))
         self.setWindowTitle("Viola Launcher")
         self.setFixedSize(900, 600)
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
@@ -327,34 +796,87 @@ class ViolaLauncher(QWidget):
         self.overlay_window = OverlayWindow()
         self.overlay_window.hide()
 
-        # Start hotkey listener
-        self._hotkey_thread = None
-        self.rebind_hotkey(load_hotkey())
+        # Low-rate self-monitoring against the budgets in config.json
+        self.monitor = None
+        if monitor_enabled():
+            self.monitor = ResourceMonitor()
+            self.monitor_timer = QTimer(self)
+            self.monitor_timer.setInterval(int(SAMPLE_INTERVAL * 1000))
+            self.monitor_timer.timeout.connect(self.sample_resources)
+            self.monitor_timer.start()
+
+        # Start hotkey listener; actions hop to the GUI thread before touching widgets
+        handlers = self.hotkey_handlers()
+        self.hotkey_bridge = HotkeyBridge(handlers, self)
+        self.hotkey_service = HotkeyService(self.hotkey_bridge.post, actions=handlers)
+        self.hotkey_service.start()
+        self._backup_future = None
+        self.launch_thread = None
+        self.world_index = None
+        self.world_thread = None
+
+        # Discord presence publishes from its own worker; calls here never block
+        client_id = presence_client_id()
+        self.presence = PresenceService(client_id) if client_id else None
+        if self.presence:
+            self.presence.start()
+        self.set_presence("idle")
 
         # Update overlay
         self.update_overlay = QLabel(self)
-        self.update_overlay.setStyleSheet(
-            "background-color: black; color: white; font: bold 24px 'Segoe UI';"
-        )
+        self.update_overlay.setObjectName("updateOverlay")
         self.update_overlay.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.update_overlay.setGeometry(0, 0, self.width(), self.height())
         self.update_overlay.hide()
 
+        # Resident (tray) mode keeps the process warm after the window closes
+        self.resident = resident_mode_enabled() and QSystemTrayIcon.isSystemTrayAvailable()
+        self._quitting = False
+        self.tray = None
+        if self.resident:
+            self.setup_tray()
+
+        # Remove the renamed-aside exe and staging left by the previous update
+        cleanup_previous_update()
+
+        # Optional LAN peer cache: serve our verified update payloads, fetch from neighbours first
+        self.peer_cache = None
+        try:
+            self.peer_cache = PeerCache.from_config()
+            if self.peer_cache:
+                self.peer_cache.start()
+        except OSError as e:
+            print("[Peers] Disabled:", e)
+            self.peer_cache = None
+
         # Only check for updates if --skip-update flag not present
         if "--skip-update" not in sys.argv:
             self.check_for_updates()
 
     # ---------- Hotkey ----------
     def rebind_hotkey(self, hk):
-        t = threading.Thread(target=lambda: hotkey_listener(self.toggle_overlay, hk), daemon=True)
-        t.start()
-        self._hotkey_thread = t
+        """Recompile bindings after the config changed; the keyboard hook is reused."""
+        self.hotkey_service.reload()
+
+    def hotkey_handlers(self):
+        """Every action a binding can name: the overlay toggle and one toggle per overlay module."""
+        handlers = {"toggle_overlay": self.toggle_overlay}
+        for info in self.overlay_window.registry.discover():
+            handlers[module_action(info.id)] = lambda module_id=info.id: self.overlay_window.toggle_module(module_id)
+        return handlers
 
     def toggle_overlay(self):
-        if self.overlay_window.isVisible():
-            self.overlay_window.hide()
-        else:
-            self.overlay_window.show()
+        self.overlay_window.toggle()
+
+    # ---------- Resource Monitor ----------
+    def sample_resources(self):
+        reading = self.monitor.sample()
+        self.overlay_window.set_stats_line(ResourceMonitor.format_line(reading))
+
+    # ---------- Presence ----------
+    def set_presence(self, name, **fields):
+        if self.presence:
+            self.presence.set_state(name, **fields)
 
     # ---------- UI Setup ----------
     def apply_rounded_corners(self):
@@ -366,130 +888,221 @@ class ViolaLauncher(QWidget):
         region = QRegion(polygon.toPolygon())
         self.setMask(region)
 
+    @tracing.traced("launcher.setup_ui")
     def setup_ui(self):
+        """Build the main page and settings page inside ui_root so they can be released as one tree."""
         rdir = resource_dir()
+        root = self.ui_root = QWidget(self)
+        root.setGeometry(0, 0, self.width(), self.height())
         bg_path = os.path.join(rdir, "assets", "background.png")
         logo_path = os.path.join(rdir, "assets", "logo.png")
 
         # Background
-        bg_label = QLabel(self)
+        bg_label = QLabel(root)
+        bg_label.setProperty("role", "background")
         if os.path.exists(bg_path):
-            bg_label.setPixmap(QPixmap(bg_path).scaled(
-                self.size(),
-                Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                Qt.TransformationMode.SmoothTransformation
+            bg_label.setPixmap(load_pixmap(
+                bg_path, self.width(), self.height(),
+                Qt.AspectRatioMode.KeepAspectRatioByExpanding
             ))
-        else:
-            bg_label.setStyleSheet("background-color: #1e1e1e;")
         bg_label.setGeometry(0, 0, self.width(), self.height())
         bg_label.lower()
 
         # Overlay
-        overlay = QLabel(self)
-        overlay.setStyleSheet("background-color: rgba(0, 0, 0, 120); border-radius: 25px;")
+        overlay = QLabel(root)
+        overlay.setProperty("role", "scrim")
         overlay.setGeometry(0, 0, self.width(), self.height())
         overlay.raise_()
 
         # Logo
-        logo_label = QLabel(self)
+        logo_label = QLabel(root)
         if os.path.exists(logo_path):
-            logo_label.setPixmap(QPixmap(logo_path).scaled(40, 40, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation))
+            logo_label.setPixmap(load_pixmap(logo_path, 40, 40, Qt.AspectRatioMode.KeepAspectRatio))
         logo_label.setGeometry(20, 20, 40, 40)
 
         # Title
-        title_label = QLabel("Viola Launcher", self)
-        title_label.setFont(QFont("Segoe UI", 18, QFont.Weight.Bold))
-        title_label.setStyleSheet("color: white;")
+        title_label = QLabel("Viola Launcher", root)
+        title_label.setObjectName("appTitle")
         title_label.setGeometry(70, 20, 300, 40)
 
         # Greeting
         hour = datetime.now().hour
         greeting = "Good Morning!" if 5 <= hour < 12 else ("Good Afternoon!" if 12 <= hour < 18 else "Good Evening!")
-        self.greeting_label = QLabel(greeting, self)
-        self.greeting_label.setFont(QFont("Segoe UI", 32, QFont.Weight.Bold))
-        self.greeting_label.setStyleSheet("color: white;")
+        self.greeting_label = QLabel(greeting, root)
+        self.greeting_label.setObjectName("greeting")
         self.greeting_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.greeting_label.setGeometry(0, 0, self.width(), self.height())
 
         # Launch & Settings buttons
-        self.launch_button = QPushButton("Launch", self)
+        self.launch_button = QPushButton("Launch", root)
         self.launch_button.setGeometry(self.width() // 2 - 100, self.height() // 2 + 60, 200, 50)
-        self.launch_button.setStyleSheet("""
-            QPushButton { background-color: #7C1FFF; color: white; border-radius: 15px; font: bold 18px "Segoe UI"; }
-            QPushButton:hover { background-color: #9B47FF; }
-        """)
+        self.launch_button.setObjectName("launchButton")
+        self.launch_button.setProperty("role", "primary")
         self.launch_button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
         self.launch_button.clicked.connect(self.launch_minecraft)
 
-        self.settings_button = QPushButton("Settings", self)
+        self.settings_button = QPushButton("Settings", root)
         self.settings_button.setGeometry(self.width() // 2 - 100, self.height() // 2 + 130, 200, 50)
-        self.settings_button.setStyleSheet("""
-            QPushButton { background-color: #818589; color: white; border-radius: 15px; font: bold 16px "Segoe UI"; }
-            QPushButton:hover { background-color: #9b9da0; }
-        """)
+        self.settings_button.setProperty("role", "secondary")
         self.settings_button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
         self.settings_button.clicked.connect(self.open_settings)
 
+        self.worlds_button = QPushButton("Worlds", root)
+        self.worlds_button.setGeometry(self.width() // 2 - 100, self.height() // 2 + 200, 200, 50)
+        self.worlds_button.setProperty("role", "secondary")
+        self.worlds_button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        self.worlds_button.clicked.connect(self.open_worlds)
+
         # Min/Close buttons
-        button_style = """
-            QPushButton { color: white; background: transparent; border: none; font: bold 20px "Segoe UI"; }
-            QPushButton:hover { color: #aaaaaa; }
-        """
-        self.min_button = QPushButton("–", self)
+        self.min_button = QPushButton("–", root)
         self.min_button.setGeometry(self.width() - 80, 20, 30, 30)
-        self.min_button.setStyleSheet(button_style)
+        self.min_button.setProperty("role", "windowControl")
         self.min_button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
         self.min_button.clicked.connect(self.showMinimized)
 
-        self.close_button = QPushButton("×", self)
+        self.close_button = QPushButton("×", root)
         self.close_button.setGeometry(self.width() - 40, 20, 30, 30)
-        self.close_button.setStyleSheet(button_style)
+        self.close_button.setProperty("role", "windowControl")
         self.close_button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
         self.close_button.clicked.connect(self.close)
 
         # Settings page
-        self.settings_page = SettingsPage(self)
+        self.settings_page = SettingsPage(self, root)
         self.settings_page.hide()
 
+        # Worlds page; filled from the world index when opened
+        self.worlds_page = WorldsPage(self, root)
+        self.worlds_page.hide()
+
+    def show_main_controls(self, visible):
+        for widget in (self.greeting_label, self.launch_button, self.settings_button, self.worlds_button):
+            widget.setVisible(visible)
+
     def open_settings(self):
-        self.greeting_label.hide()
-        self.launch_button.hide()
-        self.settings_button.hide()
+        self.show_main_controls(False)
         self.settings_page.show()
 
+    def open_worlds(self):
+        self.show_main_controls(False)
+        self.worlds_page.show()
+        self.load_worlds()
+
     def return_to_main(self):
-        self.greeting_label.show()
-        self.launch_button.show()
-        self.settings_button.show()
+        self.show_main_controls(True)
         self.settings_page.hide()
+        self.worlds_page.hide()
+
+    # ---------- Worlds ----------
+    def load_worlds(self):
+        """Refresh the worlds page in the background; unchanged worlds come straight from the index."""
+        if self.world_thread is not None and self.world_thread.isRunning():
+            return
+        page = self.worlds_page
+        self.world_thread = WorldLoadThread(self.world_index, page.thumbnail_pixels())
+        self.world_thread.batch.connect(page.add_worlds)
+        self.world_thread.done.connect(page.scan_finished)
+        self.world_thread.done.connect(self.worlds_loaded)
+        page.scan_started()
+        self.world_thread.start()
+
+    def worlds_loaded(self, stats):
+        self.world_index = self.world_thread.index
+        print(f"[Worlds] {stats['worlds']} worlds, re-read {stats['reread']}, {stats['thumbnails']} new thumbnails "
+              f"in {stats['seconds'] * 1000:.1f} ms")
 
     # ---------- Launch Minecraft ----------
+    STAGE_LABELS = {
+        "resolve_install": "Finding game…",
+        "world_backup": "Backing up…",
+        "spawn": "Starting…",
+        "confirm": "Waiting for game…",
+    }
+
     def launch_minecraft(self):
+        """Start the launch pipeline; pressing Launch again while it runs cancels it."""
+        if self.launch_thread is not None and self.launch_thread.isRunning():
+            self.launch_thread.cancel()
+            self.set_launch_button("Cancelling…")
+            return
+        cfg = read_json(config_path(), {})
+        spawner = default_spawner(cfg.get("launch_command"), cfg.get("launch_process"), find_minecraft_install)
+        tasks = []
+        if backup_enabled():
+            tasks.append(("world_backup", lambda ctx, cancel: self.start_world_backup()))
+        self.launch_thread = LaunchThread(build_launch_pipeline(spawner, tasks))
+        self.launch_thread.stage_changed.connect(self.launch_stage_changed)
+        self.launch_thread.finished.connect(self.launch_finished)
+        self.set_launch_button("Launching…")
+        self.launch_thread.start()
+
+    def launch_stage_changed(self, stage, state, seconds, detail):
+        tracing.instant("launch.stage", stage=stage, state=state, seconds=seconds)
+        if state == "running":
+            self.set_launch_button(self.STAGE_LABELS.get(stage, "Launching…"))
+        elif state == "done":
+            print(f"[Launch] {stage}: done in {seconds * 1000:.1f} ms")
+        elif state in ("skipped", "failed"):
+            print(f"[Launch] {stage}: {state} ({detail})")
+
+    def launch_finished(self, ok, error):
+        timings = self.launch_thread.timings
+        self.set_launch_button("Launch")
+        if ok:
+            print(f"[Launch] Game running after {timings['total']:.2f}s")
+            metrics.record("launch.total_ms", timings["total"] * 1000)
+            metrics.record("launch.spawn_ms", timings["spawn"] * 1000)
+            self.set_presence("in_game", start=time.time())
+            if gameplay_mode_enabled():
+                self.enter_gameplay_mode()
+        else:
+            print("[Launch] Failed:", error)
+
+    def set_launch_button(self, text=None, enabled=None):
+        """Update the Launch button; a no-op while the UI is released for gameplay."""
+        if self.ui_root is None:
+            return
+        if text is not None:
+            self.launch_button.setText(text)
+        if enabled is not None:
+            self.launch_button.setEnabled(enabled)
+
+    def start_world_backup(self):
+        """Snapshot worlds in a worker process; the game is launched without waiting."""
+        if self._backup_future is not None and not self._backup_future.done():
+            return
+        tracing.instant("backup.start")
+        self._backup_future = start_background_backup()
+        self._backup_future.add_done_callback(self._world_backup_done)
+
+    def _world_backup_done(self, future):
         try:
-            os.startfile("minecraft://")
+            stats = future.result()
+        except Exception as e:
+            print("[Backup] Failed:", e)
             return
-        except Exception:
-            pass
-        paths = glob.glob(r"C:\Program Files\WindowsApps\Microsoft.MinecraftUWP_*\Minecraft.Windows.exe")
-        paths.append(r"C:\Program Files\Microsoft Studios\Minecraft\Minecraft.Windows.exe")
-        for p in paths:
-            if os.path.exists(p):
-                try:
-                    os.startfile(p)
-                    return
-                except Exception:
-                    continue
-        print("Failed to launch Minecraft. Check installation.")
+        if stats.get("error"):
+            print("[Backup] Skipped:", stats["error"])
+        else:
+            tracing.instant("backup.done", seconds=stats["seconds"], read_bytes=stats["read_bytes"])
+            metrics.record("backup.seconds", stats["seconds"])
+            print(f"[Backup] Snapshot {stats['snapshot']}: {stats['skipped']}/{stats['files']} unchanged, "
+                  f"{stats['new_chunks']} new chunks in {stats['seconds']:.1f}s")
 
     # ---------- Updates ----------
     def check_for_updates(self):
-        """Check GitHub for latest release and start UpdateThread only if needed."""
+        """Check GitHub for the latest release in the background; the window stays responsive."""
+        self.update_check_thread = UpdateCheckThread(self.LATEST_URL)
+        self.update_check_thread.result.connect(self.on_update_info)
+        self.update_check_thread.start()
+
+    @tracing.traced("update.check")
+    def on_update_info(self, data):
+        """Start UpdateThread only if latest.json names a newer version."""
+        if isinstance(data, Exception):
+            tracing.instant("update.check_failed", error=str(data))
+            print("Failed to check updates:", data)
+            return
         try:
-            r = requests.get(
-                "https://github.com/ThatWeirdGuy259/ViolaLauncher/blob/main/latest.json",
-                timeout=5
-            )
-            data = r.json()
             latest_version = str(data.get("version", "")).strip()
             url = data.get("url")
 
@@ -499,46 +1112,206 @@ class ViolaLauncher(QWidget):
 
             # Only update if the latest is newer
             if latest_version and latest_version != installed_version and url:
-                self.launch_button.setEnabled(False)
+                self.set_launch_button(enabled=False)
                 self.update_overlay.setText("Updating… 0%")
                 self.update_overlay.show()
+                self.update_overlay.raise_()
+                self.set_presence("updating", state=f"v{installed_version} → v{latest_version}")
 
                 dest_zip = os.path.join(tempfile.gettempdir(), "viola_update.zip")
-                self.update_thread = UpdateThread(url, dest_zip)
+                self.update_thread = UpdateThread(url, dest_zip, data.get("sha256"), self.peer_cache,
+                                                  data.get("members"), latest_version)
                 self.update_thread.progress.connect(self.update_progress)
-                self.update_thread.finished.connect(lambda success, path_or_err: self.update_finished(success, path_or_err, latest_version))
+                self.update_thread.installing.connect(lambda: self.update_overlay.setText("Installing update…"))
+                self.update_thread.finished.connect(
+                    lambda success, result: self.update_finished(success, result, latest_version)
+                )
                 self.update_thread.start()
             else:
                 print(f"No update needed. Installed version: {installed_version}, Latest: {latest_version}")
 
         except Exception as e:
+            tracing.instant("update.check_failed", error=str(e))
             print("Failed to check updates:", e)
 
     def update_progress(self, percent):
         self.update_overlay.setText(f"Updating… {percent}%")
 
-    def update_finished(self, success, path_or_err, latest_version):
-        """Handle update completion, launch updater.py if successful, update config."""
-        if success and os.path.exists(path_or_err):
-            updater_file = os.path.join(app_dir(), "updater.py")
-            if os.path.exists(updater_file):
-                # Update installed version in config to prevent repeated updates
-                cfg = read_json(config_path(), {})
-                cfg["installed_version"] = latest_version
-                write_json(config_path(), cfg)
-
-                threading.Thread(
-                    target=lambda: subprocess.run([sys.executable, updater_file, path_or_err, app_dir()]),
-                    daemon=True
-                ).start()
-                self.update_overlay.setText("Update complete!")
+    @tracing.traced("update.finished")
+    def update_finished(self, success, result, latest_version):
+        """Report the install done by UpdateThread, restarting if the exe was replaced."""
+        if success:
+            report = result
+            metrics.record("update.apply_ms", report["seconds"] * 1000)
+            tracing.instant("update.applied", files=report["files"], bytes=report["bytes"],
+                            verify_ms=round(report["verify_seconds"] * 1000, 1),
+                            stage_ms=round(report["stage_seconds"] * 1000, 1),
+                            swap_ms=round(report["swap_seconds"] * 1000, 1))
+            print(f"[Updater] Installed {latest_version}: {report['files']} files, {format_mb(report['bytes'])} in "
+                  f"{report['seconds'] * 1000:.0f} ms (verify {report['verify_seconds'] * 1000:.0f}, "
+                  f"stage {report['stage_seconds'] * 1000:.0f}, swap {report['swap_seconds'] * 1000:.0f})")
+            if report["restart_required"]:
+                self.update_overlay.setText("Update complete! Restarting…")
+                spawn_restart_helper(os.getpid(), running_executable(), report["pending"])
+                QTimer.singleShot(500, self.quit_from_tray)
             else:
-                print("Updater missing!")
+                self.update_overlay.setText("Update complete!")
+                QTimer.singleShot(2000, self.update_overlay.hide)
+                self.set_launch_button(enabled=True)
+                self.set_presence("idle")
         else:
-            print("Update failed:", path_or_err)
+            print("Update failed:", result)
             self.update_overlay.setText("Update failed!")
             QTimer.singleShot(2000, self.update_overlay.hide)
-            self.launch_button.setEnabled(True)
+            self.set_launch_button(enabled=True)
+            self.set_presence("idle")
+
+    # ---------- Gameplay Mode ----------
+    @tracing.traced("gameplay.enter")
+    def enter_gameplay_mode(self):
+        """
+        Release the widget tree and decoded images while the game runs. Only the
+        overlay, hotkey service and tray stay alive; the UI is rebuilt on restore.
+        """
+        if self.ui_root is None:
+            return
+        before = rss_bytes()
+        if self.tray:
+            self.hide()
+        else:
+            self.showMinimized()
+        root = self.ui_root
+        self.ui_root = None
+        self.launch_button = self.settings_button = self.worlds_button = self.greeting_label = None
+        self.min_button = self.close_button = self.settings_page = self.worlds_page = None
+        # Unparented, the tree is destroyed as soon as the last Python reference goes
+        root.setParent(None)
+        del root
+        pixmap_cache().clear()
+        gc.collect()
+        trim_working_set()
+        after = rss_bytes()
+        tracing.instant("gameplay.rss", before=before, after=after)
+        print(f"[Gameplay] Released UI: RSS {format_mb(before)} -> {format_mb(after)}")
+
+    def ensure_ui(self):
+        """Rebuild the UI if it was released for gameplay."""
+        if self.ui_root is not None:
+            return
+        t0 = time.perf_counter()
+        with tracing.span("gameplay.rebuild"):
+            self.setup_ui()
+            self.ui_root.show()
+            self.update_overlay.raise_()
+        if self.launch_thread is not None and self.launch_thread.isRunning():
+            self.set_launch_button("Launching…")
+        print(f"[Gameplay] Rebuilt UI in {(time.perf_counter() - t0) * 1000:.1f} ms, RSS {format_mb(rss_bytes())}")
+
+    def showEvent(self, event):
+        if not self.isMinimized():
+            self.ensure_ui()
+        super().showEvent(event)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.WindowStateChange and not self.isMinimized():
+            self.ensure_ui()
+        super().changeEvent(event)
+
+    # ---------- Resident Mode ----------
+    def setup_tray(self):
+        """Create the tray icon used to reopen or launch from standby."""
+        QApplication.instance().setQuitOnLastWindowClosed(False)
+        self.tray = QSystemTrayIcon(self.windowIcon(), self)
+        self.tray.setToolTip("Viola Launcher")
+        menu = QMenu(self)
+        open_action = QAction("Open", menu)
+        open_action.triggered.connect(self.show_from_tray)
+        launch_action = QAction("Launch Minecraft", menu)
+        launch_action.triggered.connect(self.launch_from_tray)
+        quit_action = QAction("Quit", menu)
+        quit_action.triggered.connect(self.quit_from_tray)
+        for action in (open_action, launch_action, quit_action):
+            menu.addAction(action)
+        self.tray.setContextMenu(menu)
+        self.tray.activated.connect(self.on_tray_activated)
+        self.tray.show()
+
+        self.standby_timer = QTimer(self)
+        self.standby_timer.setInterval(5 * 60 * 1000)
+        self.standby_timer.timeout.connect(self.report_standby_stats)
+        self.standby_cpu = CpuMeter()
+
+        # Warm the install lookup off the GUI thread so tray launches skip the glob
+        threading.Thread(target=find_minecraft_install, daemon=True).start()
+
+    def closeEvent(self, event):
+        if self.resident and not self._quitting:
+            event.ignore()
+            self.enter_standby()
+            return
+        if self.tray:
+            self.tray.hide()
+        if self.monitor:
+            print(f"[Monitor] Peak RSS {self.monitor.peak['rss_mb']:.1f} MB, peak threads {self.monitor.peak['threads']}")
+        if self.presence:
+            stats = self.presence.stats()
+            self.presence.stop()
+            print(f"[Presence] {stats['sent']} sent, {stats['coalesced']} coalesced, {stats['dropped']} dropped")
+        self.overlay_window.close()
+        super().closeEvent(event)
+
+    @tracing.traced("standby.enter")
+    def enter_standby(self):
+        """Hide to the tray. Decoded assets, overlay and hotkey stay alive; idle heap is returned."""
+        self.hide()
+        gc.collect()
+        trim_working_set()
+        self.standby_cpu.sample()
+        self.standby_timer.start()
+        print(f"[Standby] Entered standby, RSS {format_mb(rss_bytes())}")
+
+    def report_standby_stats(self):
+        rss = rss_bytes()
+        cpu = self.standby_cpu.sample()
+        tracing.instant("standby.stats", rss=rss, cpu_percent=round(cpu, 3))
+        print(f"[Standby] RSS {format_mb(rss)}, CPU {cpu:.2f}%")
+        if self.tray:
+            self.tray.setToolTip(f"Viola Launcher (standby: {format_mb(rss)}, {cpu:.1f}% CPU)")
+
+    def on_tray_activated(self, reason):
+        if reason in (QSystemTrayIcon.ActivationReason.Trigger, QSystemTrayIcon.ActivationReason.DoubleClick):
+            self.show_from_tray()
+
+    def show_from_tray(self):
+        t0 = time.perf_counter()
+        with tracing.span("standby.reopen"):
+            self.standby_timer.stop()
+            self.showNormal()
+            self.raise_()
+            self.activateWindow()
+        print(f"[Standby] Reopened in {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+    def launch_from_tray(self):
+        with tracing.span("standby.launch"):
+            self.launch_minecraft()
+
+    def quit_from_tray(self):
+        self._quitting = True
+        self.close()
+        QApplication.instance().quit()
+
+    # ---------- Single Instance ----------
+    def handle_forwarded_args(self, argv):
+        """Handle argv forwarded by a second invocation of the launcher."""
+        tracing.instant("instance.forwarded", argv=" ".join(argv))
+        if self.resident:
+            self.show_from_tray()
+        else:
+            self.showNormal()
+            self.raise_()
+            self.activateWindow()
+        if "--launch" in argv:
+            self.launch_minecraft()
 
     # ---------- Drag Window ----------
     def mousePressEvent(self, event):
@@ -553,8 +1326,42 @@ class ViolaLauncher(QWidget):
         self.drag_pos = None
 
 # ---------------------- Entry Point ----------------------
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
+def create_main_window(progress=None):
+    """
+    Claim the single-instance server and build the launcher window.
+    Returns None if another instance took over. progress(text) reports each step.
+    """
+    progress = progress or (lambda text: None)
+    progress("Checking for a running launcher…")
+    instance_server = InstanceServer()
+    if not instance_server.listen() and "--new-instance" not in sys.argv:
+        # Lost a startup race against another instance
+        if forward_to_running(sys.argv[1:]):
+            return None
+    progress("Applying theme…")
+    theme.apply_theme(QApplication.instance())
+    progress("Building window…")
     window = ViolaLauncher()
+    window.instance_server = instance_server
+    instance_server.message_received.connect(window.handle_forwarded_args)
+    return window
+
+def run_launcher(app, window, trace_path=None):
+    """Show the window and run the event loop; returns the exit code."""
     window.show()
-    sys.exit(app.exec())
+    tracing.instant("startup.shown")
+    if "--launch" in sys.argv:
+        window.launch_minecraft()
+    exit_code = app.exec()
+    if trace_path:
+        tracing.export_chrome_trace(trace_path)
+    return exit_code
+
+if __name__ == "__main__":
+    trace_path = tracing.trace_path_from_argv(sys.argv)
+    with tracing.span("startup.qapplication"):
+        app = QApplication(sys.argv)
+    window = create_main_window()
+    if window is None:
+        sys.exit(0)
+    sys.exit(run_launcher(app, window, trace_path))
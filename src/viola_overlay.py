@@ -1,9 +1,11 @@
-import sys, os, glob, json, requests, zipfile, shutil, tempfile, subprocess
+import sys, os, glob, json, zipfile, shutil, tempfile, subprocess
 from datetime import datetime
 from PyQt6.QtWidgets import QApplication, QWidget, QLabel, QPushButton
 from PyQt6.QtGui import QPixmap, QFont, QPainterPath, QRegion, QCursor, QIcon
 from PyQt6.QtCore import Qt, QRectF, QThread, pyqtSignal, QTimer
 
+import http_client
+
 # --- Worker thread to download update ---
 class UpdateThread(QThread):
     progress = pyqtSignal(int)
@@ -16,16 +18,17 @@ class UpdateThread(QThread):
 
     def run(self):
         try:
-            r = requests.get(self.url, stream=True)
-            total = int(r.headers.get('content-length', 0))
-            downloaded = 0
-            with open(self.dest, 'wb') as f:
-                for chunk in r.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        percent = int(downloaded / total * 100)
-                        self.progress.emit(percent)
+            with http_client.stream(self.url) as r:
+                r.raise_for_status()
+                total = int(r.headers.get('content-length', 0))
+                downloaded = 0
+                with open(self.dest, 'wb') as f:
+                    for chunk in r.iter_content(chunk_size=8192):
+                        if chunk:
+                            f.write(chunk)
+                            downloaded += len(chunk)
+                            percent = int(downloaded / total * 100)
+                            self.progress.emit(percent)
             self.finished.emit(True, self.dest)
         except Exception as e:
             print("Update failed:", e)
@@ -174,8 +177,7 @@ class ViolaLauncher(QWidget):
     # --- Updater ---
     def check_for_updates(self):
         try:
-            r = requests.get("https://github.com/ThatWeirdGuy259/ViolaLauncher/blob/main/latest.json", timeout=5)
-            data = r.json()
+            data = http_client.get_json("https://github.com/ThatWeirdGuy259/ViolaLauncher/blob/main/latest.json", timeout=5)
             latest_version = data.get("version")
             url = data.get("url")
             if latest_version != self.CURRENT_VERSION:
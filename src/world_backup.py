@@ -0,0 +1,395 @@
+"""
+Viola Launcher - Incremental world backups
+Snapshots the minecraftWorlds folder into a local deduplicated repository:
+files are split into content-defined chunks (anchors found by a table-driven
+hash over a small byte window, 16-256 KiB per chunk), each chunk is stored
+once under its sha256, zlib-compressed when that pays off. Files whose size
+and mtime match the previous snapshot are not read at all.
+
+    python src/world_backup.py backup [--worlds DIR] [--repo DIR]
+    python src/world_backup.py list
+    python src/world_backup.py restore SNAPSHOT DEST
+    python src/world_backup.py prune --keep N
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import random
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from launcher_config import app_dir, config_path, read_json
+from pack_index import MOJANG_DIR
+
+MIN_CHUNK = 16 * 1024
+MAX_CHUNK = 256 * 1024
+READ_BLOCK = 4 * 1024 * 1024
+COMPRESS_LEVEL = 3
+DEFAULT_KEEP = 10                # snapshots kept after each backup
+# LevelDB tables are already compressed; a 4 KiB probe decides whether zlib is worth it
+COMPRESS_PROBE = 4096
+COMPRESS_MIN_RATIO = 0.9
+RAW_TAG = b"r"
+ZLIB_TAG = b"z"
+
+ANCHOR_WINDOW = 4
+ANCHOR = b"\x00\x00"  # two consecutive zero hash bytes: one anchor per ~64 KiB of random data
+
+
+def _anchor_tables(seed=0x56696F6C61):
+    """
+    Build one byte translation table per window offset. A run of one repeated
+    byte must never anchor, or zero-filled regions would cut at every position,
+    so tables are redrawn until no byte value XORs to zero across the window.
+    """
+    rng = random.Random(seed)
+    while True:
+        tables = [bytes(rng.getrandbits(8) for _ in range(256)) for _ in range(ANCHOR_WINDOW)]
+        ok = True
+        for v in range(256):
+            acc = 0
+            for t in tables:
+                acc ^= t[v]
+            if not acc:
+                ok = False
+                break
+        if ok:
+            return tables
+
+
+ANCHOR_TABLES = _anchor_tables()
+
+
+def worlds_dir():
+    """Return the worlds folder from config ("worlds_dir") or the Bedrock default."""
+    configured = read_json(config_path(), {}).get("worlds_dir")
+    if configured:
+        return os.path.expandvars(os.path.expanduser(configured))
+    base = os.getenv("LOCALAPPDATA") or os.path.expanduser("~")
+    return os.path.join(base, MOJANG_DIR, "minecraftWorlds")
+
+
+def repo_dir():
+    """Return the backup repository from config ("backup_dir") or <app dir>/backups."""
+    configured = read_json(config_path(), {}).get("backup_dir")
+    if configured:
+        return os.path.expandvars(os.path.expanduser(configured))
+    return os.path.join(app_dir(), "backups")
+
+
+# ---------------------- Chunking ----------------------
+def anchor_map(buf):
+    """
+    Return the per-position window hash of buf: byte i is the XOR of table
+    lookups of buf[i-3:i+1]. Computed for the whole buffer at once with
+    bytes.translate and big-int shifts so the per-byte work stays in C.
+    """
+    acc = 0
+    for k, table in enumerate(ANCHOR_TABLES):
+        # Big-endian: shifting right by k bytes moves byte j to j + k
+        acc ^= int.from_bytes(buf.translate(table), "big") >> (8 * k)
+    return acc.to_bytes(len(buf), "big")
+
+
+def next_cut(anchors, start, end):
+    """Return the end offset of the chunk starting at start."""
+    limit = min(start + MAX_CHUNK, end)
+    if limit - start <= MIN_CHUNK:
+        return limit
+    i = anchors.find(ANCHOR, start + MIN_CHUNK - 2, limit - 1)
+    return limit if i < 0 else i + 2
+
+
+def iter_chunks(f):
+    """Yield content-defined chunks read from a binary file object."""
+    buf = b""
+    while True:
+        data = f.read(READ_BLOCK)
+        eof = not data
+        buf += data
+        if not buf:
+            return
+        n = len(buf)
+        if n >= MAX_CHUNK or eof:
+            anchors = anchor_map(buf)
+            pos = 0
+            # Only cut while a full MAX_CHUNK window is buffered, so cuts never depend on read size
+            while n - pos >= MAX_CHUNK or (eof and pos < n):
+                cut = next_cut(anchors, pos, n)
+                yield buf[pos:cut]
+                pos = cut
+            buf = buf[pos:]
+        if eof:
+            return
+
+
+# ---------------------- Repository ----------------------
+class BackupRepo:
+    """Content-addressed chunk store plus JSON snapshot manifests."""
+
+    def __init__(self, path=None):
+        self.path = path or repo_dir()
+        self.chunk_dir = os.path.join(self.path, "chunks")
+        self.snap_dir = os.path.join(self.path, "snapshots")
+        self._known = None
+
+    def create(self):
+        """Create the repository folders; reading an absent repository finds no snapshots."""
+        os.makedirs(self.chunk_dir, exist_ok=True)
+        os.makedirs(self.snap_dir, exist_ok=True)
+
+    def _chunk_path(self, digest):
+        return os.path.join(self.chunk_dir, digest[:2], digest)
+
+    def known_chunks(self):
+        if self._known is None:
+            self._known = set()
+            if not os.path.isdir(self.chunk_dir):
+                return self._known
+            for sub in os.listdir(self.chunk_dir):
+                d = os.path.join(self.chunk_dir, sub)
+                if os.path.isdir(d):
+                    self._known.update(n for n in os.listdir(d) if not n.endswith(".tmp"))
+        return self._known
+
+    def put_chunk(self, data):
+        """Store a chunk if new. Returns (digest, stored_bytes)."""
+        digest = hashlib.sha256(data).hexdigest()
+        known = self.known_chunks()
+        if digest in known:
+            return digest, 0
+        path = self._chunk_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        packed = RAW_TAG + data
+        probe = data[:COMPRESS_PROBE]
+        if len(zlib.compress(probe, 1)) < len(probe) * COMPRESS_MIN_RATIO:
+            compressed = zlib.compress(data, COMPRESS_LEVEL)
+            if len(compressed) < len(data):
+                packed = ZLIB_TAG + compressed
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(packed)
+        os.replace(tmp, path)
+        known.add(digest)
+        return digest, len(packed)
+
+    def get_chunk(self, digest):
+        with open(self._chunk_path(digest), "rb") as f:
+            packed = f.read()
+        data = zlib.decompress(packed[1:]) if packed[:1] == ZLIB_TAG else packed[1:]
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"chunk {digest} is corrupt")
+        return data
+
+    def snapshots(self):
+        """Return snapshot ids, oldest first."""
+        if not os.path.isdir(self.snap_dir):
+            return []
+        return sorted(n[:-5] for n in os.listdir(self.snap_dir) if n.endswith(".json"))
+
+    def load_snapshot(self, snap_id):
+        with open(os.path.join(self.snap_dir, snap_id + ".json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_snapshot(self, snapshot):
+        snap_id = time.strftime("%Y%m%d-%H%M%S", time.localtime(snapshot["created"]))
+        while os.path.exists(os.path.join(self.snap_dir, snap_id + ".json")):
+            snap_id += "_"
+        path = os.path.join(self.snap_dir, snap_id + ".json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(path + ".tmp", path)
+        return snap_id
+
+
+# ---------------------- Backup / Restore ----------------------
+def backup(source=None, repo=None, keep=None):
+    """
+    Take an incremental snapshot of source, then keep only the newest `keep`
+    snapshots (default: backup_keep(); 0 keeps everything). Returns a stats dict.
+    """
+    t0 = time.perf_counter()
+    source = source or worlds_dir()
+    repo = repo if isinstance(repo, BackupRepo) else BackupRepo(repo)
+    if not os.path.isdir(source):
+        return {"snapshot": None, "error": f"{source} does not exist"}
+    repo.create()
+
+    previous = {}
+    snaps = repo.snapshots()
+    if snaps:
+        previous = repo.load_snapshot(snaps[-1]).get("files", {})
+
+    files = {}
+    stats = {"files": 0, "skipped": 0, "read_bytes": 0, "new_chunks": 0, "stored_bytes": 0, "retried": 0}
+    for dirpath, _, names in os.walk(source):
+        for name in names:
+            full = os.path.join(dirpath, name)
+            rel = os.path.relpath(full, source).replace(os.sep, "/")
+            try:
+                st = os.stat(full)
+            except OSError:
+                continue
+            stats["files"] += 1
+            old = previous.get(rel)
+            if old and old["size"] == st.st_size and old["mtime_ns"] == st.st_mtime_ns:
+                files[rel] = old
+                stats["skipped"] += 1
+                continue
+            entry = _backup_file(full, st, repo, stats)
+            if entry is not None:
+                files[rel] = entry
+
+    snapshot = {"created": time.time(), "source": source, "files": files}
+    snap_id = repo.save_snapshot(snapshot)
+    stats.update(snapshot=snap_id, seconds=time.perf_counter() - t0, error=None)
+    stats["mb_per_second"] = stats["read_bytes"] / (1024 * 1024) / stats["seconds"] if stats["seconds"] else 0.0
+    keep = backup_keep() if keep is None else keep
+    stats["pruned_chunks"] = prune(keep, repo)["removed_chunks"] if keep > 0 else 0
+    return stats
+
+
+def _backup_file(full, st, repo, stats):
+    # A world saved while we read it gets one retry, then whatever we read is kept
+    for attempt in range(2):
+        chunks = []
+        try:
+            with open(full, "rb") as f:
+                for chunk in iter_chunks(f):
+                    digest, stored = repo.put_chunk(chunk)
+                    chunks.append(digest)
+                    stats["read_bytes"] += len(chunk)
+                    if stored:
+                        stats["new_chunks"] += 1
+                        stats["stored_bytes"] += stored
+            after = os.stat(full)
+        except OSError as e:
+            print(f"[Backup] Could not read {full}: {e}")
+            return None
+        if after.st_mtime_ns == st.st_mtime_ns and after.st_size == st.st_size:
+            break
+        st = after
+        stats["retried"] += 1
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "chunks": chunks}
+
+
+def restore(snap_id, dest, repo=None):
+    """Rebuild a snapshot into dest (which must be empty or missing). Returns a stats dict."""
+    t0 = time.perf_counter()
+    repo = repo if isinstance(repo, BackupRepo) else BackupRepo(repo)
+    if snap_id == "latest":
+        snaps = repo.snapshots()
+        if not snaps:
+            raise ValueError("no snapshots")
+        snap_id = snaps[-1]
+    snapshot = repo.load_snapshot(snap_id)
+    if os.path.isdir(dest) and os.listdir(dest):
+        raise ValueError(f"{dest} is not empty")
+    written = 0
+    for rel, entry in snapshot["files"].items():
+        target = os.path.normpath(os.path.join(dest, rel))
+        if not target.startswith(os.path.normpath(dest) + os.sep):
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, "wb") as f:
+            for digest in entry["chunks"]:
+                data = repo.get_chunk(digest)
+                f.write(data)
+                written += len(data)
+        os.utime(target, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+    return {"snapshot": snap_id, "files": len(snapshot["files"]), "bytes": written,
+            "seconds": time.perf_counter() - t0}
+
+
+def prune(keep, repo=None):
+    """Keep the newest `keep` snapshots and delete chunks no longer referenced."""
+    repo = repo if isinstance(repo, BackupRepo) else BackupRepo(repo)
+    snaps = repo.snapshots()
+    for snap_id in snaps[:-keep] if keep > 0 else snaps:
+        os.remove(os.path.join(repo.snap_dir, snap_id + ".json"))
+    live = set()
+    for snap_id in repo.snapshots():
+        for entry in repo.load_snapshot(snap_id)["files"].values():
+            live.update(entry["chunks"])
+    removed = 0
+    for digest in list(repo.known_chunks()):
+        if digest not in live:
+            os.remove(repo._chunk_path(digest))
+            repo.known_chunks().discard(digest)
+            removed += 1
+    return {"snapshots": len(repo.snapshots()), "removed_chunks": removed}
+
+
+# ---------------------- Background ----------------------
+_executor = None
+
+
+def start_background_backup(source=None, repo_path=None):
+    """
+    Run backup() in a worker process so neither launch nor the GUI thread waits
+    on chunk hashing. Returns a Future resolving to the stats dict.
+    """
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=1)
+    return _executor.submit(backup, source, repo_path)
+
+
+def backup_enabled():
+    return bool(read_json(config_path(), {}).get("backup_before_launch", True))
+
+
+def backup_keep():
+    """Snapshots kept after each backup, from config.json ("backup_keep")."""
+    return int(read_json(config_path(), {}).get("backup_keep", DEFAULT_KEEP))
+
+
+# ---------------------- Entry Point ----------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental world backups")
+    parser.add_argument("--repo", help="backup repository (default: <app dir>/backups)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("backup", help="take a snapshot")
+    p.add_argument("--worlds", help="worlds folder (default: minecraftWorlds)")
+    p.add_argument("--keep", type=int, help=f"snapshots to keep afterwards (default: config or {DEFAULT_KEEP}, 0 = all)")
+    sub.add_parser("list", help="list snapshots")
+    p = sub.add_parser("restore", help="rebuild a snapshot into a folder")
+    p.add_argument("snapshot", help="snapshot id or 'latest'")
+    p.add_argument("dest")
+    p = sub.add_parser("prune", help="drop old snapshots and unreferenced chunks")
+    p.add_argument("--keep", type=int, default=DEFAULT_KEEP)
+    args = parser.parse_args(argv)
+
+    repo = BackupRepo(args.repo)
+    if args.command == "backup":
+        stats = backup(args.worlds, repo, args.keep)
+        if stats.get("error"):
+            print("[Backup] Failed:", stats["error"])
+            return 1
+        print(f"[Backup] {stats['snapshot']}: {stats['files']} files ({stats['skipped']} unchanged), "
+              f"read {stats['read_bytes'] / (1024 * 1024):.1f} MB at {stats['mb_per_second']:.1f} MB/s, "
+              f"{stats['new_chunks']} new chunks ({stats['stored_bytes'] / (1024 * 1024):.1f} MB) "
+              f"in {stats['seconds']:.2f}s")
+    elif args.command == "list":
+        for snap_id in repo.snapshots():
+            snap = repo.load_snapshot(snap_id)
+            size = sum(e["size"] for e in snap["files"].values())
+            print(f"{snap_id}  {len(snap['files'])} files  {size / (1024 * 1024):.1f} MB")
+    elif args.command == "restore":
+        stats = restore(args.snapshot, args.dest, repo)
+        print(f"[Backup] Restored {stats['snapshot']}: {stats['files']} files, "
+              f"{stats['bytes'] / (1024 * 1024):.1f} MB in {stats['seconds']:.2f}s")
+    elif args.command == "prune":
+        stats = prune(args.keep, repo)
+        print(f"[Backup] {stats['snapshots']} snapshots kept, {stats['removed_chunks']} chunks removed")
+    return 0
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,322 @@
+"""
+Viola Launcher - World index
+Lists the worlds in minecraftWorlds with the fields the world browser shows:
+name, last played, game mode and size on disk. level.dat (an 8-byte header
+followed by little-endian NBT) is parsed and the world folder is walked only
+when the world's stat key changes (level.dat, the db folder and the LevelDB
+files appended in place, or the icon); otherwise the entry persisted next to
+config.json is reused.
+
+Thumbnails are cached on disk at display size under <app dir>/world_thumbs,
+named after the icon's stat, so world_icon.jpeg is decoded once per change.
+The names are computed here; writing them needs Qt (image_cache).
+
+    python src/world_index.py [--root DIR] [--rebuild] [--json]
+"""
+
+import os
+import sys
+import json
+import time
+import struct
+import hashlib
+import argparse
+
+from launcher_config import app_dir, read_json, write_json
+from pack_index import folder_size
+from world_backup import worlds_dir
+
+INDEX_FILENAME = "world_index.json"
+INDEX_VERSION = 2
+THUMBS_DIRNAME = "world_thumbs"
+LEVEL_DAT = "level.dat"
+ICON_NAME = "world_icon.jpeg"
+GAME_MODES = {0: "survival", 1: "creative", 2: "adventure", 6: "spectator"}
+
+# ---------------------- NBT ----------------------
+TAG_END, TAG_BYTE, TAG_SHORT, TAG_INT, TAG_LONG, TAG_FLOAT, TAG_DOUBLE = range(7)
+TAG_BYTE_ARRAY, TAG_STRING, TAG_LIST, TAG_COMPOUND, TAG_INT_ARRAY, TAG_LONG_ARRAY = range(7, 13)
+_SCALARS = {
+    TAG_BYTE: struct.Struct("<b"), TAG_SHORT: struct.Struct("<h"), TAG_INT: struct.Struct("<i"),
+    TAG_LONG: struct.Struct("<q"), TAG_FLOAT: struct.Struct("<f"), TAG_DOUBLE: struct.Struct("<d"),
+}
+_ARRAYS = {TAG_BYTE_ARRAY: "b", TAG_INT_ARRAY: "i", TAG_LONG_ARRAY: "q"}
+_U16 = struct.Struct("<H")
+_I32 = struct.Struct("<i")
+LEVEL_HEADER = struct.Struct("<ii")                 # storage version, payload length
+MAX_DEPTH = 512
+
+
+class NbtError(Exception):
+    pass
+
+
+def _read_string(data, pos):
+    (n,) = _U16.unpack_from(data, pos)
+    pos += 2
+    return data[pos:pos + n].decode("utf-8", errors="replace"), pos + n
+
+
+def _read_payload(data, pos, tag, depth):
+    if depth > MAX_DEPTH:
+        raise NbtError("NBT nested too deeply")
+    scalar = _SCALARS.get(tag)
+    if scalar is not None:
+        return scalar.unpack_from(data, pos)[0], pos + scalar.size
+    if tag == TAG_STRING:
+        return _read_string(data, pos)
+    if tag == TAG_COMPOUND:
+        out = {}
+        while True:
+            child = data[pos]
+            pos += 1
+            if child == TAG_END:
+                return out, pos
+            name, pos = _read_string(data, pos)
+            out[name], pos = _read_payload(data, pos, child, depth + 1)
+    if tag == TAG_LIST:
+        child = data[pos]
+        (n,) = _I32.unpack_from(data, pos + 1)
+        pos += 5
+        items = []
+        for _ in range(max(n, 0)):
+            value, pos = _read_payload(data, pos, child, depth + 1)
+            items.append(value)
+        return items, pos
+    if tag in _ARRAYS:
+        (n,) = _I32.unpack_from(data, pos)
+        fmt = f"<{max(n, 0)}{_ARRAYS[tag]}"
+        return list(struct.unpack_from(fmt, data, pos + 4)), pos + 4 + struct.calcsize(fmt)
+    raise NbtError(f"unknown NBT tag {tag} at offset {pos}")
+
+
+def parse_nbt(data, pos=0):
+    """Parse one named little-endian NBT tag. Returns (name, value, end offset)."""
+    try:
+        tag = data[pos]
+        name, pos = _read_string(data, pos + 1)
+        value, pos = _read_payload(data, pos, tag, 0)
+    except (IndexError, struct.error) as e:
+        raise NbtError(f"truncated NBT: {e}") from None
+    return name, value, pos
+
+
+def _write_tag(out, tag, name, value):
+    out.append(bytes([tag]))
+    raw = name.encode("utf-8")
+    out.append(_U16.pack(len(raw)) + raw)
+    if tag in _SCALARS:
+        out.append(_SCALARS[tag].pack(value))
+    elif tag == TAG_STRING:
+        raw = value.encode("utf-8")
+        out.append(_U16.pack(len(raw)) + raw)
+    elif tag == TAG_COMPOUND:
+        for child in value:
+            _write_tag(out, *child)
+        out.append(bytes([TAG_END]))
+    else:
+        raise NbtError(f"cannot write NBT tag {tag}")
+
+
+def level_dat_bytes(fields, storage_version=10):
+    """Encode a level.dat from [(tag, name, value)]; compounds nest the same triples."""
+    out = []
+    _write_tag(out, TAG_COMPOUND, "", fields)
+    payload = b"".join(out)
+    return LEVEL_HEADER.pack(storage_version, len(payload)) + payload
+
+
+def read_level_dat(path):
+    """Return the root compound of a Bedrock level.dat."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < LEVEL_HEADER.size:
+        raise NbtError("level.dat too short")
+    _, length = LEVEL_HEADER.unpack_from(data)
+    body = data[LEVEL_HEADER.size:LEVEL_HEADER.size + length]
+    _, root, _ = parse_nbt(body)
+    if not isinstance(root, dict):
+        raise NbtError("level.dat root is not a compound")
+    return root
+
+
+# ---------------------- Worlds ----------------------
+def index_path():
+    return os.path.join(app_dir(), INDEX_FILENAME)
+
+
+def thumbs_dir():
+    return os.path.join(app_dir(), THUMBS_DIRNAME)
+
+
+def world_info(path):
+    """Read the indexed fields of one world folder."""
+    root = read_level_dat(os.path.join(path, LEVEL_DAT))
+    name = str(root.get("LevelName") or "")
+    if not name:
+        try:
+            with open(os.path.join(path, "levelname.txt"), "r", encoding="utf-8") as f:
+                name = f.read().strip()
+        except OSError:
+            pass
+    return {
+        "name": name or os.path.basename(path),
+        "last_played": int(root.get("LastPlayed") or 0),
+        "game_mode": GAME_MODES.get(root.get("GameType"), "unknown"),
+        "hardcore": bool(root.get("IsHardcore", 0)),
+    }
+
+
+def thumbnail_path(world, width, height, folder=None):
+    """Cache file for a world's icon at width x height pixels, or None if it has no icon."""
+    icon = world.get("icon")
+    if not icon:
+        return None
+    key = f"{world['path']}|{icon[0]}|{icon[1]}|{width}x{height}"
+    return os.path.join(folder or thumbs_dir(), hashlib.sha1(key.encode("utf-8")).hexdigest()[:20] + ".png")
+
+
+def prune_thumbnails(worlds, width, height, folder=None):
+    """Delete cached thumbnails no indexed world refers to. Returns how many were removed."""
+    folder = folder or thumbs_dir()
+    keep = {os.path.basename(p) for p in (thumbnail_path(w, width, height, folder) for w in worlds) if p}
+    removed = 0
+    try:
+        names = os.listdir(folder)
+    except OSError:
+        return 0
+    for name in names:
+        if name.endswith(".png") and name not in keep:
+            try:
+                os.remove(os.path.join(folder, name))
+                removed += 1
+            except OSError:
+                pass
+    return removed
+
+
+# ---------------------- Index ----------------------
+class WorldIndex:
+    """Persistent, incrementally refreshed index of local worlds."""
+
+    def __init__(self, path=None, root=None, persist=True):
+        self.path = path or index_path()
+        self.root = root or worlds_dir()
+        self.persist = persist
+        data = read_json(self.path, {}) if persist else {}
+        self.entries = data.get("entries", {}) if data.get("version") == INDEX_VERSION else {}
+        self.last_scan = {}
+
+    @staticmethod
+    def _stat_key(path):
+        """
+        level.dat is rewritten on save. LevelDB adds and drops .ldb tables (which
+        changes the db folder's mtime) but appends to its log and MANIFEST in
+        place, so those files' mtimes are part of the key too.
+        """
+        level = os.stat(os.path.join(path, LEVEL_DAT))
+        try:
+            db = os.stat(os.path.join(path, "db")).st_mtime_ns
+            with os.scandir(os.path.join(path, "db")) as it:
+                for entry in it:
+                    if entry.name.endswith(".log") or entry.name.startswith("MANIFEST-"):
+                        try:
+                            db = max(db, entry.stat().st_mtime_ns)
+                        except OSError:
+                            pass
+        except OSError:
+            db = 0
+        try:
+            st = os.stat(os.path.join(path, ICON_NAME))
+            icon = [st.st_mtime_ns, st.st_size]
+        except OSError:
+            icon = None
+        return [level.st_mtime_ns, level.st_size, db], icon
+
+    def scan(self, rebuild=False, on_world=None):
+        """
+        Refresh the index. on_world(world) is called for each world as soon as
+        it is known, cached or re-read, so a caller can show the list as it
+        fills. Returns (worlds, stats).
+        """
+        t0 = time.perf_counter()
+        seen = {}
+        reread = 0
+        failed = 0
+        try:
+            it = os.scandir(self.root)
+        except OSError:
+            it = None
+        if it is not None:
+            with it:
+                for entry in it:
+                    try:
+                        if not entry.is_dir():
+                            continue
+                        key, icon = self._stat_key(entry.path)
+                    except OSError:
+                        continue
+                    old = self.entries.get(entry.path)
+                    if not rebuild and old and old.get("stat") == key and old.get("icon") == icon:
+                        seen[entry.path] = old
+                    else:
+                        try:
+                            info = world_info(entry.path)
+                        except (OSError, NbtError) as e:
+                            print(f"[Worlds] Failed to read {entry.path}: {e}")
+                            failed += 1
+                            continue
+                        reread += 1
+                        seen[entry.path] = dict(info, stat=key, icon=icon, size=folder_size(entry.path))
+                    if on_world is not None:
+                        on_world(self._world(entry.path, seen[entry.path]))
+
+        changed = reread > 0 or len(seen) != len(self.entries)
+        self.entries = seen
+        if changed and self.persist:
+            write_json(self.path, {"version": INDEX_VERSION, "entries": self.entries})
+        self.last_scan = {
+            "worlds": len(seen),
+            "reread": reread,
+            "failed": failed,
+            "seconds": time.perf_counter() - t0,
+        }
+        return self.worlds(), self.last_scan
+
+    @staticmethod
+    def _world(path, entry):
+        world = {k: v for k, v in entry.items() if k != "stat"}
+        world["path"] = path
+        world["folder"] = os.path.basename(path)
+        return world
+
+    def worlds(self):
+        """Indexed worlds, most recently played first."""
+        out = [self._world(path, entry) for path, entry in self.entries.items()]
+        out.sort(key=lambda w: (-w["last_played"], w["name"].lower()))
+        return out
+
+
+# ---------------------- Entry Point ----------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List local Bedrock worlds")
+    parser.add_argument("--root", help="worlds folder (default: minecraftWorlds)")
+    parser.add_argument("--index", help="index file (default: world_index.json in the app dir)")
+    parser.add_argument("--rebuild", action="store_true", help="ignore the cached index")
+    parser.add_argument("--json", action="store_true", help="print JSON")
+    args = parser.parse_args(argv)
+
+    index = WorldIndex(args.index, args.root)
+    worlds, stats = index.scan(rebuild=args.rebuild)
+    if args.json:
+        print(json.dumps({"worlds": worlds, "scan": stats}, indent=2))
+    else:
+        for w in worlds:
+            played = time.strftime("%Y-%m-%d %H:%M", time.localtime(w["last_played"])) if w["last_played"] else "never"
+            print(f"{w['name'][:40]:<40} {w['game_mode']:<10} {played:<17} {w['size'] / 2**20:8.1f} MB")
+        print(f"{len(worlds)} worlds, re-read {stats['reread']} in {stats['seconds'] * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())